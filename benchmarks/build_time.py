@@ -0,0 +1,103 @@
+"""I measure how long it takes to build many pipelines, like a service does at startup.
+
+Each pipeline handles its own type of values, like the pipelines of a service that handle different records.
+The steps use nested annotations. Each step accepts more general types than the previous step returns,
+so the types are compared deeply.
+
+The pipelines are built with each `check` mode. For deferred checks the time until all checks passed is shown as well.
+The last row builds the pipelines with a `check_cache` that already holds them, like a restarted service does.
+
+Run me with pypely installed (`pip install -e .`): `python benchmarks/build_time.py`
+"""
+
+import gc
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from pypely import pipeline
+from pypely.memory import MemoryEntry, memorizable
+
+NUMBER_OF_PIPELINES = 3_000
+
+
+def create_steps(number: int) -> Tuple[Callable, ...]:
+    """I create the steps of a pipeline that handles its own type of values.
+
+    Args:
+        number (int): The number of the pipeline, which makes its types and step names unique
+
+    Returns:
+        Tuple[Callable, ...]: The steps `load`, `clean`, `index` and `combine`.
+    """
+    value = type(f"Value{number}", (float,), {"__module__": __name__})
+    Records = Dict[str, List[Tuple[int, value]]]  # type: ignore
+    RecordsView = Mapping[str, Iterable[Tuple[int, Optional[value]]]]  # type: ignore
+    Index = Dict[str, Union[int, str, List[int]]]
+    IndexView = Mapping[str, Union[int, str, Iterable[int], None]]
+
+    def load(path: str) -> Records:
+        return {}
+
+    def clean(records: RecordsView) -> Records:
+        return records  # type: ignore
+
+    def index(records: RecordsView) -> Index:
+        return {}
+
+    def combine(records: RecordsView, index: IndexView) -> Callable[[str], Optional[value]]:
+        return lambda key: None
+
+    steps = (load, clean, index, combine)
+    for step in steps:
+        step.__qualname__ = f"{step.__name__}{number}"
+    return steps
+
+
+def build(number: int, check: str, check_cache: Optional[Path] = None) -> Callable:
+    """I build a pipeline with the steps of `create_steps` and a memory entry.
+
+    Args:
+        number (int): The number of the pipeline
+        check (str): The `check` mode of the pipeline
+        check_cache (Optional[Path], optional): The check cache of the pipeline. Defaults to None.
+
+    Returns:
+        Callable: The pipeline.
+    """
+    load, clean, index, combine = create_steps(number)
+    records = MemoryEntry()
+    return pipeline(
+        load,
+        clean,
+        memorizable(clean) >> records,
+        index,
+        records >> memorizable(combine),
+        check=check,
+        check_cache=check_cache,
+    )
+
+
+def main():
+    """I print the time it takes to build the pipelines with each `check` mode and with a filled check cache."""
+    check_cache = Path(tempfile.mkdtemp()) / "checks.jsonl"
+    for number in range(NUMBER_OF_PIPELINES):
+        build(number, "eager", check_cache)
+
+    print(f"{NUMBER_OF_PIPELINES} pipelines")
+    print(f"{'check':>16} {'built [s]':>10} {'checked [s]':>12}")
+    for check, cache in (("eager", None), ("lazy", None), ("background", None), ("eager", check_cache)):
+        gc.collect()
+        start = time.perf_counter()
+        pipelines = [build(number, check, cache) for number in range(NUMBER_OF_PIPELINES)]
+        built = time.perf_counter() - start
+        for _pipeline in pipelines:
+            _pipeline.validate().result()
+        checked = time.perf_counter() - start
+        label = f"{check} + cache" if cache else check
+        print(f"{label:>16} {built:>10.2f} {checked:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
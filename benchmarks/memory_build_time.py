@@ -0,0 +1,53 @@
+"""I measure how long it takes to bind memory entries to steps that hold large objects.
+
+Steps created by factories often hold lookup tables or models, e.g. as callable objects.
+Binding memory entries with `<<` and `>>` must not copy these objects.
+
+Run me with pypely installed (`pip install -e .`): `python benchmarks/memory_build_time.py`
+"""
+
+import timeit
+from typing import Dict, List
+
+from pypely.memory import memorizable
+
+NUMBER_OF_BUILDS = 100
+
+
+class Lookup:
+    """I am a step that holds a large table."""
+
+    def __init__(self, table: Dict[int, List[int]]) -> None:
+        self.table = table
+        self.__name__ = self.__qualname__ = "lookup"
+        self.__annotations__ = {"key": int, "offset": int, "scale": int, "return": int}
+
+    def __call__(self, key: int, offset: int, scale: int) -> int:
+        """I scale the length of the looked up row and add the offset.
+
+        Args:
+            key (int): The key of the row in the table
+            offset (int): Added to the scaled length
+            scale (int): The factor of the length
+
+        Returns:
+            int: The scaled length of the row plus the offset.
+        """
+        return len(self.table[key]) * scale + offset
+
+
+def main():
+    """I print the time it takes to bind memory entries to steps holding tables of different sizes."""
+    print(f"{'table entries':>14} {'build [us]':>12}")
+    for size in (10, 1_000, 100_000):
+        table = {key: list(range(10)) for key in range(size)}
+        step = memorizable(Lookup(table))
+
+        seconds = min(
+            timeit.repeat(lambda: step << "offset" << "scale" >> "result", number=NUMBER_OF_BUILDS, repeat=5)
+        )
+        print(f"{size:>14} {seconds / NUMBER_OF_BUILDS * 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
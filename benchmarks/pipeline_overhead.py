@@ -0,0 +1,69 @@
+"""I measure the per-call overhead of a pipeline compared to a hand-written function chain.
+
+Run me with pypely installed (`pip install -e .`): `python benchmarks/pipeline_overhead.py`
+"""
+
+import timeit
+from typing import Callable
+
+from pypely import pipeline
+
+NUMBER_OF_CALLS = 10_000
+
+
+def increment(x: int) -> int:
+    """I add one to `x`, the step of all measured chains.
+
+    Args:
+        x (int): The value
+
+    Returns:
+        int: The value plus one.
+    """
+    return x + 1
+
+
+def hand_written_chain(number_of_steps: int) -> Callable[[int], int]:
+    """I chain the steps by hand, as the baseline of the measurement.
+
+    Args:
+        number_of_steps (int): The number of `increment` steps
+
+    Returns:
+        Callable[[int], int]: A function that runs the steps one after another.
+    """
+    steps = [increment] * number_of_steps
+
+    def _chain(x: int) -> int:
+        for step in steps:
+            x = step(x)
+        return x
+
+    return _chain
+
+
+def measure(func: Callable[[int], int]) -> float:
+    """I return the mean time of a single call in microseconds.
+
+    Args:
+        func (Callable[[int], int]): The function that is measured.
+
+    Returns:
+        float: The mean time per call in microseconds.
+    """
+    seconds = min(timeit.repeat(lambda: func(0), number=NUMBER_OF_CALLS, repeat=5))
+    return seconds / NUMBER_OF_CALLS * 1e6
+
+
+def main():
+    """I print the overhead of pipelines of different lengths."""
+    print(f"{'steps':>6} {'chain [us]':>12} {'pipeline [us]':>14} {'overhead / step [us]':>21}")
+    for number_of_steps in (1, 10, 50, 200):
+        chain = measure(hand_written_chain(number_of_steps))
+        pipe = measure(pipeline(*[increment] * number_of_steps))
+        overhead_per_step = (pipe - chain) / number_of_steps
+        print(f"{number_of_steps:>6} {chain:>12.2f} {pipe:>14.2f} {overhead_per_step:>21.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,32 @@
 Welcome to the py pipeline abstraction language.
 """
 
-from .core._functions import fork, identity, merge, pipeline, to
+from .core._functions import (
+    async_fork,
+    async_merge,
+    async_pipeline,
+    async_to,
+    batched,
+    cached,
+    disk_cached,
+    fork,
+    identity,
+    merge,
+    pipeline,
+    to,
+)
 
-__all__ = ["pipeline", "identity", "merge", "fork", "to"]
+__all__ = [
+    "pipeline",
+    "identity",
+    "merge",
+    "fork",
+    "to",
+    "async_pipeline",
+    "async_fork",
+    "async_merge",
+    "async_to",
+    "batched",
+    "cached",
+    "disk_cached",
+]
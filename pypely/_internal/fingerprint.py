@@ -0,0 +1,193 @@
+"""I create fingerprints of the code of a function.
+
+A fingerprint changes whenever the code of the function changes. The values the code works with are included:
+the contents of closure variables, defaults, the instance of a bound method and the attributes of a callable object.
+So functions created by the same factory have different fingerprints. Steps that interact with the memory are
+described by the function they wrap and the names of their memory entries. If requested, the content of all local
+modules the function depends on is included as well. These modules are found by `create_environment`.
+Pip and standard-lib dependencies are not included.
+
+Values are pickled by `stable_dumps`, which orders the items of sets. The pickled bytes of a set otherwise depend on
+the hash seed of the process, so the fingerprints would change between runs.
+
+Example:
+    >>> from some.module import a_function
+    >>> from pypely._internal.fingerprint import code_fingerprint
+
+    >>> code_fingerprint(a_function)
+    '4f1c0e...'
+"""
+
+import hashlib
+import inspect
+import io
+import marshal
+import pickle
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+
+def code_fingerprint(func: Callable, track_dependencies: bool = True) -> str:
+    """I create a fingerprint of the code of `func`.
+
+    The source code of `func` is used. If it is not available the compiled code is used instead.
+    The pickled values the code works with, e.g. closure variables and defaults, are included as well.
+
+    Args:
+        func (Callable): The function for which the fingerprint is created.
+        track_dependencies (bool): Include the content of the local modules `func` depends on. Defaults to True.
+
+    Returns:
+        str: The hex digest of the code.
+    """
+    func, bindings = _unwrapped(func)
+    digest = hashlib.sha256()
+    digest.update(bindings)
+    digest.update(_function_code(func))
+    digest.update(_function_state(func))
+
+    if track_dependencies:
+        from pypely._internal.dependencies import create_environment
+
+        environment = create_environment(func)
+        for path in sorted(str(dependency.path) for dependency in environment.local_dependencies):
+            digest.update(path.encode())
+            with open(path, "rb") as module_file:
+                digest.update(module_file.read())
+
+    return digest.hexdigest()
+
+
+def stable_dumps(value: Any) -> bytes:
+    """I pickle a value like `pickle.dumps`, but the items of sets and frozensets are ordered.
+
+    The items are ordered by their own pickled bytes. So equal values have equal bytes in every process.
+
+    Args:
+        value (Any): The value
+
+    Returns:
+        bytes: The pickled value.
+    """
+    buffer = io.BytesIO()
+    _StablePickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(value)
+    return buffer.getvalue()
+
+
+class _StablePickler(pickle.Pickler):
+    """I pickle the items of sets and frozensets in a stable order.
+
+    Sets are pickled by the fast path of the pickler, which `reducer_override` can't change.
+    So they are replaced by persistent ids holding their ordered items. The bytes are only hashed, never loaded.
+    """
+
+    def persistent_id(self, obj: Any) -> Any:
+        """I replace sets and frozensets by their class name and their ordered items.
+
+        # noqa: DAR101
+        # noqa: DAR201
+        """
+        if type(obj) in (set, frozenset):
+            return type(obj).__name__, sorted(obj, key=stable_dumps)
+        return None
+
+
+def _unwrapped(func: Callable) -> Tuple[Callable, bytes]:
+    """I unwrap a step that interacts with the memory.
+
+    Args:
+        func (Callable): The step
+
+    Returns:
+        Tuple[Callable, bytes]: The wrapped function and the names of the memory entries of the step.
+            Other steps are returned as they are, without memory entries.
+    """
+    from pypely.memory._wrappers import Memorizable
+
+    if not isinstance(func, Memorizable):
+        return func, b""
+    bindings = (type(func).__qualname__, func.attributes_before, func.attributes_after, func.written_attribute)
+    return func.func, repr(bindings).encode()
+
+
+def _function_code(func: Callable) -> bytes:
+    """I provide the code of `func` as bytes.
+
+    Args:
+        func (Callable): The function
+
+    Returns:
+        bytes: The source code if available. Otherwise the marshalled code object or the name of `func`.
+    """
+    try:
+        return inspect.getsource(func).encode()
+    except (OSError, TypeError):
+        pass
+
+    code = getattr(func, "__code__", None)
+    if code is not None:
+        return marshal.dumps(code)
+    return f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', repr(func))}".encode()
+
+
+def _function_state(func: Callable, seen: Optional[Set[int]] = None) -> bytes:
+    """I provide the values the code of `func` works with as bytes.
+
+    Functions created by the same factory share their code, but not their closure variables and defaults.
+
+    Args:
+        func (Callable): The function
+        seen (Optional[Set[int]], optional): The ids of the functions that are already described. Defaults to None.
+
+    Returns:
+        bytes: The pickled closure variables and defaults, the bound instance or the callable object.
+    """
+    seen = set() if seen is None else seen
+    if id(func) in seen:  # a recursive function
+        return b""
+    seen.add(id(func))
+
+    if inspect.ismethod(func):
+        return _value(func.__self__, seen) + _function_state(func.__func__, seen)
+    if inspect.isfunction(func):
+        values = [*_cell_contents(func), *(func.__defaults__ or ()), *sorted((func.__kwdefaults__ or {}).items())]
+        return b"".join(_value(value, seen) for value in values)
+    if inspect.isclass(func) or inspect.isbuiltin(func):
+        return b""
+    return _value(func, seen)  # a callable object
+
+
+def _cell_contents(func: Callable) -> List[Any]:
+    contents = []
+    for cell in getattr(func, "__closure__", None) or ():
+        try:
+            contents.append(cell.cell_contents)
+        except ValueError:  # the variable is not assigned yet
+            contents.append(None)
+    return contents
+
+
+def _value(value: Any, seen: Set[int]) -> bytes:
+    """I provide a value used by a function as bytes.
+
+    Args:
+        value (Any): A closure variable, a default, a bound instance or a callable object
+        seen (Set[int]): The ids of the functions that are already described
+
+    Returns:
+        bytes: The code and state of functions and memory steps, the name of modules and the pickled value otherwise.
+
+    Raises:
+        ValueError: if the value can't be pickled. Then different values could not be told apart.
+    """
+    value, bindings = _unwrapped(value)
+    if inspect.isfunction(value) or inspect.ismethod(value):
+        return bindings + _function_code(value) + _function_state(value, seen)
+    if inspect.ismodule(value):
+        return value.__name__.encode()
+    try:
+        return bindings + stable_dumps(value)
+    except Exception as e:
+        raise ValueError(
+            f"The fingerprint of a function can't include {type(value).__qualname__} values, they can't be pickled. "
+            "Closure variables, defaults and the attributes of callable objects need to be picklable."
+        ) from e
@@ -5,17 +5,23 @@ By this I enable the type checking during buildtime of a pipeline.
 
 This is especially useful to give the created pipeline the correct type. 
 Or check that the intermediate state of a created pipeline matches the next provided step typewise. 
+
+`signature_of` caches the signatures of the steps, as the same steps are inspected many times while pipelines are built.
 """
 
 import inspect
+import weakref
 from copy import copy
-from typing import Any, Callable, TypeVar
+from typing import Any, Callable, Dict, Tuple, TypeVar
 
 from typing_extensions import ParamSpec
 
 T = TypeVar("T")
 P = ParamSpec("P")
 
+# id of the step -> (weak reference to the step, its annotations and signature attribute, its signature)
+_SIGNATURES: Dict[int, Tuple[weakref.ref, Tuple[Any, Any], inspect.Signature]] = dict()
+
 
 def define_annotation(func: Callable, copy_parameters_from: Callable[P, Any], return_type: T) -> Callable[P, T]:
     """I reset the annotation of `func`.
@@ -35,6 +41,7 @@ def define_annotation(func: Callable, copy_parameters_from: Callable[P, Any], re
     annotations["return"] = return_type
 
     func.__annotations__ = annotations
+    forget_signature(func)
     return func
 
 
@@ -53,8 +60,48 @@ def define_signature(func: Callable[P, T], copy_parameters_from: Callable[P, Any
         Callable[P, T]: The function with new signature
     """
     signature = inspect.Signature(
-        list(inspect.signature(copy_parameters_from).parameters.values()), return_annotation=return_type
+        list(signature_of(copy_parameters_from).parameters.values()), return_annotation=return_type
     )
 
     setattr(func, "__signature__", signature)
+    forget_signature(func)
     return func
+
+
+def signature_of(func: Callable) -> inspect.Signature:
+    """I provide the signature of `func` like `inspect.signature` does.
+
+    The signature is cached as long as `func` exists and keeps the same `__annotations__` and `__signature__` objects.
+    `define_annotation` and `define_signature` reset the cache of the functions they change.
+    Steps that can't be weakly referenced are inspected every time.
+
+    Args:
+        func (Callable): Any step
+
+    Returns:
+        inspect.Signature: The signature of `func`.
+    """
+    key = id(func)
+    metadata = (getattr(func, "__annotations__", None), getattr(func, "__signature__", None))
+    cached = _SIGNATURES.get(key)
+    if cached is not None:
+        ref, cached_metadata, signature = cached
+        if ref() is func and all(old is new for old, new in zip(cached_metadata, metadata)):
+            return signature
+
+    signature = inspect.signature(func)
+    try:
+        ref = weakref.ref(func, lambda _: _SIGNATURES.pop(key, None))
+    except TypeError:
+        return signature
+    _SIGNATURES[key] = (ref, metadata, signature)
+    return signature
+
+
+def forget_signature(func: Callable) -> None:
+    """I remove the cached signature of `func`. I am used whenever the signature or annotations of `func` are changed.
+
+    Args:
+        func (Callable): Any step
+    """
+    _SIGNATURES.pop(id(func), None)
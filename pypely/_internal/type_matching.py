@@ -4,21 +4,27 @@ This is very important as it catches incompatability bugs early.
 In addition I provide functionality to enforce typing. 
 Functions without typing won't be allowed. 
 Consecutive functions whichs types don't match will produce an error.
+
+The results of `is_subtype` are cached, as the same pairs of types are checked for many pipelines.
 """
 
 import collections
 import inspect
 import typing
 from collections.abc import Callable, Iterable, Mapping, MutableMapping
+from functools import lru_cache
 from itertools import zip_longest
-from typing import Any, TypeVar, Union, get_args, get_origin
+from typing import Any, Hashable, TypeVar, Union, cast, get_args, get_origin
 
+from pypely._internal.function_manipulation import signature_of
 from pypely.core.errors import (
     InvalidParameterAnnotationError,
     ParameterAnnotationsMissingError,
     ReturnTypeAnnotationMissingError,
 )
 
+TYPE_CACHE_SIZE = 4096  # Type pairs whose results are kept by `is_subtype`
+
 
 def check_if_annotations_given(func: Callable) -> None:
     """I check if the function has type annotations.
@@ -47,7 +53,7 @@ def check_if_annotations_given(func: Callable) -> None:
 
         return True
 
-    parameters = inspect.signature(func).parameters
+    parameters = signature_of(func).parameters
     parameters_annotated = map(_is_parameter_annotated, parameters.values())
     if not all(parameters_annotated):
         raise ParameterAnnotationsMissingError(func)
@@ -70,6 +76,12 @@ def is_subtype(type1: type[Any], type2: type[Any]) -> bool:
     Returns:
         bool: `True` if `type1` is a subtype of `type2`.
     """
+    if _is_cacheable(type1) and _is_cacheable(type2):
+        return _is_subtype_cached(cast(Hashable, type1), cast(Hashable, type2))  # checked by `_is_cacheable`
+    return _is_subtype(type1, type2)
+
+
+def _is_subtype(type1: type[Any], type2: type[Any]) -> bool:
     exceptions = [(int, float)]
 
     if type1 == type2:
@@ -80,6 +92,29 @@ def is_subtype(type1: type[Any], type2: type[Any]) -> bool:
     return _do_types_match(type1, type2)
 
 
+_is_subtype_cached = lru_cache(maxsize=TYPE_CACHE_SIZE)(_is_subtype)
+
+
+def _is_cacheable(_type: type[Any]) -> bool:
+    """I check if the result of a type check with this type can be cached.
+
+    Type checks don't depend on how a type var has been used, so types with type vars are cached as well.
+    A `TypeVar` is only equal to itself, so type vars with the same name don't share a cache entry.
+    Unhashable annotations, e.g. `Annotated[int, {"unit": "seconds"}]`, can't be cached.
+
+    Args:
+        _type (type[Any]): Any type annotation
+
+    Returns:
+        bool: `True` if the type is hashable.
+    """
+    try:
+        hash(_type)
+    except TypeError:
+        return False
+    return True
+
+
 def is_optional(_type: type) -> bool:
     """I check if a given type is optional.
 
@@ -155,6 +190,8 @@ def _get_base_type(type_: type[typing.Any]) -> type[typing.Any]:
 
 
 def _is_newtype(type_: type[typing.Any]) -> bool:
+    if get_origin(type_) is not None:  # a generic type. Looking up missing attributes of these is slow
+        return False
     return hasattr(type_, "__name__") and hasattr(type_, "__supertype__")
 
 
@@ -4,6 +4,9 @@ class PypelyTuple(tuple):
     def __new__(cls, *x):  # noqa: D102
         return super(PypelyTuple, cls).__new__(cls, x)
 
+    def __getnewargs__(self):  # noqa: D105
+        return tuple(self)
+
 
 class PypelyError(Exception):
     """I am the parent of all errors and exceptions in pypely."""
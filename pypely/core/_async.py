@@ -0,0 +1,231 @@
+"""I run pipelines inside of an asyncio event loop.
+
+Coroutine functions are awaited. All other steps are offloaded to a thread with `asyncio.to_thread`.
+This way no step blocks the event loop.
+If hooks are registered (see `pypely.hooks`), each step is reported like the steps of a synchronous pipeline.
+
+The memory is stored in a context variable. Each asyncio task runs in its own copy of the context.
+So each task that calls a pipeline gets its own memory. The branches of `async_fork` run as tasks too.
+They share the memory of the pipeline they belong to.
+"""
+
+import asyncio
+import inspect
+from typing import Any, Awaitable, Callable, Dict, Sequence, Tuple, TypeVar
+
+from typing_extensions import ParamSpec
+
+from pypely._types import PypelyError, PypelyTuple
+from pypely.core._plan import NO_ARGUMENT, SINGLE, UNPACK, Plan, check_steps
+from pypely.core.errors import PipelineStepError
+from pypely.hooks._impl import HOOKS, run_async_step, run_step
+from pypely.memory._impl import get_memory
+
+T = TypeVar("T")
+P = ParamSpec("P")
+
+
+class AsyncPlan(Plan[P, T]):
+    """I await the compiled steps of a pipeline one after another."""
+
+    def __init__(self, funcs: Sequence[Callable]) -> None:
+        super().__init__(funcs)
+        self.first = as_coroutine_function(self.first)
+        self.steps = tuple((as_coroutine_function(func), dispatch) for func, dispatch in self.steps)
+
+    async def __call__(self, *args: P.args, **kwargs: P.kwargs) -> T:  # type: ignore[override]
+        """I await all steps. The output of each step is forwarded to the next step.
+
+        Args:
+            args: The positional arguments given to the first step
+            kwargs: The keyword arguments given to the first step
+
+        Returns:
+            T: The output of the last step.
+
+        Raises:
+            PypelyError: errors raised by pypely itself are forwarded untouched.
+            PipelineStepError: if a step fails with an error that is not raised by pypely.
+        """
+        if HOOKS:
+            return await self.run_each_with_hooks(args, kwargs)
+
+        releases = self.releases
+        index = 0
+        try:
+            result = await self.first(*args, **kwargs)
+            if releases and 0 in releases:
+                get_memory().release(releases[0])
+            for index, (func, dispatch) in enumerate(self.steps, 1):
+                if dispatch == SINGLE:
+                    result = await func(result)
+                elif dispatch == UNPACK:
+                    result = await func(*result)
+                elif dispatch == NO_ARGUMENT:
+                    result = await func()
+                elif type(result) == tuple:
+                    result = await func(*result)
+                elif result is None:
+                    result = await func()
+                else:
+                    result = await func(result)
+                if releases and index in releases:
+                    get_memory().release(releases[index])
+            return result
+        except PypelyError:
+            raise
+        except Exception as e:
+            raise PipelineStepError(self.funcs[index], e)
+
+    async def run_each_with_hooks(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> T:
+        """I await all steps like `__call__` and notify the registered hooks around each step.
+
+        The steps are reported as provided by the user. Steps that are not coroutine functions are reported
+        from the thread they run in.
+
+        Args:
+            args (Tuple[Any, ...]): The positional arguments given to the first step
+            kwargs (Dict[str, Any]): The keyword arguments given to the first step
+
+        Returns:
+            T: The output of the last step.
+
+        Raises:
+            PypelyError: errors raised by pypely itself are forwarded untouched.
+            PipelineStepError: if a step fails with an error that is not raised by pypely.
+        """
+        releases = self.releases
+        index = 0
+        try:
+            result = await call_async_step(self.funcs[0], args, kwargs)
+            if releases and 0 in releases:
+                get_memory().release(releases[0])
+            for index, (_, dispatch) in enumerate(self.steps, 1):
+                func = self.funcs[index]
+                if dispatch == SINGLE:
+                    result = await call_async_step(func, (result,), {})
+                elif dispatch == UNPACK:
+                    result = await call_async_step(func, tuple(result), {})
+                elif dispatch == NO_ARGUMENT:
+                    result = await call_async_step(func, (), {})
+                elif type(result) == tuple:
+                    result = await call_async_step(func, result, {})
+                elif result is None:
+                    result = await call_async_step(func, (), {})
+                else:
+                    result = await call_async_step(func, (result,), {})
+                if releases and index in releases:
+                    get_memory().release(releases[index])
+            return result
+        except PypelyError:
+            raise
+        except Exception as e:
+            raise PipelineStepError(self.funcs[index], e)
+
+
+def compile_async_plan(funcs: Sequence[Callable]) -> AsyncPlan:
+    """I check that the given functions can be chained and compile them into an `AsyncPlan`.
+
+    The annotations of coroutine functions describe the awaited result. So the checks are the same as for `Plan`.
+
+    Args:
+        funcs (Sequence[Callable]): The steps of the pipeline. At least one step is required.
+
+    Returns:
+        AsyncPlan: The awaitable plan that runs all steps.
+    """
+    check_steps(funcs)
+    return AsyncPlan(funcs)
+
+
+def as_coroutine_function(func: Callable[P, T]) -> Callable[P, Awaitable[T]]:
+    """I make sure that `func` can be awaited.
+
+    Coroutine functions are returned untouched. All other functions are run in a thread.
+
+    Args:
+        func (Callable[P, T]): A step of the pipeline
+
+    Returns:
+        Callable[P, Awaitable[T]]: A coroutine function
+    """
+    if is_coroutine_function(func):
+        return func  # type: ignore
+
+    async def _in_thread(*args: P.args, **kwargs: P.kwargs) -> T:
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    return _in_thread
+
+
+async def call_async_step(func: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+    """I await `func` or run it in a thread, like `as_coroutine_function` does, and notify the registered hooks.
+
+    Args:
+        func (Callable[..., Any]): A step as provided by the user
+        args (Tuple[Any, ...]): The positional arguments given to the step
+        kwargs (Dict[str, Any]): The keyword arguments given to the step
+
+    Returns:
+        Any: The output of the step.
+    """
+    if is_coroutine_function(func):
+        return await run_async_step(func, args, kwargs)
+    return await asyncio.to_thread(run_step, func, args, kwargs)
+
+
+def is_coroutine_function(func: Callable) -> bool:
+    """I check if calling `func` returns a coroutine.
+
+    `Memorizable` is checked by the function it wraps.
+
+    Args:
+        func (Callable): The function to check
+
+    Returns:
+        bool: `True` if `func` is a coroutine function.
+    """
+    return inspect.iscoroutinefunction(getattr(func, "func", func))
+
+
+async def gather_branches(
+    funcs: Sequence[Callable],
+    coroutine_functions: Sequence[Callable[..., Awaitable[Any]]],
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+) -> PypelyTuple:
+    """I run all branches as concurrent tasks and collect the outputs in order.
+
+    Args:
+        funcs (Sequence[Callable]): The branches as provided by the user. They are used for error messages.
+        coroutine_functions (Sequence[Callable[..., Awaitable[Any]]]): The branches as coroutine functions
+        args (Tuple[Any, ...]): The positional arguments given to each branch
+        kwargs (Dict[str, Any]): The keyword arguments given to each branch
+
+    Returns:
+        PypelyTuple: The outputs of the branches in the order of the branches.
+
+    Raises:
+        PypelyError: errors raised by pypely itself are forwarded untouched.
+        PipelineStepError: if a branch fails. If multiple branches fail, the error of the first of them is raised.
+    """
+    if HOOKS:
+        tasks = [asyncio.ensure_future(call_async_step(func, args, kwargs)) for func in funcs]
+    else:
+        tasks = [asyncio.ensure_future(func(*args, **kwargs)) for func in coroutine_functions]
+    done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+
+    failed = [(func, task) for func, task in zip(funcs, tasks) if task in done and task.exception() is not None]
+    if failed:
+        for task in pending:
+            task.cancel()
+
+        func, task = failed[0]
+        try:
+            task.result()
+        except PypelyError:
+            raise
+        except Exception as e:
+            raise PipelineStepError(func, e)
+
+    return PypelyTuple(*(task.result() for task in tasks))
@@ -0,0 +1,144 @@
+"""I run vectorized steps on batches of records.
+
+A vectorized step takes a list of values and returns a list with one output per value.
+`batched` turns such a step into a step that takes a single value. This way it can be used like any other step.
+The annotation `List[T] -> List[U]` is turned into `T -> U` so the types are checked at buildtime.
+
+When the pipeline is called for a single record, the vectorized step is called with a batch of one.
+When the pipeline is streamed, the records are collected into batches. Each batch is passed to the vectorized
+step at once and the outputs are scattered back to their records in order.
+"""
+
+import inspect
+from typing import Any, Callable, List, Optional, Sequence, get_args, get_origin
+
+from pypely._internal.function_manipulation import signature_of
+from pypely._internal.type_matching import check_if_annotations_given
+from pypely.core.errors import InvalidBatchAnnotationError
+
+
+class Batched:
+    """I am a step that runs a vectorized function on batches of values."""
+
+    func: Callable[[List[Any]], List[Any]]
+    size: int
+    max_wait: Optional[float]
+
+    def __init__(self, func: Callable[[List[Any]], List[Any]], size: int, max_wait: Optional[float]) -> None:
+        if size < 1:
+            raise ValueError(f"The size of a batch must be at least 1. Given size: {size}")
+        if max_wait is not None and max_wait < 0:
+            raise ValueError(f"The maximum wait must not be negative. Given max_wait: {max_wait}")
+
+        self.func = func
+        self.size = size
+        self.max_wait = max_wait
+
+        parameter, input_type, output_type = _element_types(func)
+        self.__annotations__ = {parameter.name: input_type, "return": output_type}
+        self.__signature__ = inspect.Signature(
+            [parameter.replace(annotation=input_type)], return_annotation=output_type
+        )
+        self.__qualname__ = func.__qualname__
+
+    @property
+    def __name__(self):
+        """noqa: D105.
+
+        # noqa: DAR201
+        """
+        return self.func.__name__
+
+    @property
+    def __code__(self):
+        """noqa: D105.
+
+        # noqa: DAR201
+        """
+        return self.func.__code__
+
+    @property
+    def __module__(self):
+        """noqa: D105.
+
+        # noqa: DAR201
+        """
+        return self.func.__module__
+
+    def __call__(self, value: Any) -> Any:
+        """I run the vectorized function on a batch that only holds `value`.
+
+        Args:
+            value (Any): The output of the previous step
+
+        Returns:
+            Any: The output of the vectorized function for `value`.
+        """
+        return self.run([value])[0]
+
+    def run(self, values: Sequence[Any]) -> List[Any]:
+        """I split `values` into batches of my size and run the vectorized function once per batch.
+
+        Args:
+            values (Sequence[Any]): The outputs of the previous step for multiple records
+
+        Returns:
+            List[Any]: The outputs of the vectorized function in the order of `values`.
+
+        Raises:
+            ValueError: if the vectorized function does not return one output per value.
+        """
+        outputs: List[Any] = []
+        for start in range(0, len(values), self.size):
+            batch = list(values[start : start + self.size])
+            result = list(self.func(batch))
+            if len(result) != len(batch):
+                raise ValueError(
+                    f"The batched step returned {len(result)} outputs for a batch of {len(batch)} values."
+                )
+            outputs += result
+        return outputs
+
+
+def _element_types(func: Callable) -> tuple[inspect.Parameter, Any, Any]:
+    """I turn the annotation `List[T] -> List[U]` of a vectorized function into `T` and `U`.
+
+    Args:
+        func (Callable): The vectorized function
+
+    Raises:
+        InvalidBatchAnnotationError: if `func` does not take a single list and return a list.
+
+    Returns:
+        tuple[inspect.Parameter, Any, Any]: The parameter of `func`, the type of its elements and the type of the returned elements.
+    """
+    check_if_annotations_given(func)
+
+    parameters = list(signature_of(func).parameters.values())
+    if len(parameters) != 1:
+        raise InvalidBatchAnnotationError(func)
+
+    input_type = _list_element_type(parameters[0].annotation)
+    output_type = _list_element_type(func.__annotations__["return"])
+    if input_type is None or output_type is None:
+        raise InvalidBatchAnnotationError(func)
+
+    return parameters[0], input_type, output_type
+
+
+def _list_element_type(annotation: Any) -> Optional[Any]:
+    """I provide the type of the elements of a list annotation.
+
+    Args:
+        annotation (Any): The annotation, e.g. `List[int]`
+
+    Returns:
+        Optional[Any]: The type of the elements. `None` if `annotation` is no list annotation.
+    """
+    if get_origin(annotation) is not list:
+        return None
+
+    args = get_args(annotation)
+    if len(args) != 1:
+        return None
+    return args[0]
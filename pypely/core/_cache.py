@@ -0,0 +1,174 @@
+"""I store the outputs of steps, so that steps don't recompute outputs for inputs they have already seen.
+
+The cache is bounded by the number of entries (least recently used entries are evicted first)
+and optionally by the age of the entries. The inputs are turned into a key. Inputs that can't be hashed,
+e.g. `DataFrame`s, are pickled and the digest of the pickled bytes is used instead.
+
+The cache is shared by all copies of a step. So `cached(step) >> "result"` uses the same cache as `cached(step)`.
+"""
+
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+from pypely.memory._backends import deep_size_of
+
+
+class CacheInfo(NamedTuple):
+    """I am a snapshot of the statistics of a step cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    entries: int
+    maxsize: Optional[int]
+    bytes: int
+
+
+class _Entry(NamedTuple):
+    value: Any
+    expires_at: float
+    size: int
+
+
+class StepCache:
+    """I hold the outputs of a step for the inputs it was called with."""
+
+    maxsize: Optional[int]
+    ttl: Optional[float]
+
+    def __init__(
+        self,
+        maxsize: Optional[int],
+        ttl: Optional[float],
+        key: Optional[Callable[..., Hashable]],
+    ) -> None:
+        if maxsize is not None and maxsize < 1:
+            raise ValueError(f"The cache needs to hold at least one entry. Given maxsize: {maxsize}")
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f"The time to live must be positive. Given ttl: {ttl}")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._key = key
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._bytes = 0
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "StepCache":
+        """I am shared by all copies of a step.
+
+        # noqa: DAR101
+        # noqa: DAR201
+        """
+        return self
+
+    def call(self, func: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        """I provide the stored output for the given inputs or call `func` and store its output.
+
+        Args:
+            func (Callable[..., Any]): The step
+            args (Tuple[Any, ...]): The positional arguments given to the step
+            kwargs (Dict[str, Any]): The keyword arguments given to the step
+
+        Returns:
+            Any: The output of the step.
+        """
+        key = self._key(*args, **kwargs) if self._key is not None else default_key(args, kwargs)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self.ttl is None or entry.expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return entry.value
+                self._remove(key)
+                self._expirations += 1
+            self._misses += 1
+
+        value = func(*args, **kwargs)
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else 0.0
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(value, expires_at, deep_size_of(value))
+            self._bytes += self._entries[key].size
+            while self.maxsize is not None and len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+        return value
+
+    def info(self) -> CacheInfo:
+        """I provide the statistics of the cache.
+
+        The bytes are the sum of the sizes of all stored outputs including the objects they contain (see `deep_size_of`).
+
+        Returns:
+            CacheInfo: hits, misses, evictions, expirations, entries, maxsize and bytes held.
+        """
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self._expirations,
+                len(self._entries),
+                self.maxsize,
+                self._bytes,
+            )
+
+    def clear(self) -> None:
+        """I remove all entries and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = self._expirations = self._bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+
+def default_key(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Hashable:
+    """I turn the inputs of a step into a key.
+
+    Hashable inputs are used as they are. All other inputs are pickled and represented by the digest of the bytes.
+
+    Args:
+        args (Tuple[Any, ...]): The positional arguments given to the step
+        kwargs (Dict[str, Any]): The keyword arguments given to the step
+
+    Returns:
+        Hashable: The key of the inputs.
+    """
+    return (
+        tuple(_hashable(arg) for arg in args),
+        tuple(sorted((name, _hashable(value)) for name, value in kwargs.items())),
+    )
+
+
+def _hashable(value: Any) -> Hashable:
+    """I make sure that `value` can be hashed.
+
+    Args:
+        value (Any): An input of a step
+
+    Returns:
+        Hashable: `value` itself if it can be hashed. Otherwise its type and the digest of the pickled value.
+    """
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        digest = hashlib.sha256(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+        return (type(value).__qualname__, digest)
@@ -0,0 +1,325 @@
+"""I remember pipelines whose steps passed the buildtime checks, so that restarts skip the checks.
+
+`pipeline(..., check_cache="checks.jsonl")` stores an entry for each pipeline that passed its checks.
+An entry is addressed by a fingerprint of the steps: their qualified names, the hash of their code objects and
+their annotations. Classes in annotations are described with their base classes, so a changed class hierarchy is
+noticed as well. Classes defined inside functions can't be told apart by their names, so steps annotated with them
+are always checked. The names of the steps and the type vars resolved between them are stored along for inspection.
+
+If an entry with the fingerprint of a pipeline exists, the types of the steps are not compared again.
+Otherwise the steps are checked and a new entry is stored. The memory entries are always checked.
+Pipelines with the same step names, e.g. built from the same factory, may differ in their annotations.
+So the latest `FINGERPRINTS_PER_PIPELINE` entries are kept for the same step names, older entries are dropped.
+
+The fingerprint of each step is cached as long as the step exists and keeps its annotations and code,
+so steps shared by many pipelines are described once.
+
+The file is written as JSON lines. New entries are appended, so processes can share the file.
+The file is compacted when it is loaded and holds more outdated lines than entries.
+It is only replaced if no other process appended to it in the meantime.
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import tempfile
+import threading
+import weakref
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, TypeVar, Union, get_args, get_origin
+
+from pypely._internal.type_matching import TYPE_CACHE_SIZE
+
+FINGERPRINTS_PER_PIPELINE = 4
+
+_STEP_FINGERPRINTS: Dict[int, Tuple[weakref.ref, Tuple[Any, ...], bytes]] = dict()
+_CACHES: Dict[Union[str, Path], "CheckCache"] = dict()  # by the given and the resolved path
+_CACHES_LOCK = threading.Lock()
+
+
+def check_cache_at(path: Union[str, Path]) -> "CheckCache":
+    """I provide the cache stored at `path`. The file is loaded once per process.
+
+    Args:
+        path (Union[str, Path]): The cache file
+
+    Returns:
+        CheckCache: The cache of the file.
+    """
+    cache = _CACHES.get(path)
+    if cache is not None:
+        return cache
+
+    resolved = Path(path).resolve()
+    with _CACHES_LOCK:
+        if resolved not in _CACHES:
+            _CACHES[resolved] = CheckCache(resolved)
+        _CACHES[path] = _CACHES[resolved]
+        return _CACHES[path]
+
+
+class CheckCache:
+    """I hold the fingerprints of the pipelines that passed their checks."""
+
+    path: Path
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = dict()  # by fingerprint
+        self._fingerprints: Dict[str, List[str]] = dict()  # by the step names, the latest fingerprint last
+        self._load()
+
+    def fingerprint(self, funcs: Sequence[Callable]) -> Optional[str]:
+        """I describe everything the buildtime checks of the steps depend on.
+
+        Args:
+            funcs (Sequence[Callable]): The steps of the pipeline
+
+        Returns:
+            Optional[str]: The fingerprint of the steps. `None` if they can't be described, they are then always checked.
+        """
+        try:
+            return _fingerprint(funcs)
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+    def is_checked(self, fingerprint: str) -> bool:
+        """I check if the steps passed their checks before and haven't changed since.
+
+        Args:
+            fingerprint (str): The current fingerprint of the steps
+
+        Returns:
+            bool: `True` if an entry with the fingerprint is stored.
+        """
+        return fingerprint in self._entries
+
+    def store(self, funcs: Sequence[Callable], fingerprint: str, usages: Sequence[Mapping[TypeVar, Any]]) -> None:
+        """I store the fingerprint of steps that passed their checks.
+
+        The oldest entry with the same step names is dropped once there are more than `FINGERPRINTS_PER_PIPELINE`.
+
+        The cache is best effort, so errors while writing it are ignored.
+
+        Args:
+            funcs (Sequence[Callable]): The steps of the pipeline
+            fingerprint (str): The current fingerprint of the steps
+            usages (Sequence[Mapping[TypeVar, Any]]): The type vars resolved for each step after the first one
+        """
+        entry: Dict[str, Any] = {
+            "pipeline": _pipeline_key(funcs),
+            "fingerprint": fingerprint,
+            "type_vars": [{repr(type_var): _describe(_type) for type_var, _type in usage.items()} for usage in usages],
+        }
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            self._add(entry)
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a") as cache_file:
+                    cache_file.write(line)
+            except OSError:
+                pass
+
+    def _load(self) -> None:
+        """I read the entries of the file. Broken lines, e.g. of an interrupted write, are skipped."""
+        try:
+            with open(self.path, "rb") as cache_file:
+                content = cache_file.read()
+        except OSError:
+            return
+
+        lines = content.decode(errors="replace").splitlines()
+        for line in lines:
+            try:
+                entry = json.loads(line)
+                self._add(entry)
+            except (ValueError, KeyError, TypeError, AttributeError):
+                continue
+
+        if len(lines) > 2 * len(self._entries):
+            self._compact(len(content))
+
+    def _add(self, entry: Dict[str, Any]) -> None:
+        """I add an entry as the latest one and drop the oldest entry with the same step names if there are too many.
+
+        Args:
+            entry (Dict[str, Any]): The entry
+        """
+        fingerprint = entry["fingerprint"]
+        fingerprints = self._fingerprints.setdefault(entry["pipeline"], [])
+        if fingerprint in self._entries:
+            fingerprints.remove(fingerprint)
+        fingerprints.append(fingerprint)
+        self._entries[fingerprint] = entry
+
+        while len(fingerprints) > FINGERPRINTS_PER_PIPELINE:
+            del self._entries[fingerprints.pop(0)]
+
+    def _compact(self, loaded_size: int) -> None:
+        """I rewrite the file with the current entries only. The file is replaced at once.
+
+        Entries appended by other processes since the file was loaded would be lost.
+        So the file is left as it is if it changed, it is compacted by the next process that loads it instead.
+
+        Args:
+            loaded_size (int): The size of the file when it was loaded
+        """
+        try:
+            descriptor, temporary = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(descriptor, "w") as cache_file:
+                cache_file.writelines(json.dumps(entry) + "\n" for entry in self._entries.values())
+            if os.stat(self.path).st_size != loaded_size:
+                raise OSError(f"{self.path} changed while it was compacted")
+            os.replace(temporary, self.path)
+        except OSError:
+            Path(temporary).unlink(missing_ok=True)
+
+
+def _pipeline_key(funcs: Sequence[Callable]) -> str:
+    return " | ".join(_name(func) for func in funcs)
+
+
+def _fingerprint(funcs: Sequence[Callable]) -> str:
+    """I describe everything the buildtime checks depend on.
+
+    Args:
+        funcs (Sequence[Callable]): The steps of the pipeline
+
+    Returns:
+        str: The hex digest of the names, code objects and annotations of the steps.
+    """
+    digest = hashlib.sha256()
+    for func in funcs:
+        digest.update(_step_fingerprint(func))
+    return digest.hexdigest()
+
+
+def _step_fingerprint(func: Callable) -> bytes:
+    """I describe everything the buildtime checks depend on for a single step.
+
+    The fingerprint is cached as long as `func` exists and keeps the same annotations, code and signature objects,
+    like `signature_of` does. Steps that can't be weakly referenced are described every time.
+
+    Args:
+        func (Callable): A step of the pipeline
+
+    Returns:
+        bytes: The digest of the name, code object and annotations of the step.
+    """
+    inner = _innermost(func)
+    annotations = func.__annotations__
+    signature = inner.__dict__.get("__signature__") if hasattr(inner, "__dict__") else None
+    code = _code_object(inner)
+    metadata = (annotations, code, signature)
+
+    key = id(func)
+    cached = _STEP_FINGERPRINTS.get(key)
+    if cached is not None:
+        ref, cached_metadata, fingerprint = cached
+        if ref() is func and all(old is new for old, new in zip(cached_metadata, metadata)):
+            return fingerprint
+
+    digest = hashlib.sha256()
+    digest.update(_name(func).encode())
+    digest.update(marshal.dumps(code) if code is not None else b"")
+    for name, annotation in annotations.items():
+        digest.update(f"{name}:{_describe(annotation)};".encode())
+    if signature is not None:  # set by `define_signature`, e.g. for pipelines
+        digest.update(repr([(name, p.kind) for name, p in signature.parameters.items()]).encode())
+    digest.update(repr(sorted(getattr(func, "attributes_set_by_memory", ()))).encode())
+    fingerprint = digest.digest()
+
+    try:
+        ref = weakref.ref(func, lambda _: _STEP_FINGERPRINTS.pop(key, None))
+    except TypeError:
+        return fingerprint
+    _STEP_FINGERPRINTS[key] = (ref, metadata, fingerprint)
+    return fingerprint
+
+
+def _name(func: Callable) -> str:
+    module = getattr(_innermost(func), "__module__", "")  # wrappers like `memorizable` belong to pypely
+    return f"{module}.{getattr(func, '__qualname__', type(func).__qualname__)}"
+
+
+def _innermost(func: Callable) -> Callable:
+    """I unwrap a step, e.g. a `memorizable`.
+
+    Args:
+        func (Callable): The step
+
+    Returns:
+        Callable: The function that is wrapped by the step or the step itself.
+    """
+    inner = getattr(func, "func", None) or getattr(func, "__wrapped__", None)
+    while inner is not None and inner is not func:
+        func, inner = inner, getattr(inner, "func", None) or getattr(inner, "__wrapped__", None)
+    return func
+
+
+def _code_object(func: Callable) -> Any:
+    """I provide the code object of a function. It includes the names and kinds of the parameters.
+
+    Args:
+        func (Callable): The function
+
+    Returns:
+        Any: The code object of the function or of the `__call__` of a callable object. `None` if there is none.
+    """
+    return getattr(func, "__code__", None) or getattr(getattr(type(func), "__call__", None), "__code__", None)
+
+
+def _describe(_type: Any) -> str:
+    """I describe a type annotation. Classes are described with the qualified names of their base classes.
+
+    Type vars are described with their module, their name, their bound and their constraints.
+
+    The descriptions of hashable annotations are cached, as the same annotations are used by many steps.
+    Generic types are described by their origin and their arguments, e.g. `(builtins.list, builtins.object)[...]`.
+
+    Args:
+        _type (Any): Any type annotation
+
+    Returns:
+        str: The description of the annotation and the types it contains.
+
+    Raises:
+        ValueError: if the annotation contains a class that is defined inside a function.  # noqa: DAR402 ValueError
+    """
+    try:
+        return _describe_cached(_type)
+    except TypeError:  # unhashable annotations, e.g. `Annotated[int, {}]`
+        return _describe_uncached(_type)
+
+
+def _describe_uncached(_type: Any) -> str:
+    if isinstance(_type, TypeVar):
+        constraints = ", ".join(_describe_uncached(constraint) for constraint in _type.__constraints__)
+        return f"{_type.__module__}.{_type!r}({_describe_uncached(_type.__bound__)}; {constraints})"
+    args = get_args(_type)
+    if args:
+        return f"{_describe_uncached(get_origin(_type))}[{', '.join(_describe_uncached(arg) for arg in args)}]"
+    if isinstance(_type, type):
+        return _describe_class(_type)
+    if hasattr(_type, "__supertype__"):  # a `NewType`
+        return f"{_type!r}({_describe_uncached(_type.__supertype__)})"
+    if isinstance(_type, list):  # the parameters of a `Callable`
+        return f"[{', '.join(_describe_uncached(arg) for arg in _type)}]"
+    return repr(_type)
+
+
+@lru_cache(maxsize=TYPE_CACHE_SIZE)
+def _describe_class(_class: type) -> str:
+    if any("<locals>" in base.__qualname__ for base in _class.__mro__):
+        raise ValueError(f"{_class.__qualname__} is defined inside a function and can't be described by its name")
+    return f"({', '.join(f'{base.__module__}.{base.__qualname__}' for base in _class.__mro__)})"
+
+
+_describe_cached = lru_cache(maxsize=TYPE_CACHE_SIZE)(_describe_uncached)
@@ -0,0 +1,177 @@
+"""I defer the buildtime checks of a pipeline.
+
+`pipeline(..., check="eager")` checks the steps right away. This is the default.
+`pipeline(..., check="lazy")` checks the steps when the pipeline is used for the first time.
+Programs that build many pipelines but only use some of them start faster this way.
+`pipeline(..., check="background")` checks the steps in a worker thread. The first use waits for the checks.
+The checks hold the GIL, so this doesn't make building faster. It only lets the calling thread go on,
+e.g. to wait for I/O while the checks run.
+
+Deferred checks raise the same errors as eager checks, e.g. `OutputInputDoNotMatchError`, just later.
+They are raised by every use of a pipeline that failed its checks. Each use raises a new error,
+which is chained to the error of the checks. `validate()` returns a future of the checks,
+so the errors can be collected at a convenient time, e.g. once all pipelines of a service have been built.
+Errors of background checks can also be reported by a callback: `pipeline(..., on_check_error=...)`.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Sequence
+
+from pypely.core._check_cache import CheckCache
+from pypely.core._plan import Plan, compile_plan
+
+EAGER = "eager"
+LAZY = "lazy"
+BACKGROUND = "background"
+CHECK_MODES = (EAGER, LAZY, BACKGROUND)
+
+_CHECKER: Optional[ThreadPoolExecutor] = None
+_CHECKER_LOCK = threading.Lock()
+
+
+def check_check_mode(check: Any, on_check_error: Optional[Callable[[Exception], Any]]) -> None:
+    """I check that `check` is a supported mode.
+
+    Args:
+        check (Any): The mode given to `pipeline`
+        on_check_error (Optional[Callable[[Exception], Any]]): The callback given to `pipeline`
+
+    Raises:
+        ValueError: if the mode is not supported or a callback is given for checks that don't run in the background.
+    """
+    if check not in CHECK_MODES:
+        raise ValueError(f"The steps of a pipeline can't be checked {check!r}. Supported: {CHECK_MODES}")
+    if on_check_error is not None and check != BACKGROUND:
+        raise ValueError(f"`on_check_error` requires check={BACKGROUND!r}. The {check} checks raise their errors.")
+
+
+def checked(result: Optional[BaseException] = None) -> Future:
+    """I provide a future of checks that are already done.
+
+    Args:
+        result (Optional[BaseException], optional): The error raised by the checks. Defaults to None.
+
+    Returns:
+        Future: A done future that raises `result` or returns `None`.
+    """
+    future: Future = Future()
+    if result is None:
+        future.set_result(None)
+    else:
+        future.set_exception(result)
+    return future
+
+
+class DeferredPlan:
+    """I compile the plan of a pipeline when it is needed or in a worker thread.
+
+    As long as lazy checks fail, each use runs them again. Failed background checks raise their error on each use.
+    """
+
+    def __init__(
+        self,
+        funcs: Sequence[Callable],
+        background: bool,
+        on_check_error: Optional[Callable[[Exception], Any]] = None,
+        check_cache: Optional[CheckCache] = None,
+    ) -> None:
+        self._funcs = tuple(funcs)
+        self._check_cache = check_cache
+        self._plan: Optional[Plan] = None
+        self._lock = threading.Lock()
+        self._future: Optional[Future] = None
+
+        if background:
+            self._future = _checker().submit(self._compile)
+            if on_check_error is not None:
+                self._future.add_done_callback(lambda done: _report(done, on_check_error))
+
+    def __call__(self) -> Plan:
+        """I provide the compiled plan.
+
+        Returns:
+            Plan: The checked and compiled steps of the pipeline.
+
+        Raises:
+            PypelyError: a new error like the one of the failed background checks, e.g. `OutputInputDoNotMatchError`.
+
+        # noqa: DAR401 _renewed
+        # noqa: DAR402 PypelyError
+        """
+        plan = self._plan
+        if plan is not None:
+            return plan
+        if self._future is not None:
+            error = self._future.exception()
+            if error is not None:
+                raise _renewed(error) from error
+            return self._future.result()
+        with self._lock:
+            return self._plan or self._compile()
+
+    def validate(self) -> Future:
+        """I provide the future of the checks. Lazy checks are run now.
+
+        Returns:
+            Future: A future that returns `None` if the checks pass and raises their error otherwise.
+        """
+        if self._future is not None:
+            future: Future = Future()
+            self._future.add_done_callback(lambda done: _forward(done, future))
+            return future
+        try:
+            self()
+        except Exception as e:
+            return checked(e)
+        return checked()
+
+    def _compile(self) -> Plan:
+        plan = compile_plan(self._funcs, self._check_cache)
+        self._plan = plan
+        return plan
+
+
+def _report(done: Future, on_check_error: Callable[[Exception], Any]) -> None:
+    error = done.exception()
+    if isinstance(error, Exception):
+        on_check_error(error)
+
+
+def _forward(done: Future, future: Future) -> None:
+    error = done.exception()
+    if error is None:
+        future.set_result(None)
+    else:
+        renewed = _renewed(error)
+        renewed.__cause__ = error
+        future.set_exception(renewed)
+
+
+def _renewed(error: BaseException) -> BaseException:
+    """I create a new error like `error`, so that raising it again doesn't extend the traceback of `error`.
+
+    Args:
+        error (BaseException): The error of the checks
+
+    Returns:
+        BaseException: An error of the same type with the same message and attributes but without a traceback.
+    """
+    renewed = type(error).__new__(type(error), *error.args)
+    renewed.__dict__.update(error.__dict__)
+    return renewed
+
+
+def _checker() -> ThreadPoolExecutor:
+    """I provide the worker thread that runs the background checks of all pipelines.
+
+    The checks mostly hold the GIL, so a single worker thread is enough.
+
+    Returns:
+        ThreadPoolExecutor: The executor with the worker thread.
+    """
+    global _CHECKER
+    with _CHECKER_LOCK:
+        if _CHECKER is None:
+            _CHECKER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pypely-check")
+        return _CHECKER
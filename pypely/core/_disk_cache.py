@@ -0,0 +1,237 @@
+"""I store the outputs of steps on disk, so that they survive the process.
+
+Each output is addressed by a fingerprint of the code of the step and a fingerprint of its inputs.
+The code fingerprint includes the closure variables and defaults of the step, so steps created by the same factory
+don't share their outputs.
+If the code or one of its local dependencies changes, the step is computed again. When all steps of a pipeline
+are stored on disk, an unchanged prefix of the pipeline is loaded from disk and only the changed steps run.
+
+The outputs are stored as `<directory>/<step>/<code fingerprint>-<input fingerprint>.pkl`.
+Files are written to a temporary file first and then moved into place, so a crash never leaves a broken entry.
+If the files exceed the given size, the least recently used files of the directory are removed.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from pypely._internal.fingerprint import code_fingerprint, stable_dumps
+from pypely.core._cache import CacheInfo
+
+SUFFIX = ".pkl"
+MAX_REPORTED_MISSES = 100
+
+NOT_STORED = "no output is stored for this step. It has not been computed yet or has been evicted."
+NEW_INPUT = "the input has not been seen by this version of the step."
+CODE_CHANGED = "the code of the step or one of its local dependencies changed."
+
+
+class CacheMiss(NamedTuple):
+    """I describe why a step had to be computed."""
+
+    step: str
+    code_fingerprint: str
+    input_fingerprint: str
+    reason: str
+
+
+class DiskCache:
+    """I hold the outputs of a step in a directory."""
+
+    directory: Path
+    max_bytes: Optional[int]
+
+    def __init__(
+        self, func: Callable, directory: Union[str, Path], max_bytes: Optional[int], track_dependencies: bool
+    ) -> None:
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f"The cache needs to hold at least one byte. Given max_bytes: {max_bytes}")
+
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.step = f"{func.__module__}.{func.__qualname__}"
+        self.code_fingerprint = code_fingerprint(func, track_dependencies)
+        self._step_directory = self.directory / self.step.replace("<", "_").replace(">", "_")
+        self._lock = threading.Lock()
+        self._misses: Deque[CacheMiss] = deque(maxlen=MAX_REPORTED_MISSES)
+        self._hits = 0
+        self._miss_count = 0
+        self._evictions = 0
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "DiskCache":
+        """I am shared by all copies of a step.
+
+        # noqa: DAR101
+        # noqa: DAR201
+        """
+        return self
+
+    def call(self, func: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        """I load the stored output for the given inputs or call `func` and store its output.
+
+        Args:
+            func (Callable[..., Any]): The step
+            args (Tuple[Any, ...]): The positional arguments given to the step
+            kwargs (Dict[str, Any]): The keyword arguments given to the step
+
+        Returns:
+            Any: The output of the step.
+        """
+        input_fingerprint = _input_fingerprint(args, kwargs)
+        path = self._step_directory / f"{self.code_fingerprint}-{input_fingerprint}{SUFFIX}"
+
+        try:
+            with open(path, "rb") as stored:
+                value = pickle.load(stored)
+            os.utime(path)
+            with self._lock:
+                self._hits += 1
+            return value
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass
+
+        with self._lock:
+            self._miss_count += 1
+            self._misses.append(
+                CacheMiss(self.step, self.code_fingerprint, input_fingerprint, self._reason(input_fingerprint))
+            )
+
+        value = func(*args, **kwargs)
+        self._store(path, value)
+        return value
+
+    def info(self) -> CacheInfo:
+        """I provide the statistics of the cache.
+
+        Hits, misses and evictions are counted for this process. Entries and bytes describe the files of the step.
+
+        Returns:
+            CacheInfo: hits, misses, evictions, entries and bytes on disk. There are no expirations and no maxsize.
+        """
+        files = _stored_files(self._step_directory)
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._miss_count,
+                self._evictions,
+                0,
+                len(files),
+                None,
+                sum(size for _, _, size in files),
+            )
+
+    def misses(self) -> List[CacheMiss]:
+        """I report why the step was computed instead of loaded. Only the latest misses are kept.
+
+        Returns:
+            List[CacheMiss]: The latest misses, oldest first.
+        """
+        with self._lock:
+            return list(self._misses)
+
+    def clear(self) -> None:
+        """I remove all stored outputs of the step and reset the statistics."""
+        for path, _, _ in _stored_files(self._step_directory):
+            path.unlink(missing_ok=True)
+        with self._lock:
+            self._misses.clear()
+            self._hits = self._miss_count = self._evictions = 0
+
+    def _reason(self, input_fingerprint: str) -> str:
+        """I tell why there is no stored output for the input.
+
+        Args:
+            input_fingerprint (str): The fingerprint of the input
+
+        Returns:
+            str: The reason of the miss.
+        """
+        names = [path.name for path, _, _ in _stored_files(self._step_directory)]
+        if any(name.endswith(f"-{input_fingerprint}{SUFFIX}") for name in names):
+            return CODE_CHANGED
+        if any(name.startswith(f"{self.code_fingerprint}-") for name in names):
+            return NEW_INPUT
+        return NOT_STORED
+
+    def _store(self, path: Path, value: Any) -> None:
+        """I write the output atomically and evict old files if the directory is too large.
+
+        Args:
+            path (Path): The destination of the output
+            value (Any): The output of the step
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as temporary_file:
+                pickle.dump(value, temporary_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, path)
+        finally:
+            Path(temporary_path).unlink(missing_ok=True)  # only left if writing failed
+
+        if self.max_bytes is not None:
+            self._evict(keep=path)
+
+    def _evict(self, keep: Path) -> None:
+        """I remove the least recently used files of the directory until it fits into `max_bytes`.
+
+        Args:
+            keep (Path): The file that was just written. It is kept even if it exceeds `max_bytes` by itself.
+        """
+        files = sorted(
+            (file for step_directory in self.directory.iterdir() for file in _stored_files(step_directory)),
+            key=lambda file: file[1],
+        )
+        total = sum(size for _, _, size in files)
+        for path, _, size in files:
+            if total <= self.max_bytes:  # type: ignore
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+            with self._lock:
+                self._evictions += 1
+
+
+def _stored_files(directory: Path) -> List[Tuple[Path, float, int]]:
+    """I list the stored outputs in `directory`.
+
+    Args:
+        directory (Path): The directory of a step
+
+    Returns:
+        List[Tuple[Path, float, int]]: The path, the time of the last usage and the size of each stored output.
+    """
+    if not directory.is_dir():
+        return []
+
+    files = []
+    for path in directory.glob(f"*{SUFFIX}"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        files.append((path, stat.st_mtime, stat.st_size))
+    return files
+
+
+def _input_fingerprint(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
+    """I create a fingerprint of the inputs of a step that is stable across processes.
+
+    The inputs are pickled by `stable_dumps`, so sets don't depend on the hash seed of the process.
+
+    Args:
+        args (Tuple[Any, ...]): The positional arguments given to the step
+        kwargs (Dict[str, Any]): The keyword arguments given to the step
+
+    Returns:
+        str: The hex digest of the pickled inputs.
+    """
+    inputs = (args, sorted(kwargs.items()))
+    return hashlib.sha256(stable_dumps(inputs)).hexdigest()
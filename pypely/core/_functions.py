@@ -2,20 +2,38 @@
 
 `pipeline` is the core of pypely. This function lets you define pipelines from bare python functions. 
 You can use `fork`, `merge`, `to` and `identity` to create more complex pipelines. 
+`async_pipeline`, `async_fork`, `async_merge` and `async_to` are their counterparts for asyncio.
+`batched` lets you use vectorized functions as steps. `cached` stores the outputs of expensive steps.
+`disk_cached` stores them on disk, so they can be reused by later runs.
 
 You can find more detailed examples in the examples directory.
 """
 
-from functools import reduce
-from typing import Any, Callable, Tuple, Type, TypeVar
+from concurrent.futures import Executor, Future
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Hashable, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar, Union
 
 from typing_extensions import ParamSpec, Unpack
 
 from pypely._internal.function_manipulation import define_annotation, define_signature
 from pypely._types import PypelyTuple
-from pypely.core._safe_composition import _wrap_with_error_handling, check_and_compose
+from pypely.core._async import as_coroutine_function, compile_async_plan, gather_branches
+from pypely.core._batch import Batched
+from pypely.core._cache import StepCache
+from pypely.core._check_cache import check_cache_at
+from pypely.core._deferred import BACKGROUND, EAGER, DeferredPlan, check_check_mode, checked
+from pypely.core._disk_cache import DiskCache
+from pypely.core._parallel import DEFAULT_EXECUTOR, Branches, ExecutorContext
+from pypely.core._plan import Plan, compile_plan
+from pypely.core._readonly import check_share_mode
+from pypely.core._stream import stream
 from pypely.memory import memorizable
+from pypely.memory._accounting import MemoryAccount, MemoryReport
+from pypely.memory._backends import MemoryBackend
 from pypely.memory._context import PipelineMemoryContext
+from pypely.memory._impl import PipelineMemory
+from pypely.memory._scope import check_unique_entries
+from pypely.memory._wrappers import Memorizable
 
 T = TypeVar("T")
 P = ParamSpec("P")
@@ -23,7 +41,7 @@ Output = TypeVar("Output")
 
 
 # `Unpack` is currently not supported by mypy -> type: ignore in next line
-def pipeline(*funcs: Unpack[Tuple[Callable[P, Any], Unpack[Tuple[Callable, ...]], Callable[..., Output]]]) -> Callable[P, Output]:  # type: ignore
+def pipeline(*funcs: Unpack[Tuple[Callable[P, Any], Unpack[Tuple[Callable, ...]], Callable[..., Output]]], executor: Optional[Executor] = None, memory_backend: Optional[MemoryBackend] = None, check: str = EAGER, on_check_error: Optional[Callable[[Exception], Any]] = None, check_cache: Optional[Union[str, Path]] = None) -> Callable[P, Output]:  # type: ignore
     """I chain functions together.
 
     I can deal with any number of provided functions. But I need at least one function.
@@ -53,47 +71,131 @@ def pipeline(*funcs: Unpack[Tuple[Callable[P, Any], Unpack[Tuple[Callable, ...]]
         use_pypely() # -> 🥳
         ```
 
+    The pipeline can also be applied lazily to many records: `use_pypely.stream(records)`.
+    This returns a generator that yields the output for each record. Each record runs in an empty memory,
+    but the setup of the memory and the executor is done once for all records.
+
+    To find out which memory entries and steps hold the most memory, run the pipeline with
+    `output, report = use_pypely.with_memory_report(...)`. The `pypely.memory.MemoryReport` lists the deep size
+    of each memory entry and step output and the peak of bytes held at the same time.
+
+    The types of the steps are checked when the pipeline is built. `check="lazy"` defers the checks until the
+    pipeline is used for the first time, so programs that build many pipelines but use only some start faster.
+    `check="background"` runs the checks in a worker thread. This doesn't make building faster, as the checks hold
+    the GIL, but the calling thread can go on meanwhile. Deferred checks raise the same errors, each time the pipeline
+    is used. `use_pypely.validate()` returns a `concurrent.futures.Future` of the checks.
+    With `check_cache="checks.jsonl"` pipelines that passed their checks are stored in that file. As long as
+    their steps don't change, later processes skip comparing their types.
+
     Args:
         funcs (Callable): The functions that will be chained to form the pipeline.
+        executor (Optional[Executor], optional): The default executor of all `fork`s that run inside the pipeline.
+            See `fork` for details. Defaults to None.
+        memory_backend (Optional[MemoryBackend], optional): The backend that keeps the memory entries of the pipeline,
+            e.g. `pypely.memory.SpillToDisk`. Defaults to None.
+        check (str): When the steps are checked: `"eager"`, `"lazy"` or `"background"`. Defaults to "eager".
+        on_check_error (Optional[Callable[[Exception], Any]], optional): Is called in the worker thread with the error
+            of failed background checks. Defaults to None.
+        check_cache (Optional[Union[str, Path]], optional): The file that stores the pipelines that passed their checks.
+            Defaults to None.
 
     Returns:
         Callable[P, Output]: A callable that forwards the input `P` to the first function. The output of the first function is passed to the second function, etc.
     """
-    first, *remaining = funcs
-    initial = _wrap_with_error_handling(
-        first
-    )  # Only the second function is wrapped with error handling in check_and_compose
-    _pipeline = reduce(check_and_compose, remaining, initial)
+    check_check_mode(check, on_check_error)
+    _check_cache = check_cache_at(check_cache) if check_cache is not None else None
+    if check == EAGER:
+        _plan = compile_plan(funcs, _check_cache)
+        _pipeline: Callable[[], Plan] = lambda: _plan
+        _validate: Callable[[], Future] = checked
+        return_type = funcs[-1].__annotations__["return"]
+    else:
+        deferred = DeferredPlan(funcs, check == BACKGROUND, on_check_error, _check_cache)
+        _pipeline, _validate = deferred, deferred.validate
+        return_type = funcs[-1].__annotations__.get("return", Any)  # a missing annotation is reported by the checks
 
     @memorizable
     def _call(*args: P.args, **kwargs: P.kwargs) -> Output:
-        with PipelineMemoryContext() as _:
-            return _pipeline(*args, **kwargs)
+        with PipelineMemoryContext(backend=memory_backend) as _, ExecutorContext(executor) as _:
+            return _pipeline()(*args, **kwargs)
 
-    _call = define_annotation(_call, funcs[0], funcs[-1].__annotations__["return"])
-    _call = define_signature(_call, funcs[0], funcs[-1].__annotations__["return"])
+    def _stream(records: Iterable[Any]) -> Iterator[Output]:
+        return stream(_pipeline(), records, executor, memory_backend)
+
+    def _with_memory_report(*args: P.args, **kwargs: P.kwargs) -> Tuple[Output, MemoryReport]:
+        account = MemoryAccount()
+        with PipelineMemoryContext(PipelineMemory(memory_backend, account)) as _, ExecutorContext(executor) as _:
+            output = _pipeline().run_each(account.call_step, args, kwargs)
+        return output, account.report()
+
+    _call = define_annotation(_call, funcs[0], return_type)
+    _call = define_signature(_call, funcs[0], return_type)
+    _call.stream = _stream  # type: ignore
+    _call.with_memory_report = _with_memory_report  # type: ignore
+    _call.validate = _validate  # type: ignore
 
     return _call
 
 
-def fork(*funcs: Callable[P, Any]) -> Callable[P, PypelyTuple]:
+def fork(
+    *funcs: Callable[P, Any], executor: Optional[Executor] = None, share: Optional[str] = None
+) -> Callable[P, PypelyTuple]:
     """I split the output into multiple parallel branches.
 
     Each branch recieves the same input = the output of the function previous to `fork`.
 
+    By default the branches run one after another. If an `executor` is given, the branches are submitted to it
+    and run concurrently. Use a `ThreadPoolExecutor` for I/O-bound branches.
+    Use a `ProcessPoolExecutor` for CPU-bound branches. The branches and their input are then pickled
+    and sent to the worker processes. Branches that can't be pickled or interact with the memory run in
+    the calling process instead. This is reported by a `BranchRunsInCallingProcessWarning`.
+    The executor can also be set for all forks of a pipeline: `pipeline(..., executor=...)`.
+
+    Each branch receives the same input. With `share="readonly"` branches can't modify the input of other branches:
+    `numpy` arrays are passed as read-only views, writing to them raises a `ValueError`. `pandas` objects are passed
+    as copy-on-write copies, which requires copy-on-write to be enabled before pandas 3.0.
+    So branches don't need to copy their input defensively.
+
+    Example:
+        ```python
+        from concurrent.futures import ThreadPoolExecutor
+
+        executor = ThreadPoolExecutor(max_workers=8)
+
+        enrich = pipeline(
+            parse_request,
+            fork(
+                load_customer,
+                load_orders,
+                executor=executor
+            ),
+            merge(create_response)
+        )
+        ```
+
     Args:
         funcs (Callable): The functions that consume the output of the previous function in parallel.
+        executor (Optional[Executor], optional): The executor that runs the branches. Defaults to None.
+        share (Optional[str], optional): How the input is shared by the branches. `"readonly"` protects the input
+            against modifications. Defaults to None, which passes the input unchanged.
 
     Returns:
         Callable[P, PypelyTuple]: A function that provides the output of all provided functions as a tuple
     """
+    check_share_mode(share)
+    check_unique_entries(funcs)
+    branches = Branches(funcs, executor, share)
 
     @memorizable(allow_ingest=False)  # type: ignore
     def _fork(*args: P.args, **kwargs: P.kwargs) -> PypelyTuple:
-        return PypelyTuple(*(func(*args, **kwargs) for func in funcs))
+        _executor = executor or DEFAULT_EXECUTOR.get()
+        if _executor is None:
+            return branches.run_sequentially(args, kwargs)
+        return branches.run(_executor, args, kwargs)
 
     _fork_annotated = define_annotation(_fork, funcs[0], _fork.__annotations__["return"])
     _fork_signed = define_signature(_fork_annotated, funcs[0], _fork.__annotations__["return"])
+    _fork_signed.inner_steps = tuple(funcs)  # type: ignore
 
     return _fork_signed
 
@@ -185,10 +287,187 @@ def merge(func: Callable[P, T]) -> Callable[[PypelyTuple], T]:
 
     _merge_annotated = define_annotation(_merge, _mock_function, _merge.__annotations__["return"])
     _merge_signed = define_signature(_merge_annotated, _mock_function, _merge.__annotations__["return"])
+    _merge_signed.inner_steps = (func,)  # type: ignore
 
     return _merge_signed
 
 
+def batched(
+    func: Callable[[List[T]], List[Output]], size: int, max_wait: Optional[float] = None
+) -> Callable[[T], Output]:
+    """I turn a vectorized function into a step that takes a single value.
+
+    `func` needs to take a list of values and return a list with one output per value, in the same order.
+    The annotation `List[T] -> List[Output]` of `func` is turned into `T -> Output`. This is used to check the types
+    at buildtime like for any other step.
+
+    When the pipeline is streamed with `.stream(records)`, the records are collected into batches of `size`.
+    `func` is then called once per batch and the outputs are scattered back to their records. If `max_wait` is given,
+    a batch is passed on early once `max_wait` seconds have passed since its first record arrived.
+    This is checked whenever a new record arrives. When the pipeline is called directly, `func` receives a batch of one.
+
+    Example:
+        ```python
+        from pypely import batched, pipeline
+
+        def predict(features: List[Features]) -> List[float]:
+            return model.predict(pd.DataFrame(features)).tolist()
+
+        score = pipeline(
+            parse,
+            extract_features,
+            batched(predict, size=10_000),
+            to_response
+        )
+
+        responses = score.stream(requests)
+        ```
+
+    Args:
+        func (Callable[[List[T]], List[Output]]): The vectorized function
+        size (int): The maximum number of values per call of `func`
+        max_wait (Optional[float], optional): The seconds after which an incomplete batch is passed on. Defaults to None.
+
+    Returns:
+        Callable[[T], Output]: A step that runs `func` on batches of values.
+    """
+    return Batched(func, size, max_wait)
+
+
+def cached(
+    func: Callable[P, T],
+    maxsize: Optional[int] = 128,
+    ttl: Optional[float] = None,
+    key: Optional[Callable[..., Hashable]] = None,
+) -> Callable[P, T]:
+    """I store the outputs of `func`, so that it is only called for inputs it has not seen yet.
+
+    The inputs are turned into a key by `key`. By default hashable inputs are used as they are
+    and all other inputs, e.g. `DataFrame`s, by the digest of their pickled bytes.
+    Provide `key` if this is too slow or an input can't be pickled. `key` receives the same arguments as `func`.
+
+    I keep the annotations of `func` and can be used with the memory: `cached(func) >> "result"`.
+    Memory entries ingested into me are part of the key. All copies created by the shift operators share one cache.
+    The statistics of the cache are provided by `cache_info()`. `cache_clear()` empties the cache.
+
+    Example:
+        ```python
+        from pypely import cached, pipeline
+
+        boundaries = cached(outlier_boundaries, maxsize=16, ttl=3600)
+
+        handle_outliers = pipeline(
+            load_data,
+            boundaries >> "boundaries",
+            ...
+        )
+
+        boundaries.cache_info() # -> CacheInfo(hits=41, misses=1, evictions=0, ...)
+        ```
+
+    Args:
+        func (Callable[P, T]): The step whose outputs are stored
+        maxsize (Optional[int], optional): The maximum number of stored outputs. The least recently used output
+            is removed first. `None` for no limit. Defaults to 128.
+        ttl (Optional[float], optional): The seconds after which a stored output is recomputed. Defaults to None.
+        key (Optional[Callable[..., Hashable]], optional): The function that turns the inputs into a key. Defaults to None.
+
+    Returns:
+        Callable[P, T]: The step with a cache.
+    """
+    cache = StepCache(maxsize, ttl, key)
+
+    def _cached(*args: P.args, **kwargs: P.kwargs) -> T:
+        return cache.call(func, args, kwargs)
+
+    _cached.__name__ = func.__name__
+    _cached.__qualname__ = func.__qualname__
+    _cached = define_annotation(_cached, func, func.__annotations__["return"])
+    _cached = define_signature(_cached, func, func.__annotations__["return"])
+
+    _step = memorizable(_cached)
+    _step.inner_steps = (func,)  # type: ignore
+    _step.cache_info = cache.info  # type: ignore
+    _step.cache_clear = cache.clear  # type: ignore
+
+    return _step  # type: ignore
+
+
+def disk_cached(
+    func: Callable[P, T],
+    directory: Union[str, Path],
+    max_bytes: Optional[int] = None,
+    track_dependencies: bool = True,
+) -> Callable[P, T]:
+    """I store the outputs of `func` on disk, so that later runs load them instead of calling `func`.
+
+    The outputs are addressed by a fingerprint of the code of `func` and a fingerprint of the pickled inputs.
+    The code fingerprint includes the local modules `func` depends on, unless `track_dependencies` is `False`.
+    So changing `func` or one of its local dependencies invalidates its stored outputs.
+    If every step of a pipeline is wrapped, only the steps from the first changed step onwards are computed.
+
+    The code fingerprint includes the closure variables and defaults of `func`, e.g. the factor of `multiply_by(2)`.
+    They need to be picklable, otherwise a `ValueError` is raised.
+    If `func` already interacts with the memory, e.g. `@memorizable` functions, the function it wraps is stored.
+    The memory entries are kept. Ingested entries are part of the inputs, written entries are written on each call.
+
+    The inputs and outputs need to be picklable. Like `cached` I keep the annotations of `func` and can be used
+    with the memory. `cache_info()` provides the statistics and `cache_misses()` reports why the step was computed.
+    `cache_clear()` removes the stored outputs of the step.
+
+    Example:
+        ```python
+        from pypely import disk_cached, pipeline
+
+        add_features_cached = disk_cached(add_features, ".cache", max_bytes=2**30)
+
+        features = pipeline(
+            disk_cached(load_data, ".cache"),
+            disk_cached(remove_outliers, ".cache"),
+            add_features_cached,
+        )
+
+        features(path)
+        add_features_cached.cache_misses() # -> [CacheMiss(step=..., reason="the code of the step ... changed.")]
+        ```
+
+    Args:
+        func (Callable[P, T]): The step whose outputs are stored
+        directory (Union[str, Path]): The directory the outputs are stored in. It can be shared by many steps.
+        max_bytes (Optional[int], optional): The maximum size of all files in `directory`. The least recently used
+            files are removed first. `None` for no limit. Defaults to None.
+        track_dependencies (bool): Include the local dependencies of `func` in its fingerprint. Defaults to True.
+
+    Returns:
+        Callable[P, T]: The step that stores its outputs on disk.
+    """
+    if isinstance(func, Memorizable):
+        step = disk_cached(func.func, directory, max_bytes, track_dependencies)
+        memory_step = func.with_function(step.func)  # type: ignore
+        memory_step.cache_info = step.cache_info  # type: ignore
+        memory_step.cache_misses = step.cache_misses  # type: ignore
+        memory_step.cache_clear = step.cache_clear  # type: ignore
+        return memory_step
+
+    cache = DiskCache(func, directory, max_bytes, track_dependencies)
+
+    def _disk_cached(*args: P.args, **kwargs: P.kwargs) -> T:
+        return cache.call(func, args, kwargs)
+
+    _disk_cached.__name__ = func.__name__
+    _disk_cached.__qualname__ = func.__qualname__
+    _disk_cached = define_annotation(_disk_cached, func, func.__annotations__["return"])
+    _disk_cached = define_signature(_disk_cached, func, func.__annotations__["return"])
+
+    _step = memorizable(_disk_cached)
+    _step.inner_steps = (func,)  # type: ignore
+    _step.cache_info = cache.info  # type: ignore
+    _step.cache_misses = cache.misses  # type: ignore
+    _step.cache_clear = cache.clear  # type: ignore
+
+    return _step  # type: ignore
+
+
 def identity(x: T) -> T:
     """I forward the given input untouched.
 
@@ -204,6 +483,142 @@ def identity(x: T) -> T:
     return x
 
 
+# `Unpack` is currently not supported by mypy -> type: ignore in next line
+def async_pipeline(*funcs: Unpack[Tuple[Callable[P, Any], Unpack[Tuple[Callable, ...]], Callable[..., Output]]], memory_backend: Optional[MemoryBackend] = None) -> Callable[P, Awaitable[Output]]:  # type: ignore
+    """I chain functions together inside of an asyncio event loop.
+
+    I work like `pipeline` but return a coroutine function. Coroutine functions are awaited one after another.
+    All other functions are run in a thread, so they don't block the event loop.
+    The return annotation of a coroutine function describes the awaited result.
+    So the same checks as for `pipeline` are applied.
+
+    Use `async_fork`, `async_merge` and `async_to` inside of me. Each call of the pipeline uses its own memory.
+    This also holds for concurrent calls from different asyncio tasks.
+
+    Example:
+        ```python
+        from pypely import async_fork, async_merge, async_pipeline
+
+        async def load_customer(customer_id: int) -> Customer:
+            ...
+
+        async def load_orders(customer_id: int) -> List[Order]:
+            ...
+
+        def create_response(customer: Customer, orders: List[Order]) -> Response:
+            ...
+
+        handle_request = async_pipeline(
+            parse_customer_id,
+            async_fork(load_customer, load_orders),
+            async_merge(create_response)
+        )
+
+        response = await handle_request(request)
+        ```
+
+    Args:
+        funcs (Callable): The functions that will be chained to form the pipeline.
+        memory_backend (Optional[MemoryBackend], optional): The backend that keeps the memory entries of the pipeline.
+            Defaults to None.
+
+    Returns:
+        Callable[P, Awaitable[Output]]: A coroutine function that forwards the input `P` to the first function. The output of the first function is passed to the second function, etc.
+    """
+    _pipeline = compile_async_plan(funcs)
+
+    @memorizable
+    async def _call(*args: P.args, **kwargs: P.kwargs) -> Output:
+        with PipelineMemoryContext(backend=memory_backend) as _:
+            return await _pipeline(*args, **kwargs)
+
+    _call = define_annotation(_call, funcs[0], funcs[-1].__annotations__["return"])
+    _call = define_signature(_call, funcs[0], funcs[-1].__annotations__["return"])
+
+    return _call
+
+
+def async_fork(*funcs: Callable[P, Any]) -> Callable[P, Awaitable[PypelyTuple]]:
+    """I split the output into multiple branches that run as concurrent asyncio tasks.
+
+    I am the variant of `fork` for `async_pipeline`. The branches are run with `asyncio.wait`.
+    Branches that are no coroutine functions are run in a thread.
+    If a branch fails, the other branches are cancelled.
+
+    Args:
+        funcs (Callable): The functions that consume the output of the previous function concurrently.
+
+    Returns:
+        Callable[P, Awaitable[PypelyTuple]]: A coroutine function that provides the output of all provided functions as a tuple
+    """
+    check_unique_entries(funcs)
+    coroutine_functions = [as_coroutine_function(func) for func in funcs]
+
+    @memorizable(allow_ingest=False)  # type: ignore
+    async def _fork(*args: P.args, **kwargs: P.kwargs) -> PypelyTuple:
+        return await gather_branches(funcs, coroutine_functions, args, kwargs)
+
+    _fork_annotated = define_annotation(_fork, funcs[0], _fork.__annotations__["return"])
+    _fork_signed = define_signature(_fork_annotated, funcs[0], _fork.__annotations__["return"])
+    _fork_signed.inner_steps = tuple(funcs)  # type: ignore
+
+    return _fork_signed
+
+
+def async_to(cls: Type[T], *set_fields: str) -> Callable[[PypelyTuple], Awaitable[T]]:
+    """I convert multiple branches into an object.
+
+    I am the variant of `to` for `async_pipeline`. Instantiating the object is cheap.
+    So I run directly in the event loop instead of a thread.
+
+    Args:
+        cls (Type[T]): A class that will be instantiated by the outputs of the previous `async_fork`
+        set_fields (str): This can be used to define the order in which the fields are set. See `to` for details.
+
+    Returns:
+        Callable[[PypelyTuple], Awaitable[T]]: A coroutine function that will instantiate the object when called
+    """
+    _to = to(cls, *set_fields)
+
+    @memorizable(allow_ingest=False)  # type: ignore
+    async def _async_to(vals: PypelyTuple) -> T:
+        return _to(vals)
+
+    _to_annotated = define_annotation(_async_to, _to, _to.__annotations__["return"])
+    _to_signed = define_signature(_to_annotated, _to, _to.__annotations__["return"])
+
+    return _to_signed
+
+
+def async_merge(func: Callable[P, T]) -> Callable[[PypelyTuple], Awaitable[T]]:
+    """I merge multiple branches.
+
+    I am the variant of `merge` for `async_pipeline`. `func` can be a coroutine function.
+    Otherwise it is run in a thread.
+
+    Args:
+        func (Callable[P, T]): The function that defines the logic for how the branches will be merged.
+
+    Returns:
+        Callable[[PypelyTuple], Awaitable[T]]: A coroutine function that will apply `func` to the outputs of the previous `async_fork`
+    """
+    _func: Callable[..., Awaitable[T]] = as_coroutine_function(func)  # called with one argument per branch
+
+    @memorizable(allow_ingest=False)  # type: ignore
+    async def _merge(branches: PypelyTuple) -> T:
+        flat_branches = _flatten(branches)
+        return await _func(*flat_branches)
+
+    def _mock_function(p: PypelyTuple) -> None:
+        pass
+
+    _merge_annotated = define_annotation(_merge, _mock_function, _merge.__annotations__["return"])
+    _merge_signed = define_signature(_merge_annotated, _mock_function, _merge.__annotations__["return"])
+    _merge_signed.inner_steps = (func,)  # type: ignore
+
+    return _merge_signed
+
+
 def _flatten(_tuple: PypelyTuple) -> PypelyTuple:
     """I transform nested `PypelyTuples` into a flat `PypelyTuple`.
 
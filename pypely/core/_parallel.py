@@ -0,0 +1,291 @@
+"""I run the branches of a `fork` concurrently.
+
+The branches are submitted to a `concurrent.futures.Executor`. On a thread pool each branch runs in a copy of
+the calling context. This way the branches share the memory of the pipeline they belong to.
+On a process pool the branches and their input are pickled and sent to the worker processes.
+Branches that ingest memory entries receive these entries along. The workers of the pool are reused for every call.
+
+An executor can be given to `fork` directly or to `pipeline`. The executor given to `pipeline` is the default
+for all forks that are called while the pipeline runs.
+"""
+
+import pickle
+import warnings
+from concurrent.futures import FIRST_EXCEPTION, Executor, Future, ProcessPoolExecutor, wait
+from contextvars import ContextVar, Token, copy_context
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from pypely._types import PypelyError, PypelyTuple
+from pypely.core._readonly import readonly_inputs
+from pypely.core.errors import BranchRunsInCallingProcessWarning, PipelineStepError
+from pypely.hooks._impl import call_step
+from pypely.memory._impl import MEMORY, PipelineMemory, get_memory
+from pypely.memory._liveness import used_slots
+from pypely.memory._wrappers import Memorizable
+
+T = TypeVar("T")
+
+DEFAULT_EXECUTOR: ContextVar[Optional[Executor]] = ContextVar("DEFAULT_EXECUTOR", default=None)
+_ACTIVE_EXECUTOR: ContextVar[Optional[Executor]] = ContextVar("_ACTIVE_EXECUTOR", default=None)
+
+
+class ExecutorContext:
+    """I set the default executor for all forks that run inside of me."""
+
+    executor: Optional[Executor]
+    token: Optional[Token]
+
+    def __init__(self, executor: Optional[Executor]) -> None:
+        self.executor = executor
+        self.token = None
+
+    def __enter__(self) -> None:
+        """I set the executor as the default executor. Nothing happens if no executor is given."""
+        if self.executor is not None:
+            self.token = DEFAULT_EXECUTOR.set(self.executor)
+
+    def __exit__(self, type, value, traceback) -> None:
+        """I reset the default executor to the previous one.
+
+        # noqa: DAR101
+        """
+        if self.token is not None:
+            DEFAULT_EXECUTOR.reset(self.token)
+            self.token = None
+
+
+class Branches:
+    """I hold the branches of a `fork` and run them on an executor.
+
+    Threads share the memory with the calling context. Worker processes don't.
+    So on a `ProcessPoolExecutor` branches receive the memory entries they ingest along with their input.
+    Entries kept by a `SharedMemoryBackend` or `SpillToDisk` are sent as handles, so workers read them without copies.
+    Branches that write memory entries or can't be pickled run in the calling process, which is reported by a
+    `BranchRunsInCallingProcessWarning`. This is checked at buildtime if the fork is created with a
+    `ProcessPoolExecutor`. Otherwise it is checked once the branches are run in worker processes for the first time.
+
+    If `share` is `"readonly"`, each branch in this process receives a protected view of the input (see `readonly`).
+    Worker processes receive their own copy anyway.
+    """
+
+    funcs: Tuple[Callable[..., Any], ...]
+    share: Optional[str]
+
+    def __init__(
+        self, funcs: Sequence[Callable[..., Any]], executor: Optional[Executor], share: Optional[str] = None
+    ) -> None:
+        self.funcs = tuple(funcs)
+        self.share = share
+        self._runs_in_worker_process: Optional[Tuple[bool, ...]] = None
+
+        if isinstance(executor, ProcessPoolExecutor):
+            self._runs_in_worker_process = tuple(_can_run_in_worker_process(func) for func in self.funcs)
+
+    @property
+    def runs_in_worker_process(self) -> Tuple[bool, ...]:
+        """I tell for each branch if it can be sent to a worker process.
+
+        Returns:
+            Tuple[bool, ...]: `True` for each branch that can run in a worker process.
+        """
+        if self._runs_in_worker_process is None:
+            self._runs_in_worker_process = tuple(_can_run_in_worker_process(func) for func in self.funcs)
+        return self._runs_in_worker_process
+
+    def run(self, executor: Executor, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> PypelyTuple:
+        """I run all branches on the given executor and collect the outputs in order.
+
+        If a branch runs on a worker of the executor and forks again using the same executor, the inner branches run
+        sequentially. Otherwise a bounded executor could deadlock waiting for itself.
+
+        Args:
+            executor (Executor): The executor that runs the branches
+            args (Tuple[Any, ...]): The positional arguments given to each branch
+            kwargs (Dict[str, Any]): The keyword arguments given to each branch
+
+        Returns:
+            PypelyTuple: The outputs of the branches in the order of the branches.
+
+        Raises:
+            PypelyError: errors raised by pypely itself are forwarded untouched.
+            PipelineStepError: if a branch fails. If multiple branches fail, the error of the first of them is raised.
+        """
+        if _ACTIVE_EXECUTOR.get() is executor:
+            return self.run_sequentially(args, kwargs)
+
+        if isinstance(executor, ProcessPoolExecutor):
+            futures = self._submit_to_processes(executor, args, kwargs)
+        else:
+            futures = []
+            for func in self.funcs:
+                branch_args, branch_kwargs = self._inputs(args, kwargs)
+                run = copy_context().run
+                futures.append(executor.submit(run, _run_on, executor, func, *branch_args, **branch_kwargs))  # type: ignore
+
+        done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+        failed = [
+            (func, future)
+            for func, future in zip(self.funcs, futures)
+            if future in done and future.exception() is not None
+        ]
+        if failed:
+            for future in not_done:
+                future.cancel()
+
+            func, future = failed[0]
+            try:
+                future.result()
+            except PypelyError:
+                raise
+            except Exception as e:
+                raise PipelineStepError(func, e)
+
+        return PypelyTuple(*(future.result() for future in futures))
+
+    def run_sequentially(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> PypelyTuple:
+        """I run all branches one after another in the calling thread.
+
+        Args:
+            args (Tuple[Any, ...]): The positional arguments given to each branch
+            kwargs (Dict[str, Any]): The keyword arguments given to each branch
+
+        Returns:
+            PypelyTuple: The outputs of the branches in the order of the branches.
+        """
+        if self.share is None:
+            return PypelyTuple(*(call_step(func, args, kwargs) for func in self.funcs))
+        return PypelyTuple(*(call_step(func, *readonly_inputs(args, kwargs)) for func in self.funcs))
+
+    def _inputs(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+        """I provide the input of a single branch that runs in this process.
+
+        Args:
+            args (Tuple[Any, ...]): The positional arguments given to the fork
+            kwargs (Dict[str, Any]): The keyword arguments given to the fork
+
+        Returns:
+            Tuple[Tuple[Any, ...], Dict[str, Any]]: The arguments, protected if the input is shared read-only.
+        """
+        if self.share is None:
+            return args, kwargs
+        return readonly_inputs(args, kwargs)
+
+    def _submit_to_processes(
+        self, executor: ProcessPoolExecutor, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> List[Future]:
+        """I send the branches to the worker processes where possible and run the others in the calling process.
+
+        The branches in the calling process run while the worker processes are busy.
+
+        Args:
+            executor (ProcessPoolExecutor): The executor with the worker processes
+            args (Tuple[Any, ...]): The positional arguments given to each branch
+            kwargs (Dict[str, Any]): The keyword arguments given to each branch
+
+        Returns:
+            List[Future]: A future for each branch. The futures of branches in the calling process are already done.
+        """
+        futures: List[Optional[Future]] = [
+            executor.submit(_run_with_entries, func, _ingested_entries(func), args, kwargs)
+            if in_worker_process
+            else None
+            for func, in_worker_process in zip(self.funcs, self.runs_in_worker_process)
+        ]
+
+        for index, func in enumerate(self.funcs):
+            if futures[index] is None:
+                future: Future = Future()
+                try:
+                    future.set_result(call_step(func, *self._inputs(args, kwargs)))
+                except Exception as e:
+                    future.set_exception(e)
+                futures[index] = future
+
+        return futures  # type: ignore
+
+
+def _run_on(executor: Executor, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """I mark that `func` runs on a worker of `executor` and call it.
+
+    I am always called inside a copy of the context, so the mark does not leak.
+
+    Args:
+        executor (Executor): The executor that runs `func`
+        func (Callable[..., T]): The branch
+        args: The positional arguments given to the branch
+        kwargs: The keyword arguments given to the branch
+
+    Returns:
+        T: The output of the branch.
+    """
+    _ACTIVE_EXECUTOR.set(executor)
+    return call_step(func, args, kwargs)
+
+
+def _ingested_entries(func: Callable) -> Dict[int, Any]:
+    """I collect the memory entries a branch ingests, so that they can be sent to a worker process.
+
+    Args:
+        func (Callable): The branch
+
+    Returns:
+        Dict[int, Any]: The entries by their slots. See `PipelineMemory.portable`.
+    """
+    if not isinstance(func, Memorizable) or not func.used_memory:
+        return dict()
+    return get_memory().portable(func.slots_before + func.slots_after)
+
+
+def _run_with_entries(
+    func: Callable[..., T], entries: Dict[int, Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]
+) -> T:
+    """I call a branch in a worker process with a memory that holds the entries it ingests.
+
+    The entries still belong to the calling process. So the memory is not closed, which would remove them.
+
+    Args:
+        func (Callable[..., T]): The branch
+        entries (Dict[int, Any]): The ingested entries by their slots
+        args (Tuple[Any, ...]): The positional arguments given to the branch
+        kwargs (Dict[str, Any]): The keyword arguments given to the branch
+
+    Returns:
+        T: The output of the branch.
+    """
+    if not entries:
+        return func(*args, **kwargs)
+
+    memory = PipelineMemory()
+    memory.values.update(entries)
+    token = MEMORY.set(memory)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        MEMORY.reset(token)
+
+
+def _can_run_in_worker_process(func: Callable) -> bool:
+    """I check if `func` can be sent to a worker process and warn if not.
+
+    Args:
+        func (Callable): The branch
+
+    Returns:
+        bool: `True` if the branch can run in a worker process.
+    """
+    reason = None
+    if isinstance(func, Memorizable) and (
+        func.written_slot is not None or any(used_slots(inner_step) for inner_step in func.inner_steps)
+    ):
+        reason = "it writes to the memory."
+    else:
+        try:
+            pickle.dumps(func)
+        except Exception as e:
+            reason = f"it can't be pickled. {type(e).__name__}: {e}"
+
+    if reason is None:
+        return True
+
+    warnings.warn(BranchRunsInCallingProcessWarning(func, reason))
+    return False
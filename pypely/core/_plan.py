@@ -0,0 +1,218 @@
+"""I compile the steps of a pipeline into a flat plan.
+
+Chaining the steps with nested closures would cost multiple python frames per step and call.
+Very long pipelines would even hit the recursion limit. Instead the steps are checked once during buildtime
+and stored in a flat list. A single loop forwards the output of each step to the next one.
+Failing steps are identified by their position in this list. This avoids wrapping each step with an error handler.
+
+How the output of a step is handed to the next step (unpacked, no argument, single argument) is
+decided at buildtime from the return annotation. Only if the annotation can't rule out any of the cases,
+the decision is made at runtime.
+
+Memory entries are released right after the last step that uses them. These steps are determined at buildtime.
+
+If hooks are registered (see `pypely.hooks`), the steps are run through `run_step` instead, which reports them.
+Without hooks this costs a single check per call.
+"""
+
+from typing import Any, Callable, Dict, Generic, Optional, Sequence, Tuple, TypeVar, get_origin
+
+from typing_extensions import ParamSpec
+
+from pypely._types import PypelyError
+from pypely.core._check_cache import CheckCache
+from pypely.core._safe_composition import NO_TYPE_VAR_USAGE, check_composition
+from pypely.core.errors import PipelineStepError
+from pypely.hooks._impl import HOOKS, run_step
+from pypely.memory._impl import get_memory
+from pypely.memory._liveness import last_usages
+from pypely.memory._scope import check_memory_entries
+
+T = TypeVar("T")
+P = ParamSpec("P")
+
+SINGLE = 0  # `step(result)`
+UNPACK = 1  # `step(*result)`
+NO_ARGUMENT = 2  # `step()`
+DYNAMIC = 3  # decided at runtime by the type of the result
+
+
+class Plan(Generic[P, T]):
+    """I run the compiled steps of a pipeline one after another."""
+
+    funcs: Tuple[Callable, ...]
+    steps: Tuple[Tuple[Callable, int], ...]
+    releases: Dict[int, Tuple[int, ...]]
+
+    def __init__(self, funcs: Sequence[Callable]) -> None:
+        self.funcs = tuple(funcs)
+        self.first = funcs[0]
+        self.steps = tuple(
+            (func, _dispatch(previous.__annotations__["return"])) for previous, func in zip(funcs, funcs[1:])
+        )
+        self.releases = last_usages(self.funcs)
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> T:
+        """I run all steps. The output of each step is forwarded to the next step.
+
+        Errors are caught once for the whole run instead of wrapping every single step.
+        The index of the running step is used to tell which step failed.
+
+        Args:
+            args: The positional arguments given to the first step
+            kwargs: The keyword arguments given to the first step
+
+        Returns:
+            T: The output of the last step.
+
+        Raises:
+            PypelyError: errors raised by pypely itself are forwarded untouched.
+            PipelineStepError: if a step fails with an error that is not raised by pypely.
+        """
+        if HOOKS:
+            return self.run_each(run_step, args, kwargs)
+
+        releases = self.releases
+        index = 0
+        try:
+            result = self.first(*args, **kwargs)
+            if releases and 0 in releases:
+                get_memory().release(releases[0])
+            for index, (func, dispatch) in enumerate(self.steps, 1):
+                if dispatch == SINGLE:
+                    result = func(result)
+                elif dispatch == UNPACK:
+                    result = func(*result)
+                elif dispatch == NO_ARGUMENT:
+                    result = func()
+                elif type(result) == tuple:
+                    result = func(*result)
+                elif result is None:
+                    result = func()
+                else:
+                    result = func(result)
+                if releases and index in releases:
+                    get_memory().release(releases[index])
+            return result
+        except PypelyError:
+            raise
+        except Exception as e:
+            raise PipelineStepError(self.funcs[index], e)
+
+    def run_each(
+        self,
+        call: Callable[[Callable[..., Any], Tuple[Any, ...], Dict[str, Any]], Any],
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> T:
+        """I run all steps like `__call__` but hand each step to `call`, e.g. to notify the registered hooks.
+
+        Args:
+            call (Callable[[Callable[..., Any], Tuple[Any, ...], Dict[str, Any]], Any]): Calls a step with
+                positional and keyword arguments and returns its output, e.g. `run_step`.
+            args (Tuple[Any, ...]): The positional arguments given to the first step
+            kwargs (Dict[str, Any]): The keyword arguments given to the first step
+
+        Returns:
+            T: The output of the last step.
+
+        Raises:
+            PypelyError: errors raised by pypely itself are forwarded untouched.
+            PipelineStepError: if a step fails with an error that is not raised by pypely.
+        """
+        releases = self.releases
+        index = 0
+        try:
+            result = call(self.first, args, kwargs)
+            if releases and 0 in releases:
+                get_memory().release(releases[0])
+            for index, (func, dispatch) in enumerate(self.steps, 1):
+                if dispatch == SINGLE:
+                    result = call(func, (result,), {})
+                elif dispatch == UNPACK:
+                    result = call(func, tuple(result), {})
+                elif dispatch == NO_ARGUMENT:
+                    result = call(func, (), {})
+                elif type(result) == tuple:
+                    result = call(func, result, {})
+                elif result is None:
+                    result = call(func, (), {})
+                else:
+                    result = call(func, (result,), {})
+                if releases and index in releases:
+                    get_memory().release(releases[index])
+            return result
+        except PypelyError:
+            raise
+        except Exception as e:
+            raise PipelineStepError(self.funcs[index], e)
+
+
+def compile_plan(funcs: Sequence[Callable], check_cache: Optional[CheckCache] = None) -> Plan:
+    """I check that the given functions can be chained and compile them into a `Plan`.
+
+    Args:
+        funcs (Sequence[Callable]): The steps of the pipeline. At least one step is required.
+        check_cache (Optional[CheckCache], optional): The cache of pipelines that passed their checks. Defaults to None.
+
+    Returns:
+        Plan: The callable plan that runs all steps.
+    """
+    check_steps(funcs, check_cache)
+    return Plan(funcs)
+
+
+def check_steps(funcs: Sequence[Callable], check_cache: Optional[CheckCache] = None) -> None:
+    """I check that each pair of consecutive steps fits together and that the memory entries are used correctly.
+
+    The types of the steps are not compared if `check_cache` holds the unchanged steps.
+
+    Args:
+        funcs (Sequence[Callable]): The steps of the pipeline.
+        check_cache (Optional[CheckCache], optional): The cache of pipelines that passed their checks. Defaults to None.
+    """
+    check_memory_entries(funcs)
+    fingerprint = check_cache.fingerprint(funcs) if check_cache is not None else None
+    if fingerprint is not None and check_cache.is_checked(fingerprint):  # type: ignore
+        return
+
+    usages = []
+    usage = NO_TYPE_VAR_USAGE
+    for func1, func2 in zip(funcs, funcs[1:]):
+        usage = check_composition(func1, func2, usage)
+        usages.append(usage)
+
+    if fingerprint is not None:
+        check_cache.store(funcs, fingerprint, usages)  # type: ignore
+
+
+def _dispatch(return_type: Any) -> int:
+    """I decide how the output of a step is handed to the next step.
+
+    The output is only unpacked if it is a plain `tuple`. If it is `None` the next step is called without arguments.
+    A return annotation that rules out both cases allows to skip the check at runtime.
+    Type vars, `Any`, `Union`, etc. can't rule out anything and are decided at runtime.
+
+    Args:
+        return_type (Any): The return annotation of the step producing the output.
+
+    Returns:
+        int: One of `SINGLE`, `UNPACK`, `NO_ARGUMENT` or `DYNAMIC`.
+    """
+    if return_type is None or return_type is type(None):
+        return NO_ARGUMENT
+
+    if return_type is Any:  # `Any` is a class since python 3.11
+        return DYNAMIC
+
+    origin = get_origin(return_type) or return_type
+    if origin is tuple:
+        return UNPACK
+
+    try:
+        if isinstance(origin, type) and not issubclass(tuple, origin):
+            return SINGLE
+    except TypeError:
+        pass
+
+    return DYNAMIC
@@ -0,0 +1,83 @@
+"""I protect the input of the branches of a `fork` against modifications.
+
+Each branch of a `fork` receives the same input. If a branch modifies the input in place, the other branches
+see the modification. With `fork(..., share="readonly")` each branch receives a protected view instead:
+
+- `numpy` arrays are passed as views with `writeable=False`. Writing to them raises a `ValueError`.
+- `pandas` objects are passed as shallow copies. With copy-on-write, which is always enabled since pandas 3.0,
+  a modification only changes the copy of the branch. Without copy-on-write the input can't be protected without
+  copying all of its data, so a `ValueError` is raised instead.
+- All other values are passed unchanged.
+"""
+
+import sys
+from typing import Any, Dict, Tuple
+
+from pypely.memory._backends import _is_instance_of
+
+READONLY = "readonly"
+SHARE_MODES = (None, READONLY)
+
+
+def check_share_mode(share: Any) -> None:
+    """I check that `share` is a supported mode.
+
+    Args:
+        share (Any): The mode given to `fork`
+
+    Raises:
+        ValueError: if the mode is not supported.
+    """
+    if share not in SHARE_MODES:
+        raise ValueError(f"The branches of a fork can't share their input as {share!r}. Supported: {SHARE_MODES}")
+
+
+def readonly_inputs(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+    """I protect the inputs of a single branch.
+
+    Args:
+        args (Tuple[Any, ...]): The positional arguments given to the branch
+        kwargs (Dict[str, Any]): The keyword arguments given to the branch
+
+    Returns:
+        Tuple[Tuple[Any, ...], Dict[str, Any]]: The protected positional and keyword arguments.
+    """
+    return tuple(readonly(arg) for arg in args), {name: readonly(value) for name, value in kwargs.items()}
+
+
+def readonly(value: Any) -> Any:
+    """I protect a single value.
+
+    Args:
+        value (Any): The input of a branch
+
+    Returns:
+        Any: A read-only view or a copy-on-write copy of `value`. Other values are returned unchanged.
+
+    Raises:
+        ValueError: if `value` is a `pandas` object and copy-on-write is disabled.
+    """
+    if _is_instance_of(value, "numpy", "ndarray"):
+        view = value.view()
+        view.flags.writeable = False
+        return view
+    if _is_instance_of(value, "pandas", "DataFrame") or _is_instance_of(value, "pandas", "Series"):
+        if not _copy_on_write():
+            raise ValueError(
+                "The branches of a fork can only share pandas objects read-only with copy-on-write. "
+                "Enable it with `pandas.set_option('mode.copy_on_write', True)`."
+            )
+        return value.copy(deep=False)
+    return value
+
+
+def _copy_on_write() -> bool:
+    """I check if `pandas` copies the data of shallow copies before they are modified.
+
+    Returns:
+        bool: `True` if copy-on-write is enabled.
+    """
+    pandas = sys.modules["pandas"]
+    if int(pandas.__version__.split(".")[0]) >= 3:
+        return True
+    return pandas.options.mode.copy_on_write is True
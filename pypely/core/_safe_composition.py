@@ -1,84 +1,67 @@
 import inspect
-from functools import wraps
 from itertools import zip_longest
 from types import MappingProxyType
-from typing import Any, Callable, Iterable, List, Set, Tuple, Type, TypeVar, get_args
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Set, Tuple, Type, TypeVar, get_args
 
-from typing_extensions import ParamSpec
-
-from pypely._internal.function_manipulation import define_annotation, define_signature
+from pypely._internal.function_manipulation import signature_of
 from pypely._internal.type_matching import check_if_annotations_given, is_optional, is_subtype
-from pypely._types import PypelyError, PypelyTuple
-from pypely.core.errors import OutputInputDoNotMatchError, PipelineStepError
+from pypely.core.errors import OutputInputDoNotMatchError
+
+TypeVarUsage = Mapping[TypeVar, Any]  # type var -> the more specific type it has been used with
+NO_TYPE_VAR_USAGE: TypeVarUsage = MappingProxyType({})
 
-T = TypeVar("T")
-P = ParamSpec("P")
-CombineFirstOutput = TypeVar("CombineFirstOutput")
-CombineSecondOutput = TypeVar("CombineSecondOutput")
 
+def check_composition(func1: Callable, func2: Callable, usage: TypeVarUsage = NO_TYPE_VAR_USAGE) -> TypeVarUsage:
+    """I test if two functions can be combined.
 
-def check_and_compose(
-    func1: Callable[P, CombineFirstOutput], func2: Callable[[CombineFirstOutput], CombineSecondOutput]
-) -> Callable[P, CombineSecondOutput]:
-    """I test if two functions can be combined and do so if they fit.
+    The output of `func1` needs to fit the input of `func2`.
+    Neither the functions nor their annotations are changed. The type vars used by the functions are tracked
+    in a new mapping for each composition instead, so the same functions can be checked in many pipelines at once.
 
     Args:
         func1 (Callable): The first function
         func2 (Callable): The second function
+        usage (TypeVarUsage): The type vars of `func1` that have been used with more specific types
 
     Returns:
-        Callable[P, CombineSecondOutput]: A function that forwards the result of func1 to func2.
+        TypeVarUsage: The type vars of `func2` that are used with more specific types by this composition.
     """
     check_if_annotations_given(func1)
     check_if_annotations_given(func2)
-    _check_if_annotations_match(func1, func2)
-
-    func2 = _wrap_with_error_handling(func2)
-
-    def _composition(*args: P.args, **kwargs: P.kwargs) -> CombineSecondOutput:
-        _result = func1(*args, **kwargs)
-        if type(_result) == tuple and type(_result) != PypelyTuple:
-            return func2(*_result)
-
-        if _result is None:
-            return func2()
-
-        return func2(_result)
-
-    _composition = define_annotation(_composition, func1, func2.__annotations__["return"])
-    _composition = define_signature(_composition, func1, func2.__annotations__["return"])
+    return _check_if_annotations_match(func1, func2, usage)
 
-    if hasattr(func2, "_typevar_usage"):
-        _typevar_usage = getattr(func2, "_typevar_usage")
-        setattr(_composition, "_typevar_usage", _typevar_usage)
 
-    return _composition
-
-
-def _check_if_annotations_match(func1: Callable, func2: Callable) -> None:
+def _check_if_annotations_match(func1: Callable, func2: Callable, usage: TypeVarUsage) -> TypeVarUsage:
     """I check that the output of func1 matches the input of func2.
 
     Args:
         func1 (Callable): The function that produces the output
         func2 (Callable): The function that consumes the output
+        usage (TypeVarUsage): The type vars of `func1` that have been used with more specific types
+
+    Returns:
+        TypeVarUsage: The type vars of `func2` that are used with more specific types.
 
     Raises:
         OutputInputDoNotMatchError: Is raised if the output type defers from the input type.
     """
-    return_types, expected_parameters = _collect_types(func1, func2)
+    return_types, expected_parameters = _collect_types(func1, func2, usage)
     try:
         expected_parameters = _trim_optional_expected_parameters(len(return_types), expected_parameters)
     except RuntimeError as re:
         raise OutputInputDoNotMatchError(func1, func2, re)
 
+    next_usage: Dict[TypeVar, Any] = dict()
     for t1, t2 in zip(return_types, expected_parameters):
         if not is_subtype(t1, t2):
             raise OutputInputDoNotMatchError(func1, func2)
 
-        _track_type_var_usage(t1, t2, func2)
+        _track_type_var_usage(t1, t2, next_usage)
+
+    return MappingProxyType(next_usage)
 
 
-def _collect_types(func1: Callable, func2: Callable) -> Tuple[List[Type], List[Type]]:
+def _collect_types(func1: Callable, func2: Callable, usage: TypeVarUsage) -> Tuple[List[Type], List[Type]]:
     """I collect all types from the function annotations.
 
     This also includes to resolve type vars if they have already been used with a more specific type in the given function context.
@@ -86,6 +69,7 @@ def _collect_types(func1: Callable, func2: Callable) -> Tuple[List[Type], List[T
     Args:
         func1 (Callable): The function from which the output will be used.
         func2 (Callable): The function which will use the output of `func1` as input.
+        usage (TypeVarUsage): The type vars of `func1` that have been used with more specific types
 
     Returns:
         Tuple[List[Type], List[Type]]: (
@@ -96,14 +80,14 @@ def _collect_types(func1: Callable, func2: Callable) -> Tuple[List[Type], List[T
     _filter_none_annotations = lambda types: [t for t in types if t is not None]
 
     return_type = func1.__annotations__["return"]
-    expected_parameters = inspect.signature(func2).parameters
+    expected_parameters = signature_of(func2).parameters
 
     return_types: Tuple[Type, ...] = (return_type,)
     if hasattr(return_type, "__origin__"):
         if return_type.__origin__ == tuple:
             return_types = get_args(return_type)
 
-    _return_types = _resolve_type_var_usage(return_types, func1)
+    _return_types = _resolve_type_var_usage(return_types, usage)
     _return_types = _filter_none_annotations(_return_types)
     _expected_types = _resolve_memory_usage(expected_parameters, func2)
     return _return_types, _expected_types
@@ -143,42 +127,34 @@ def _trim_optional_expected_parameters(number_return_types: int, expected_parame
     return expected_parameters[:number_return_types]
 
 
-def _resolve_type_var_usage(types: Iterable[Type], func: Callable) -> List[Type]:
-    """I check if a type var has been used in the context of the given function with a more specific type.
+def _resolve_type_var_usage(types: Iterable[Type], usage: TypeVarUsage) -> List[Type]:
+    """I check if a type var has been used in the context of a function with a more specific type.
 
     If a type var has been used it is replaced by that more specific type.
-    This function uses the attribute `_typevar_usage` of `func`.
-    This attribute has been set by the type checking if a type var was used with a more specific type.
+    Generic types that contain such a type var are substituted, e.g. `List[T]` becomes `List[int]`.
+    The given types are not changed, as `typing` shares them between all functions.
 
     Args:
         types (List[Type]): The list of identified types
-        func (Callable): The function to which these types belong
+        usage (TypeVarUsage): The type vars of the function that have been used with more specific types
 
     Returns:
         List[Type]: The list of types, where type vars are resolved, if possible.
     """
     resolved_types = list()
     for _type in types:
-        if hasattr(_type, "__args__"):
-            args = get_args(_type)
-            resolved_args = _resolve_type_var_usage(args, func)
-            setattr(_type, "__args__", tuple(resolved_args))
-
-            resolved_types.append(_type)
+        if type(_type) == TypeVar:
+            resolved_types.append(usage.get(_type, _type))
             continue
 
-        if not type(_type) == TypeVar:
-            resolved_types.append(_type)
-            continue
-        if not hasattr(func, "_typevar_usage"):
-            resolved_types.append(_type)
-            continue
-
-        if not _type.__name__ in func._typevar_usage:
-            resolved_types.append(_type)
-            continue
+        parameters = getattr(_type, "__parameters__", ())
+        if any(parameter in usage for parameter in parameters):
+            try:
+                _type = _type[tuple(usage.get(parameter, parameter) for parameter in parameters)]
+            except TypeError:
+                pass  # the type can't be substituted, so it is checked with its type vars
 
-        resolved_types.append(func._typevar_usage[_type.__name__])
+        resolved_types.append(_type)
 
     return resolved_types
 
@@ -208,53 +184,27 @@ def _resolve_memory_usage(
     return expected_types
 
 
-def _track_type_var_usage(t1: type[Any], t2: type[Any], func: Callable) -> Callable:
-    """I track the usage of type vars with more specific types in the context of the given function.
+def _track_type_var_usage(t1: type[Any], t2: type[Any], usage: Dict[TypeVar, Any]) -> Dict[TypeVar, Any]:
+    """I track the usage of type vars with more specific types in the context of a function.
 
-    If a type var is used with a more specific type it is added to the `_typevar_usage` dict of `func`.
+    If a type var is used with a more specific type it is added to `usage`.
 
     Args:
         t1 (type[Any]): The potentially more specific type
         t2 (type[Any]): The potential type var
-        func (Callable): The function which provides and tracks the context
+        usage (Dict[TypeVar, Any]): The type var usage of the function that takes `t2`
 
     Returns:
-        Callable: The function with the tracked type var usage.
+        Dict[TypeVar, Any]: The tracked type var usage.
     """
     t1_args = get_args(t1)
     t2_args = get_args(t2)
 
     if t1_args and t2_args:
         for _t1, _t2 in zip_longest(t1_args, t2_args, fillvalue=Any):
-            _track_type_var_usage(_t1, _t2, func)  # type: ignore
+            _track_type_var_usage(_t1, _t2, usage)  # type: ignore
 
     if type(t2) == TypeVar:
-        if not hasattr(func, "_typevar_usage"):
-            setattr(func, "_typevar_usage", dict())
-        func._typevar_usage[t2.__name__] = t1  # type: ignore
-
-    return func
-
-
-def _wrap_with_error_handling(func: Callable[P, T]) -> Callable[P, T]:
-    """I provide readable error messages if something goes wrong inside a user provided function.
-
-    Args:
-        func (Callable): The user provided function
-
-    Returns:
-        Callable: The wrapped version of the user provided function
-    """
+        usage[t2] = t1
 
-    @wraps(func)
-    def wrap(*args: P.args, **kwargs: P.kwargs) -> T:
-        try:
-            return func(*args, **kwargs)
-        except Exception as e:
-            if isinstance(e, PypelyError):
-                raise e
-            raise PipelineStepError(func, e)
-
-    wrap.__annotations__ = func.__annotations__
-    wrap.__signature__ = inspect.signature(func)  # type: ignore
-    return wrap
+    return usage
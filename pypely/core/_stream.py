@@ -0,0 +1,263 @@
+"""I run a pipeline lazily over an iterable of records.
+
+Calling a pipeline creates a new memory and sets the default executor for each call.
+When a pipeline is applied to many records this setup is paid once instead: the memory is allocated once
+and cleared for each record. How a record is handed to the first step is decided once as well.
+
+Each record still runs in an empty memory. So memory entries, `fork` and `merge` behave exactly like they do for
+a single call. Only one record is processed at a time and the output is handed out before the next record is read.
+This keeps the memory usage constant independent of the number of records.
+
+If the pipeline contains `batched` steps, the records are processed in chunks instead. All records of a chunk
+run up to the batched step, which is then called once for the whole chunk. Each record of a chunk has its own memory.
+The size of the chunks is bounded, so the memory usage is still independent of the number of records.
+If hooks are registered (see `pypely.hooks`), batched steps are reported once per chunk, other steps once per record.
+"""
+
+import inspect
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from pypely._internal.function_manipulation import signature_of
+from pypely._types import PypelyError
+from pypely.core._batch import Batched
+from pypely.core._parallel import ExecutorContext
+from pypely.core._plan import DYNAMIC, NO_ARGUMENT, SINGLE, UNPACK, Plan
+from pypely.core.errors import PipelineStepError
+from pypely.hooks._impl import HOOKS, run_step
+from pypely.memory._backends import MemoryBackend
+from pypely.memory._context import PipelineMemoryContext
+from pypely.memory._impl import MEMORY, PipelineMemory, set_memory
+
+T = TypeVar("T")
+
+
+def stream(
+    plan: Plan[Any, T], records: Iterable[Any], executor: Optional[Executor], backend: Optional[MemoryBackend] = None
+) -> Iterator[T]:
+    """I apply the plan to each record, one record at a time.
+
+    The pipeline memory and the default executor are only set while a record is processed.
+    They are reset before the output is handed out, so the code consuming the outputs is not affected.
+
+    Args:
+        plan (Plan[Any, T]): The compiled steps of the pipeline
+        records (Iterable[Any]): The records. Each record is the input of one run of the pipeline.
+        executor (Optional[Executor]): The default executor of all forks that run inside the pipeline
+        backend (Optional[MemoryBackend], optional): The backend of the memory. Defaults to None.
+
+    Yields:
+        T: The output of the pipeline for each record.
+    """
+    if any(isinstance(func, Batched) for func in plan.funcs):
+        yield from _stream_chunks(plan, records, executor, backend)
+        return
+
+    dispatch = _input_dispatch(plan.first)
+    memory_context = PipelineMemoryContext(PipelineMemory(backend))
+    executor_context = ExecutorContext(executor)
+
+    for record in records:
+        with memory_context, executor_context:
+            result = _apply_to_record(plan, dispatch, record)
+        yield result
+
+
+def _stream_chunks(
+    plan: Plan[Any, T], records: Iterable[Any], executor: Optional[Executor], backend: Optional[MemoryBackend]
+) -> Iterator[T]:
+    """I apply the plan to chunks of records, so that `batched` steps receive many records at once.
+
+    A chunk is as large as the largest batch of the pipeline. A chunk is closed early once the `max_wait`
+    of a batched step has passed since its first record arrived. This is checked whenever a record arrives.
+
+    Args:
+        plan (Plan[Any, T]): The compiled steps of the pipeline
+        records (Iterable[Any]): The records. Each record is the input of one run of the pipeline.
+        executor (Optional[Executor]): The default executor of all forks that run inside the pipeline
+        backend (Optional[MemoryBackend]): The backend of the memories
+
+    Yields:
+        T: The output of the pipeline for each record.
+    """
+    batched_steps = [func for func in plan.funcs if isinstance(func, Batched)]
+    size = max(step.size for step in batched_steps)
+    waits = [step.max_wait for step in batched_steps if step.max_wait is not None]
+    max_wait = min(waits) if waits else None
+
+    dispatches = (_input_dispatch(plan.first),) + tuple(dispatch for _, dispatch in plan.steps)
+    memories = [PipelineMemory(backend) for _ in range(size)]
+    executor_context = ExecutorContext(executor)
+
+    try:
+        for chunk in _chunks(records, size, max_wait):
+            with executor_context:
+                results = _run_chunk(plan, dispatches, chunk, memories)
+            for memory in memories:
+                memory.close()
+            yield from results
+    finally:
+        for memory in memories:
+            memory.close()
+
+
+def _run_chunk(
+    plan: Plan[Any, T], dispatches: Sequence[int], chunk: List[Any], memories: List[PipelineMemory]
+) -> List[T]:
+    """I run all steps for all records of a chunk. Each step runs for all records before the next step starts.
+
+    Batched steps are called once for the whole chunk. All other steps are called for each record in the
+    memory of this record.
+
+    Args:
+        plan (Plan[Any, T]): The compiled steps of the pipeline
+        dispatches (Sequence[int]): How the output of the previous step is handed to each step
+        chunk (List[Any]): The records
+        memories (List[PipelineMemory]): A memory for each record. They are cleared before they are used.
+
+    Returns:
+        List[T]: The output of the pipeline for each record.
+
+    Raises:
+        PypelyError: errors raised by pypely itself are forwarded untouched.
+        PipelineStepError: if a step fails with an error that is not raised by pypely.
+    """
+    for memory in memories[: len(chunk)]:
+        memory.clear()
+
+    hooks = bool(HOOKS)
+    token = MEMORY.set(memories[0])
+    values = list(chunk)
+    index = 0
+    try:
+        for index, (func, dispatch) in enumerate(zip(plan.funcs, dispatches)):
+            if isinstance(func, Batched):
+                values = run_step(func.run, (values,), {}, step=func) if hooks else func.run(values)
+                continue
+
+            for position, value in enumerate(values):
+                set_memory(memories[position])
+                if hooks:
+                    values[position] = run_step(func, _arguments(dispatch, value, first=index == 0), {})
+                elif index == 0:
+                    values[position] = _apply_to_record(func, dispatch, value)
+                elif dispatch == SINGLE:
+                    values[position] = func(value)
+                elif dispatch == UNPACK:
+                    values[position] = func(*value)
+                elif dispatch == NO_ARGUMENT or value is None:
+                    values[position] = func()
+                elif type(value) == tuple:
+                    values[position] = func(*value)
+                else:
+                    values[position] = func(value)
+
+            if index in plan.releases:
+                for memory in memories[: len(values)]:
+                    memory.release(plan.releases[index])
+        return values
+    except PypelyError:
+        raise
+    except Exception as e:
+        raise PipelineStepError(plan.funcs[index], e)
+    finally:
+        MEMORY.reset(token)
+
+
+def _chunks(records: Iterable[Any], size: int, max_wait: Optional[float]) -> Iterator[List[Any]]:
+    """I collect the records into chunks of at most `size` records.
+
+    Args:
+        records (Iterable[Any]): The records
+        size (int): The maximum number of records per chunk
+        max_wait (Optional[float]): The seconds after which a chunk is closed early. `None` to always fill the chunks.
+
+    Yields:
+        List[Any]: The next chunk of records.
+    """
+    chunk: List[Any] = []
+    started = 0.0
+    for record in records:
+        if not chunk:
+            started = time.monotonic()
+        chunk.append(record)
+        if len(chunk) == size or (max_wait is not None and time.monotonic() - started >= max_wait):
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def _apply_to_record(func: Callable[..., T], dispatch: int, record: Any) -> T:
+    """I hand the record to the first step.
+
+    Args:
+        func (Callable[..., T]): The first step or the whole plan
+        dispatch (int): How the record is handed to `func`. See `_input_dispatch`.
+        record (Any): The record
+
+    Returns:
+        T: The output of `func`.
+    """
+    if dispatch == SINGLE:
+        return func(record)
+    if dispatch == UNPACK:
+        return func(*record)
+    if dispatch == NO_ARGUMENT:
+        return func()
+    if type(record) == tuple:
+        return func(*record)
+    return func(record)
+
+
+def _arguments(dispatch: int, value: Any, first: bool) -> Tuple[Any, ...]:
+    """I provide the positional arguments a step receives from `_run_chunk`, so that hooks can report the step.
+
+    Args:
+        dispatch (int): How `value` is handed to the step
+        value (Any): The record or the output of the previous step
+        first (bool): Whether the step is the first step, which receives the record. See `_apply_to_record`.
+
+    Returns:
+        Tuple[Any, ...]: The positional arguments of the step.
+    """
+    if dispatch == SINGLE:
+        return (value,)
+    if dispatch == UNPACK:
+        return tuple(value)
+    if dispatch == NO_ARGUMENT or (value is None and not first):
+        return ()
+    if type(value) == tuple:
+        return value
+    return (value,)
+
+
+def _input_dispatch(first: Callable) -> int:
+    """I decide how a record is handed to the first step.
+
+    A first step with a single parameter receives the record as it is, even if the record is a tuple.
+    A first step with multiple parameters receives the record unpacked. A first step without parameters
+    is called without arguments for each record. If the step takes `*args`, plain tuples are unpacked.
+
+    Args:
+        first (Callable): The first step of the pipeline
+
+    Returns:
+        int: One of `SINGLE`, `UNPACK`, `NO_ARGUMENT` or `DYNAMIC`.
+    """
+    parameters = list(signature_of(first).parameters.values())
+    if any(parameter.kind == inspect.Parameter.VAR_POSITIONAL for parameter in parameters):
+        return DYNAMIC
+
+    positional = [
+        parameter
+        for parameter in parameters
+        if parameter.kind in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+    ]
+    if len(positional) == 0:
+        return NO_ARGUMENT
+    if len(positional) == 1:
+        return SINGLE
+    return UNPACK
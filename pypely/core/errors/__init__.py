@@ -1,6 +1,8 @@
 """I provide all errors that can occur when interacting with the core of pypely."""
 
 from ._pipeline import (
+    BranchRunsInCallingProcessWarning,
+    InvalidBatchAnnotationError,
     InvalidParameterAnnotationError,
     OutputInputDoNotMatchError,
     ParameterAnnotationsMissingError,
@@ -9,6 +11,8 @@ from ._pipeline import (
 )
 
 __all__ = [
+    "BranchRunsInCallingProcessWarning",
+    "InvalidBatchAnnotationError",
     "InvalidParameterAnnotationError",
     "OutputInputDoNotMatchError",
     "ParameterAnnotationsMissingError",
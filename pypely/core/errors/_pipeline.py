@@ -69,6 +69,23 @@ class InvalidParameterAnnotationError(PypelyError):
         )
 
 
+class InvalidBatchAnnotationError(PypelyError):
+    """I will be raised when a function used with `batched` is not annotated as `List[T] -> List[U]`."""
+
+    def __init__(self, func: Callable):
+        message = self.__error_message(func)
+        super().__init__(message)
+
+    def __error_message(self, func: Callable) -> str:
+        return "\n".join(
+            [
+                f"{func_details(func)} can't be batched.",
+                f"  The signature is {format_parameter_signature(func)} -> {func.__annotations__['return']}.",
+                f"  A batched function needs to take a single list and return a list: (values: List[T]) -> List[U].",
+            ]
+        )
+
+
 class OutputInputDoNotMatchError(PypelyError):
     """I will be raised when the output does not match the input of the following function."""
 
@@ -91,3 +108,20 @@ class OutputInputDoNotMatchError(PypelyError):
             msg.append(f"  This error was raised due to an inner exception: {inner_exception}")
 
         return "\n".join(msg)
+
+
+class BranchRunsInCallingProcessWarning(UserWarning):
+    """I will be issued when a branch of a `fork` can't be sent to a worker process."""
+
+    def __init__(self, func: Callable, reason: str):
+        message = self.__warning_message(func, reason)
+        super().__init__(message)
+
+    def __warning_message(self, func: Callable, reason: str) -> str:
+        return "\n".join(
+            [
+                f"The branch {func_details(func)} can't run in a worker process: {reason}",
+                f"  The branch will run in the calling process instead.",
+                f"  Only branches that can be pickled and don't write to the memory can run in worker processes.",
+            ]
+        )
@@ -0,0 +1,27 @@
+"""I let you observe the steps of your pipelines.
+
+Register a `StepHook` with `add_hook`. The hook is notified when a step starts, ends or fails.
+Each notification receives a `StepEvent` with the name and location of the step, the path of steps it runs in,
+the wall and CPU time and optionally the sizes of the inputs and the output.
+The branches of a `fork` are reported as steps as well, unless they run in a worker process.
+The steps of `async_pipeline`s and of streams are reported the same way. A `batched` step is reported once per batch.
+
+As long as no hook is registered, pipelines run without any instrumentation.
+
+Example:
+```python
+from pypely.hooks import StepEvent, StepHook, add_hook
+
+
+class PrintDurations(StepHook):
+    def on_step_end(self, event: StepEvent) -> None:
+        print(" > ".join(event.path), f"{event.wall_time:.3f}s")
+
+
+add_hook(PrintDurations())
+```
+"""
+
+from pypely.hooks._impl import StepEvent, StepHook, add_hook, remove_hook
+
+__all__ = ["StepEvent", "StepHook", "add_hook", "remove_hook"]
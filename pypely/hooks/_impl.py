@@ -0,0 +1,240 @@
+"""I implement the hooks that are fired around each step of a pipeline.
+
+The registered hooks are stored in a list. Pipelines check once per call if this list is empty.
+Only if hooks are registered, the steps are run through `run_step`, which measures and reports them.
+Coroutine functions of async pipelines are awaited by `run_async_step` instead.
+"""
+
+import sys
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from pypely.core.errors._formating import func_details
+
+T = TypeVar("T")
+
+
+@dataclass
+class StepEvent:
+    """I describe a single run of a step.
+
+    Attributes:
+        step (str): The name and location of the step.
+        path (Tuple[str, ...]): The names of the steps the step runs in, ending with the name of the step itself.
+        wall_time (Optional[float]): The seconds the step took. `None` until the step has finished.
+        cpu_time (Optional[float]): The CPU seconds of the thread that ran the step. `None` until the step has finished
+            and for awaited coroutine functions, which share their thread with other tasks.
+        input_size (Optional[int]): The size of the inputs in bytes. Only measured if a hook requests sizes.
+        output_size (Optional[int]): The size of the output in bytes. Only measured if a hook requests sizes.
+    """
+
+    step: str
+    path: Tuple[str, ...]
+    wall_time: Optional[float] = None
+    cpu_time: Optional[float] = None
+    input_size: Optional[int] = None
+    output_size: Optional[int] = None
+
+
+class StepHook:
+    """I am notified around each step of a pipeline.
+
+    Override the methods you are interested in. Set `measure_sizes` to `True` to receive input and output sizes.
+    Sizes are measured with `sys.getsizeof`, so contained objects are not included.
+    """
+
+    measure_sizes: bool = False
+
+    def on_step_start(self, event: StepEvent) -> None:
+        """I am called before the step runs.
+
+        Args:
+            event (StepEvent): The step that starts. The times and the output size are not set yet.
+        """
+
+    def on_step_end(self, event: StepEvent) -> None:
+        """I am called after the step returned.
+
+        Args:
+            event (StepEvent): The step that finished
+        """
+
+    def on_step_error(self, event: StepEvent, error: Exception) -> None:
+        """I am called if the step raised an error. The error is raised afterwards.
+
+        Args:
+            event (StepEvent): The step that failed. The output size is not set.
+            error (Exception): The raised error
+        """
+
+
+HOOKS: List[StepHook] = []
+PATH: ContextVar[Tuple[str, ...]] = ContextVar("PATH", default=())
+
+
+def add_hook(hook: StepHook) -> None:
+    """I register a hook for all pipelines of the process.
+
+    Args:
+        hook (StepHook): The hook that is notified around each step
+    """
+    HOOKS.append(hook)
+
+
+def remove_hook(hook: StepHook) -> None:
+    """I unregister a hook.
+
+    Args:
+        hook (StepHook): A registered hook
+    """
+    HOOKS.remove(hook)
+
+
+def call_step(func: Callable[..., T], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> T:
+    """I call `func` and notify the hooks if hooks are registered.
+
+    Args:
+        func (Callable[..., T]): The step
+        args (Tuple[Any, ...]): The positional arguments given to the step
+        kwargs (Dict[str, Any]): The keyword arguments given to the step
+
+    Returns:
+        T: The output of the step.
+    """
+    if HOOKS:
+        return run_step(func, args, kwargs)
+    return func(*args, **kwargs)
+
+
+def run_step(
+    func: Callable[..., T], args: Tuple[Any, ...], kwargs: Dict[str, Any], step: Optional[Callable] = None
+) -> T:
+    """I call `func` and notify all registered hooks.
+
+    While `func` runs, its path is the path of all steps that run inside of it.
+
+    Args:
+        func (Callable[..., T]): The step
+        args (Tuple[Any, ...]): The positional arguments given to the step
+        kwargs (Dict[str, Any]): The keyword arguments given to the step
+        step (Optional[Callable], optional): The step that is reported, e.g. a `batched` step whose vectorized
+            function is called. Defaults to None, which reports `func`.
+
+    Returns:
+        T: The output of the step.
+
+    Raises:
+        Exception: the error raised by `func` is raised again after the hooks have been notified.
+    """
+    hooks = tuple(HOOKS)
+    event = _start(hooks, step or func, args, kwargs)
+
+    token = PATH.set(event.path)
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    try:
+        result = func(*args, **kwargs)
+    except Exception as error:
+        _fail(hooks, event, error, wall_start, cpu_start)
+        raise
+    finally:
+        PATH.reset(token)
+
+    _end(hooks, event, result, wall_start, cpu_start)
+    return result
+
+
+async def run_async_step(func: Callable[..., Awaitable[T]], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> T:
+    """I await the coroutine function `func` and notify all registered hooks.
+
+    Other tasks run on the same thread while `func` is awaited, so no CPU time is reported.
+
+    Args:
+        func (Callable[..., Awaitable[T]]): The step
+        args (Tuple[Any, ...]): The positional arguments given to the step
+        kwargs (Dict[str, Any]): The keyword arguments given to the step
+
+    Returns:
+        T: The output of the step.
+
+    Raises:
+        Exception: the error raised by `func` is raised again after the hooks have been notified.
+    """
+    hooks = tuple(HOOKS)
+    event = _start(hooks, func, args, kwargs)
+
+    token = PATH.set(event.path)
+    wall_start = time.perf_counter()
+    try:
+        result = await func(*args, **kwargs)
+    except Exception as error:
+        _fail(hooks, event, error, wall_start, None)
+        raise
+    finally:
+        PATH.reset(token)
+
+    _end(hooks, event, result, wall_start, None)
+    return result
+
+
+def _start(hooks: Tuple[StepHook, ...], func: Callable, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> StepEvent:
+    """I notify the hooks that the step starts.
+
+    Args:
+        hooks (Tuple[StepHook, ...]): The registered hooks
+        func (Callable): The step
+        args (Tuple[Any, ...]): The positional arguments given to the step
+        kwargs (Dict[str, Any]): The keyword arguments given to the step
+
+    Returns:
+        StepEvent: The event of the step, it is completed when the step finished.
+    """
+    event = StepEvent(_identity(func), PATH.get() + (getattr(func, "__name__", repr(func)),))
+    if any(hook.measure_sizes for hook in hooks):
+        event.input_size = sum(sys.getsizeof(arg) for arg in args) + sum(sys.getsizeof(arg) for arg in kwargs.values())
+
+    for hook in hooks:
+        hook.on_step_start(event)
+    return event
+
+
+def _end(
+    hooks: Tuple[StepHook, ...], event: StepEvent, result: Any, wall_start: float, cpu_start: Optional[float]
+) -> None:
+    _measure_times(event, wall_start, cpu_start)
+    if any(hook.measure_sizes for hook in hooks):
+        event.output_size = sys.getsizeof(result)
+
+    for hook in hooks:
+        hook.on_step_end(event)
+
+
+def _fail(
+    hooks: Tuple[StepHook, ...], event: StepEvent, error: Exception, wall_start: float, cpu_start: Optional[float]
+) -> None:
+    _measure_times(event, wall_start, cpu_start)
+    for hook in hooks:
+        hook.on_step_error(event, error)
+
+
+def _measure_times(event: StepEvent, wall_start: float, cpu_start: Optional[float]) -> None:
+    event.wall_time = time.perf_counter() - wall_start
+    if cpu_start is not None:
+        event.cpu_time = time.thread_time() - cpu_start
+
+
+def _identity(func: Callable) -> str:
+    """I describe the step for the hooks.
+
+    Args:
+        func (Callable): The step
+
+    Returns:
+        str: The name and location of the step. Callables without code are represented by `repr`.
+    """
+    try:
+        return func_details(func)
+    except AttributeError:
+        return repr(func)
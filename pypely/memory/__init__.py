@@ -28,15 +28,39 @@ pipeline(
 The function that consumes the memory entry also consumes the output from the previous step.
 So from the previous example `func4` would receive the output of `func3` **and** the memory entry `result`.
 
-The types of the memory entries are stored and it is checked if a function is capable to consume
+Entries that are only needed sometimes can be written lazily: `func1 >> lazy("result")`.
+`func1` then runs with its input only once the entry is ingested. Its input is forwarded to `func2` unchanged.
+
+The types of the memory entries are recorded and it is checked if a function is capable to consume
 a memory entry based on the type information. 
 
+Large entries can be kept on disk instead of in RAM with `pypely.memory.SpillToDisk`.
+The backend is either set for all entries of a pipeline or for a single entry:
+
+```python
+pipeline(
+    load_data >> MemoryEntry(backend=SpillToDisk(threshold=2**30)),
+    ...
+)
+
+pipeline(..., memory_backend=SpillToDisk(threshold=2**30))
+```
+
+`pypely.memory.SharedMemoryBackend` places arrays and arrow tables in shared memory segments.
+Other processes read them as read-only views instead of receiving pickled copies.
+
+The memory used by a single invocation can be measured with `with_memory_report`.
+The returned `pypely.memory.MemoryReport` lists the size of each memory entry and step output:
+
+```python
+output, report = my_pipeline.with_memory_report(data)
+report.peak_live_bytes
+```
+
 ??? warning "Memory entry names must be unique"
 
-    The names of memory entries must be unique throughout the code base when using strings.
-    This limitation is given as there is no way to identify the context in which the memory is used during buildtime.
-    The type information is stored during the buildtime. The simplest way to work around this limitation is to use
-    `pypely.memory.MemoryEntry` as shown in the second example.
+    The names of memory entries must be unique within a pipeline. The branches of a `fork` belong to the pipeline
+    of the `fork`. Different pipelines can use the same names. The types are checked when the pipeline is built.
 
 ??? warning "The memory is context sensitive"
 
@@ -60,8 +84,19 @@ a memory entry based on the type information.
 """
 
 from pypely.memory import errors
+from pypely.memory._accounting import MemoryReport
+from pypely.memory._backends import MemoryBackend, SharedMemoryBackend, SpillToDisk
 
 # from pypely.memory._impl import PipelineMemory
-from pypely.memory._wrappers import MemoryEntry, memorizable
+from pypely.memory._wrappers import MemoryEntry, lazy, memorizable
 
-__all__ = ["memorizable", "MemoryEntry", "errors"]
+__all__ = [
+    "memorizable",
+    "lazy",
+    "MemoryEntry",
+    "MemoryBackend",
+    "MemoryReport",
+    "SharedMemoryBackend",
+    "SpillToDisk",
+    "errors",
+]
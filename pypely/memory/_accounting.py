@@ -0,0 +1,105 @@
+"""I account for the memory used by a single invocation of a pipeline.
+
+The size of each stored memory entry and of the output of each step is measured deeply:
+`numpy` arrays report their `nbytes`, `pandas` objects their `memory_usage(deep=True)`.
+All other values are measured with `sys.getsizeof` including the objects they contain.
+Objects that are referenced multiple times are counted once per measured value.
+
+Measuring is expensive. So it is only done if requested: `report = my_pipeline.with_memory_report(...)`.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple, TypeVar
+
+from pypely.hooks._impl import _identity, call_step
+from pypely.memory._backends import Handle, deep_size_of
+
+T = TypeVar("T")
+
+
+@dataclass
+class MemoryReport:
+    """I describe the memory used by a single invocation of a pipeline.
+
+    Steps of sub-pipelines and branches of a `fork` are not listed on their own. Their output is part of the step they run in.
+    Entries that a backend keeps outside of the memory, e.g. on disk, are counted with 0 bytes.
+
+    Attributes:
+        entries (Dict[str, int]): The size of each stored memory entry in bytes, by its name.
+        steps (List[Tuple[str, int]]): The name and location of each step and the size of its output in bytes,
+            in the order the steps ran.
+        peak_entry_bytes (int): The most bytes held by memory entries at the same time.
+        peak_live_bytes (int): The most bytes held by memory entries and the output of the latest step at the same time.
+    """
+
+    entries: Dict[str, int] = field(default_factory=dict)
+    steps: List[Tuple[str, int]] = field(default_factory=list)
+    peak_entry_bytes: int = 0
+    peak_live_bytes: int = 0
+
+
+class MemoryAccount:
+    """I keep track of the bytes held by a memory and the outputs of the steps while a pipeline runs."""
+
+    def __init__(self) -> None:
+        self._report = MemoryReport()
+        self._lock = threading.Lock()
+        self._entry_bytes = 0
+        self._live_entries: Dict[int, Tuple[int, int]] = dict()  # slot -> (id of the value, bytes)
+
+    def add(self, name: str, slot: int, value: Any) -> None:
+        """I account for a value that has been stored in the memory.
+
+        Args:
+            name (str): The name of the memory entry
+            slot (int): The slot of the memory entry
+            value (Any): The stored value
+        """
+        size = 0 if isinstance(value, Handle) else deep_size_of(value)
+        with self._lock:
+            self._report.entries[name] = size
+            self._live_entries[slot] = (id(value), size)
+            self._entry_bytes += size
+            self._report.peak_entry_bytes = max(self._report.peak_entry_bytes, self._entry_bytes)
+            self._report.peak_live_bytes = max(self._report.peak_live_bytes, self._entry_bytes)
+
+    def release(self, slot: int) -> None:
+        """I account for a memory entry that has been released.
+
+        Args:
+            slot (int): The slot of the memory entry
+        """
+        with self._lock:
+            _, size = self._live_entries.pop(slot, (0, 0))
+            self._entry_bytes -= size
+
+    def call_step(self, func: Callable[..., T], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> T:
+        """I call the step and account for its output.
+
+        An output that is stored in the memory as well is only counted once.
+
+        Args:
+            func (Callable[..., T]): The step
+            args (Tuple[Any, ...]): The positional arguments given to the step
+            kwargs (Dict[str, Any]): The keyword arguments given to the step
+
+        Returns:
+            T: The output of the step.
+        """
+        result = call_step(func, args, kwargs)
+        size = deep_size_of(result)
+        with self._lock:
+            self._report.steps.append((_identity(func), size))
+            stored = any(value_id == id(result) for value_id, _ in self._live_entries.values())
+            live_bytes = self._entry_bytes if stored else self._entry_bytes + size
+            self._report.peak_live_bytes = max(self._report.peak_live_bytes, live_bytes)
+        return result
+
+    def report(self) -> MemoryReport:
+        """I provide the report of the invocation.
+
+        Returns:
+            MemoryReport: The sizes of all entries and step outputs and the peaks.
+        """
+        return self._report
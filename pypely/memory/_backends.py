@@ -0,0 +1,500 @@
+"""I decide where the values of memory entries are kept.
+
+By default the values are kept in the memory itself. A backend can keep them somewhere else.
+`SpillToDisk` writes large values to a scratch directory and maps them back when they are ingested.
+`SharedMemoryBackend` places arrays and tables in shared memory, so other processes can read them without copies.
+
+A backend can be chosen for a whole pipeline: `pipeline(..., memory_backend=SpillToDisk(...))`
+or for a single entry: `MemoryEntry(backend=SpillToDisk(...))`.
+"""
+
+import mmap
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+
+class Handle(ABC):
+    """I stand in for a value that is kept outside of the memory. The memory loads the value when it is read.
+
+    Handles that can be loaded by other processes, e.g. worker processes running the branches of a `fork`,
+    set `portable` to `True`. They are sent as they are instead of the value they stand in for.
+    """
+
+    portable: bool = False
+
+    @abstractmethod
+    def load(self) -> Any:
+        """I provide the value.
+
+        Returns:
+            Any: the stored value.
+        """
+
+    def remove(self) -> None:
+        """I free the resources holding the value."""
+
+
+class Spilled(Handle):
+    """I stand in for a value that has been written to a file."""
+
+    portable = True
+    path: Path
+
+    def __init__(self, path: Path, load: Callable[[Path], Any]) -> None:
+        self.path = path
+        self._load = load
+
+    def load(self) -> Any:
+        """I read the value from the file.
+
+        Returns:
+            Any: the stored value.
+        """
+        return self._load(self.path)
+
+    def remove(self) -> None:
+        """I delete the file."""
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+class MemoryBackend:
+    """I keep the values of memory entries. I am the base of all backends and keep the values as they are."""
+
+    def store(self, value: Any) -> Any:
+        """I prepare a value for being kept in the memory.
+
+        Args:
+            value (Any): The output of a step
+
+        Returns:
+            Any: The value itself or a `Spilled` object that stands in for it.
+        """
+        return value
+
+
+class SpillToDisk(MemoryBackend):
+    """I write values larger than `threshold` bytes to files in `directory`.
+
+    Arrays of `numpy` are stored as `.npy` and mapped back read-only with `numpy.load(mmap_mode="r")`.
+    `pandas.DataFrame`s are stored as parquet if `pyarrow` is installed. Frames that arrow can't convert,
+    e.g. with columns of mixed types, are pickled like all other values.
+    The size of containers includes the values they contain, so a list of large frames is written to disk as well.
+    The files are removed when the entry is released or the pipeline returns.
+
+    Attributes:
+        threshold (int): The size in bytes above which values are written to disk.
+        directory (Path): The scratch directory. Defaults to a `pypely` directory in the temporary directory of the system.
+    """
+
+    threshold: int
+    directory: Path
+
+    def __init__(self, threshold: int, directory: Optional[Union[str, Path]] = None) -> None:
+        self.threshold = threshold
+        self.directory = Path(directory) if directory is not None else Path(tempfile.gettempdir()) / "pypely"
+
+    def store(self, value: Any) -> Any:
+        """I write the value to disk if it is larger than the threshold.
+
+        Args:
+            value (Any): The output of a step
+
+        Returns:
+            Any: The value itself if it is small. Otherwise a `Spilled` object that stands in for it.
+        """
+        if deep_size_of(value) <= self.threshold:
+            return value
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if _is_instance_of(value, "numpy", "ndarray") and not value.dtype.hasobject:
+            return _spill(self.directory, ".npy", value, _save_array, _load_array)
+        if _is_instance_of(value, "pandas", "DataFrame") and _has_module("pyarrow"):
+            try:
+                return _spill(self.directory, ".parquet", value, _save_frame, _load_frame)
+            except Exception:  # e.g. `ArrowInvalid` for columns of mixed types
+                pass
+        return _spill(self.directory, ".pkl", value, _save_pickle, _load_pickle)
+
+
+class Shared(Handle):
+    """I stand in for a value that has been placed in a shared memory segment.
+
+    I can be pickled and sent to other processes. There I map the segment by its name.
+    A process maps a segment once and reuses the mapping for all reads as long as views of the segment exist.
+    The mapping is closed once the last view is dropped, the creating process removes the segment.
+
+    Attributes:
+        name (str): The name of the segment
+        kind (str): How the value is encoded. `ndarray` or `arrow`.
+        meta (Tuple[Any, ...]): The shape and dtype of arrays, or whether an arrow table is a `DataFrame`.
+    """
+
+    portable = True
+    name: str
+    kind: str
+    meta: Tuple[Any, ...]
+
+    def __init__(self, name: str, kind: str, meta: Tuple[Any, ...]) -> None:
+        self.name = name
+        self.kind = kind
+        self.meta = meta
+
+    def load(self) -> Any:
+        """I provide a read-only view of the value.
+
+        Arrays are views of the segment. Arrow tables are read without copies.
+        `DataFrame`s are converted from the arrow table, which copies columns that arrow can't share with `pandas`.
+
+        Returns:
+            Any: the stored value.
+        """
+        buffer = _buffer_of(self.name)
+        if self.kind == "ndarray":
+            import numpy
+
+            shape, dtype = self.meta
+            view = numpy.ndarray(shape, dtype=dtype, buffer=buffer)
+            view.flags.writeable = False
+            return view
+
+        import pyarrow
+
+        (is_frame,) = self.meta
+        table = pyarrow.ipc.open_stream(pyarrow.py_buffer(buffer)).read_all()
+        return table.to_pandas() if is_frame else table
+
+    def remove(self) -> None:
+        """I remove the segment.
+
+        Processes that mapped the segment can keep using it until they drop their views.
+        """
+        _release(self.name)
+
+
+class SharedMemoryBackend(MemoryBackend):
+    """I place `numpy` arrays and arrow tables larger than `threshold` bytes in shared memory segments.
+
+    Readers receive read-only views. Worker processes map the segments by name instead of unpickling the values.
+    `pandas.DataFrame`s are stored as arrow tables if `pyarrow` is installed. Frames that arrow can't convert,
+    e.g. with columns of mixed types, are kept as they are like all other values.
+    The segments are removed when the entry is released or the pipeline returns.
+
+    Attributes:
+        threshold (int): The size in bytes above which values are placed in shared memory. Defaults to 0.
+    """
+
+    threshold: int
+
+    def __init__(self, threshold: int = 0) -> None:
+        self.threshold = threshold
+
+    def store(self, value: Any) -> Any:
+        """I place the value in shared memory if it is an array or a table larger than the threshold.
+
+        Args:
+            value (Any): The output of a step
+
+        Returns:
+            Any: The value itself or a `Shared` object that stands in for it.
+        """
+        if _is_instance_of(value, "numpy", "ndarray") and not value.dtype.hasobject:
+            if value.nbytes > self.threshold:
+                return _share_array(value)
+        elif _is_instance_of(value, "pyarrow", "Table"):
+            if value.nbytes > self.threshold:
+                return _share_table(value, is_frame=False)
+        elif _is_instance_of(value, "pandas", "DataFrame") and _has_module("pyarrow"):
+            if deep_size_of(value) > self.threshold:
+                import pyarrow
+
+                try:
+                    table = pyarrow.Table.from_pandas(value)
+                except pyarrow.ArrowException:
+                    return value
+                return _share_table(table, is_frame=True)
+        return value
+
+
+_SEGMENTS: Dict[str, shared_memory.SharedMemory] = dict()  # created by this process
+_MAPPINGS: "weakref.WeakValueDictionary[str, mmap.mmap]" = weakref.WeakValueDictionary()  # of other processes
+_UNCLOSED: List[shared_memory.SharedMemory] = []
+_SEGMENTS_LOCK = threading.Lock()
+
+
+def _share_array(value: Any) -> Shared:
+    """I copy an array into a new shared memory segment.
+
+    Args:
+        value (Any): A `numpy` array without objects
+
+    Returns:
+        Shared: The object that stands in for the array.
+    """
+    import numpy
+
+    segment = _create(value.nbytes)
+    numpy.ndarray(value.shape, dtype=value.dtype, buffer=segment.buf)[...] = value
+    return Shared(segment.name, "ndarray", (value.shape, value.dtype.str))
+
+
+def _share_table(table: Any, is_frame: bool) -> Shared:
+    """I write an arrow table in the arrow IPC format into a new shared memory segment.
+
+    Args:
+        table (Any): A `pyarrow.Table`
+        is_frame (bool): Whether the table is read as a `DataFrame`
+
+    Returns:
+        Shared: The object that stands in for the table.
+    """
+    import pyarrow
+
+    size = pyarrow.MockOutputStream()
+    with pyarrow.ipc.new_stream(size, table.schema) as writer:
+        writer.write_table(table)
+
+    segment = _create(size.size())
+    with pyarrow.ipc.new_stream(pyarrow.FixedSizeBufferWriter(pyarrow.py_buffer(segment.buf)), table.schema) as writer:
+        writer.write_table(table)
+    return Shared(segment.name, "arrow", (is_frame,))
+
+
+def _create(size: int) -> shared_memory.SharedMemory:
+    """I create a segment that is owned by this process.
+
+    Args:
+        size (int): The size of the segment in bytes
+
+    Returns:
+        shared_memory.SharedMemory: The segment
+    """
+    segment = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    with _SEGMENTS_LOCK:
+        _SEGMENTS[segment.name] = segment
+    return segment
+
+
+def _buffer_of(name: str) -> Union[memoryview, mmap.mmap]:
+    """I provide the buffer of the segment with the given name.
+
+    Segments created by this process are read from their own buffer. Segments of other processes are mapped.
+    The views of a segment reference its mapping, so the mapping is closed once the last view is dropped.
+    Worker processes that are reused for many calls don't keep removed segments mapped this way.
+
+    Args:
+        name (str): The name of the segment
+
+    Returns:
+        Union[memoryview, mmap.mmap]: The buffer of the segment
+    """
+    with _SEGMENTS_LOCK:
+        segment = _SEGMENTS.get(name)
+        if segment is not None:
+            return segment.buf  # type: ignore[return-value]  # only closed segments have no buffer
+
+        mapping = _MAPPINGS.get(name)
+        if mapping is None:
+            mapping = _MAPPINGS[name] = _map(name)
+        return mapping
+
+
+def _map(name: str) -> mmap.mmap:
+    """I map a segment of another process. Only the mapping is kept, the file descriptor of the segment is closed.
+
+    Args:
+        name (str): The name of the segment
+
+    Returns:
+        mmap.mmap: The mapping, which is closed when it is garbage collected.
+    """
+    segment = _open(name)
+    mapping = segment._mmap  # type: ignore[attr-defined]
+    segment._buf.release()  # type: ignore[attr-defined]
+    segment._buf = segment._mmap = None  # type: ignore[attr-defined]
+    segment.close()
+    return mapping
+
+
+def _open(name: str) -> shared_memory.SharedMemory:
+    """I attach to a segment of another process without taking over its ownership.
+
+    Before python 3.13 the resource tracker would remove the segment when this process exits.
+
+    Args:
+        name (str): The name of the segment
+
+    Returns:
+        shared_memory.SharedMemory: The segment
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    except TypeError:
+        segment = shared_memory.SharedMemory(name=name)
+        if os.name == "posix":
+            from multiprocessing import resource_tracker
+
+            resource_tracker.unregister(segment._name, "shared_memory")  # type: ignore[attr-defined]
+        return segment
+
+
+def _release(name: str) -> None:
+    """I remove a segment and detach from it.
+
+    The memory of the segment is freed once all processes detached from it.
+    A segment can only be closed once no views of it exist anymore. Otherwise closing is retried on the next release.
+
+    Args:
+        name (str): The name of the segment
+    """
+    with _SEGMENTS_LOCK:
+        segment = _SEGMENTS.pop(name, None)
+        if segment is not None:
+            try:
+                segment.unlink()
+            except FileNotFoundError:
+                pass
+            _UNCLOSED.append(segment)
+
+        for unclosed in list(_UNCLOSED):
+            try:
+                unclosed.close()
+                _UNCLOSED.remove(unclosed)
+            except BufferError:
+                pass
+
+
+def deep_size_of(value: Any) -> int:
+    """I measure the size of a value in bytes including the objects it contains.
+
+    Objects that are referenced multiple times are counted once.
+
+    Args:
+        value (Any): Any value
+
+    Returns:
+        int: The size of the data of arrays and `pandas` objects, otherwise the recursive size reported by `sys.getsizeof`.
+    """
+    seen = set()
+    size = 0
+    stack = [value]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+
+        if _is_instance_of(obj, "numpy", "ndarray"):
+            size += int(obj.nbytes)
+            continue
+        if _is_instance_of(obj, "pandas", "DataFrame") or _is_instance_of(obj, "pandas", "Series"):
+            usage = obj.memory_usage(deep=True)
+            size += int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+            continue
+
+        size += sys.getsizeof(obj)
+        if isinstance(obj, (str, bytes, bytearray, int, float, complex, bool, type)) or obj is None:
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, "__dict__") and not callable(obj):
+            stack.append(vars(obj))
+    return size
+
+
+def _spill(
+    directory: Path, suffix: str, value: Any, save: Callable[[Path, Any], None], load: Callable[[Path], Any]
+) -> Spilled:
+    """I write `value` to a new file in `directory`.
+
+    Args:
+        directory (Path): The scratch directory
+        suffix (str): The suffix of the file
+        value (Any): The value
+        save (Callable[[Path, Any], None]): Writes the value to the given path
+        load (Callable[[Path], Any]): Reads the value from the given path
+
+    Returns:
+        Spilled: The object that stands in for the value.
+
+    Raises:
+        BaseException: the error raised by `save` is raised again after the file has been removed.
+    """
+    file_descriptor, path = tempfile.mkstemp(dir=directory, suffix=suffix)
+    os.close(file_descriptor)
+    spilled = Spilled(Path(path), load)
+    try:
+        save(spilled.path, value)
+    except BaseException:
+        spilled.remove()
+        raise
+    return spilled
+
+
+def _is_instance_of(value: Any, module: str, name: str) -> bool:
+    """I check the type of `value` without importing optional dependencies.
+
+    Args:
+        value (Any): Any value
+        module (str): The root module of the type, e.g. `numpy`
+        name (str): The name of the type, e.g. `ndarray`
+
+    Returns:
+        bool: `True` if `value` is an instance of the type.
+    """
+    if module not in sys.modules:
+        return False
+    return any(cls.__module__.split(".")[0] == module and cls.__name__ == name for cls in type(value).__mro__)
+
+
+def _has_module(name: str) -> bool:
+    try:
+        __import__(name)
+        return True
+    except ImportError:
+        return False
+
+
+def _save_array(path: Path, value: Any) -> None:
+    import numpy
+
+    numpy.save(path, value, allow_pickle=False)
+
+
+def _load_array(path: Path) -> Any:
+    import numpy
+
+    return numpy.load(path, mmap_mode="r")
+
+
+def _save_frame(path: Path, value: Any) -> None:
+    value.to_parquet(path)
+
+
+def _load_frame(path: Path) -> Any:
+    import pandas
+
+    return pandas.read_parquet(path, memory_map=True)
+
+
+def _save_pickle(path: Path, value: Any) -> None:
+    with open(path, "wb") as file:
+        pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _load_pickle(path: Path) -> Any:
+    with open(path, "rb") as file:
+        return pickle.load(file)
@@ -1,27 +1,54 @@
 """I take care of providing the right memory for each context.
 
 Sub-pipelines don't have access to parent pipelines and vic-versa.
+The memory is stored in a context variable. So threads and asyncio tasks that call pipelines at the same time
+each work with their own memory.
 """
 
-from pypely.memory._impl import PipelineMemory, get_memory, set_memory
+from contextvars import Token
+from typing import Optional
+
+from pypely.memory._backends import MemoryBackend
+from pypely.memory._impl import MEMORY, PipelineMemory
 
 
 class PipelineMemoryContext:
-    """I switch between memories depending on the context."""
+    """I switch between memories depending on the context.
+
+    I can be given a memory that is reused every time I am entered. This saves the allocation
+    of a new memory when I am entered many times, e.g. once per record of a stream.
+    Otherwise a new memory with the given backend is created each time.
+    """
 
-    previous_memory: PipelineMemory
+    memory: Optional[PipelineMemory]
+    backend: Optional[MemoryBackend]
+    token: Optional[Token]
+
+    def __init__(self, memory: Optional[PipelineMemory] = None, backend: Optional[MemoryBackend] = None) -> None:
+        self.memory = memory
+        self.backend = backend
+        self.token = None
 
     def __enter__(self) -> None:
-        """I provide a freshly initialized memory.
+        """I provide an empty memory.
 
-        The current memory is stored for later usage.
+        A given memory is cleared and reused. Otherwise a freshly initialized memory is used.
+        Only the memory of the current context is replaced.
         """
-        self.previous_memory = get_memory()
-        set_memory(PipelineMemory())
+        if self.memory is None:
+            self.token = MEMORY.set(PipelineMemory(self.backend))
+        else:
+            self.memory.clear()
+            self.token = MEMORY.set(self.memory)
 
     def __exit__(self, type, value, traceback) -> None:
-        """I reset the memory to the previous one.
+        """I reset the memory of the current context to the previous one.
+
+        Files written by a backend are removed.
 
         # noqa: DAR101
         """
-        set_memory(self.previous_memory)
+        if self.token is not None:
+            MEMORY.get().close()  # type: ignore
+            MEMORY.reset(self.token)
+            self.token = None
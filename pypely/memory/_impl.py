@@ -1,21 +1,141 @@
 """I implement the `PipelineMemory`.
 
 This class is used to store outputs of steps. 
-It also stores the types at buildtime.
+
+Each memory entry name is resolved to an integer slot when the pipeline is built.
+At runtime the values are stored by their slots. This avoids looking up the names.
+A slot is reserved as long as a step that uses the entry exists. Afterwards it is reused for other names.
+So building pipelines dynamically, e.g. with new `MemoryEntry`s for each build, does not grow the registry.
 """
 
-from typing import Any, Optional, Type
+import threading
+import weakref
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from pypely.memory._backends import Handle, MemoryBackend
+from pypely.memory.errors import MemoryAttributeExistsError, MemoryAttributeNotFoundError
+
+if TYPE_CHECKING:
+    from pypely.memory._accounting import MemoryAccount
+
+_SLOT_LOCK = threading.RLock()  # a slot may be freed by the garbage collector while a slot is assigned
+
+SLOTS: "weakref.WeakValueDictionary[str, Slot]" = weakref.WeakValueDictionary()
+NAMES: List[Optional[str]] = []
+_FREE_SLOTS: List[int] = []
+
+
+class _Empty:
+    """I mark a slot that holds no value."""
+
+
+EMPTY = _Empty()
+RELEASED = _Empty()
+
+
+class Slot:
+    """I reserve the slot `index` for the memory entry `name` as long as I am referenced."""
+
+    __slots__ = ("name", "index", "__weakref__")
+
+    name: str
+    index: int
+
+    def __init__(self, name: str, index: int) -> None:
+        self.name = name
+        self.index = index
+
+    def __copy__(self) -> "Slot":
+        """I am shared by all copies of a step.
+
+        # noqa: DAR201
+        """
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "Slot":
+        """I am shared by all copies of a step.
+
+        # noqa: DAR101
+        # noqa: DAR201
+        """
+        return self
+
+    def __reduce__(self) -> Tuple[Callable[[str], "Slot"], Tuple[str]]:
+        """I am resolved again by name when I am unpickled in another process.
+
+        # noqa: DAR201
+        """
+        return slot_of, (self.name,)
+
+
+def slot_of(name: str) -> Slot:
+    """I provide the slot of a memory entry. A free slot is assigned if the name is not in use.
+
+    Args:
+        name (str): The name of the memory entry.
+
+    Returns:
+        Slot: The reservation of the slot. Keep it as long as the slot is used.
+    """
+    slot = SLOTS.get(name)
+    if slot is not None:
+        return slot
+
+    with _SLOT_LOCK:
+        slot = SLOTS.get(name)
+        if slot is not None:
+            return slot
+
+        if _FREE_SLOTS:
+            index = _FREE_SLOTS.pop()
+            NAMES[index] = name
+        else:
+            index = len(NAMES)
+            NAMES.append(name)
+
+        slot = Slot(name, index)
+        SLOTS[name] = slot
+        weakref.finalize(slot, _free_slot, index)
+        return slot
+
+
+def _free_slot(index: int) -> None:
+    """I make the slot available for other names.
 
-from pypely.memory.errors import InvalidMemoryAttributeError, MemoryAttributeExistsError, MemoryAttributeNotFoundError
+    Args:
+        index (int): The index of the slot
+    """
+    with _SLOT_LOCK:
+        NAMES[index] = None
+        _FREE_SLOTS.append(index)
 
 
 class PipelineMemory:
-    """I store the memorized values."""
+    """I store the memorized values.
+
+    The values are stored in a frame by their slots. The frame only holds the entries written by the invocation
+    I belong to, so its size doesn't depend on the memory entries of other pipelines.
 
-    types: dict[str, type]
+    The branches of a `fork` may run in threads and share the memory of their pipeline.
+    So adding a value is atomic: only one of two branches writing the same entry succeeds.
+    Each memory has its own lock, so invocations of different pipelines don't wait for each other.
+
+    A `MemoryBackend` can keep the values somewhere else, e.g. on disk. Such values are loaded when they are read.
+    A `MemoryAccount` can be given to measure the size of the stored values.
+    """
 
-    def __init__(self) -> None:
-        self.types = dict()
+    values: Dict[int, Any]
+    backend: Optional[MemoryBackend]
+    account: Optional["MemoryAccount"]
+
+    def __init__(self, backend: Optional[MemoryBackend] = None, account: Optional["MemoryAccount"] = None) -> None:
+        self.values = dict()
+        self.backend = backend
+        self.account = account
+        self.holds_handles = False
+        self._lock = threading.Lock()
+        self._named_slots: Dict[str, Slot] = dict()
 
     def add(self, name: str, value: Any) -> None:
         """I add a value to the memory.
@@ -23,13 +143,37 @@ class PipelineMemory:
         Args:
             name (str): The name of the memory entry.
             value (Any): The stored value
+        """
+        slot = self._named_slots.get(name) or slot_of(name)
+        self._named_slots[name] = slot
+        self.add_slot(slot.index, value)
+
+    def add_slot(self, slot: int, value: Any, backend: Optional[MemoryBackend] = None) -> None:
+        """I add a value to the given slot.
+
+        Args:
+            slot (int): The index of the slot of the memory entry. See `slot_of`.
+            value (Any): The stored value
+            backend (Optional[MemoryBackend], optional): The backend of the entry. Defaults to my backend.
 
         Raises:
             MemoryAttributeExistsError: if an entry with the given name already exists.
         """
-        if name in self.__dict__.keys():
-            raise MemoryAttributeExistsError(f"The attribute {name} already exists")
-        self.__setattr__(name, value)
+        backend = backend or self.backend
+        if backend is not None:
+            value = backend.store(value)
+
+        with self._lock:
+            if slot in self.values:  # released entries can't be written again either
+                if isinstance(value, Handle):
+                    value.remove()
+                raise MemoryAttributeExistsError(f"The attribute {NAMES[slot]} already exists")
+            self.values[slot] = value
+            if isinstance(value, Handle):
+                self.holds_handles = True
+
+        if self.account is not None:
+            self.account.add(str(NAMES[slot]), slot, value)
 
     def get(self, name: str) -> Any:
         """I retrieve the entry with the given `name`.
@@ -43,77 +187,116 @@ class PipelineMemory:
         Raises:
             MemoryAttributeNotFoundError: if there is no memory entry with the given name.
         """
-        try:
-            return self.__getattribute__(name)
-        except AttributeError:
+        slot = SLOTS.get(name)
+        if slot is None:
             raise MemoryAttributeNotFoundError(
                 f"""Tried to access attribute {name} but attribute was not found. 
-                Available Attributes: {list(self.__dict__.keys())}"""
+                Available Attributes: {self.names()}"""
             )
+        return self.get_slot(slot.index)
 
-    def add_type(self, name: str, _type: Type) -> None:
-        """I add a type to the type memory.
+    def get_slot(self, slot: int) -> Any:
+        """I retrieve the entry stored in the given slot.
 
         Args:
-            name (str): The name of the memory entry.
-            _type (Type): The type of the memory entry.
+            slot (int): The index of the slot of the memory entry. See `slot_of`.
+
+        Returns:
+            Any: the value stored in the slot.
 
         Raises:
-            MemoryAttributeExistsError: if there is already an entry with `name`
-            InvalidMemoryAttributeError: if the type is not supported by the memory. E.g. `None`.
+            MemoryAttributeNotFoundError: if there is no memory entry with the given name.
         """
-        if name in self.types.keys():
-            raise MemoryAttributeExistsError(f"The attribute {name} already exists")
-
-        if _type == type(None) or _type == None:
-            raise InvalidMemoryAttributeError(
-                f"It is not allowed to store `None` in memory. Given memory attribute name: {name}"
+        value = self.values.get(slot, EMPTY)
+        if value is EMPTY or value is RELEASED:
+            raise MemoryAttributeNotFoundError(
+                f"""Tried to access attribute {NAMES[slot]} but attribute was not found. 
+                Available Attributes: {self.names()}"""
             )
-        self.types[name] = _type
+        if isinstance(value, Handle):
+            return value.load()
+        return value
 
-    def get_type(self, name: str) -> type:
-        """I provide the type of the memory entry belonging to `name`.
+    def portable(self, slots: Sequence[int]) -> Dict[int, Any]:
+        """I provide the entries in the given slots, so that they can be sent to another process.
 
-        This is used during buildtime. The stored types are used to check if a memory entry can be ingested into a function.
+        Handles that other processes can load, e.g. of shared memory segments, are provided as they are.
+        All other entries are loaded.
 
         Args:
-            name (str): The name of the memory entry.
+            slots (Sequence[int]): The slots of the entries
 
-        Raises:
-            MemoryAttributeNotFoundError: if there is no memory entry with the given name.
+        Returns:
+            Dict[int, Any]: The entries by their slots.
+        """
+        entries = dict()
+        for slot in slots:
+            value = self.values.get(slot)
+            entries[slot] = value if isinstance(value, Handle) and value.portable else self.get_slot(slot)
+        return entries
+
+    def names(self) -> List[str]:
+        """I list the names of the stored entries.
 
         Returns:
-            type: the type of the memory entry.
+            List[str]: The names of all entries that hold a value.
         """
-        try:
-            return self.types[name]
-        except KeyError:
-            raise MemoryAttributeNotFoundError(
-                f"""Tried to access type information of attribute {name}. Attribute was not found. 
-                Available attribute types: {list(self.types.keys())}"""
-            )
+        return [str(NAMES[slot]) for slot, value in self.values.items() if value is not RELEASED]
 
+    def release(self, slots: Tuple[int, ...]) -> None:
+        """I drop the values of entries that are not used anymore, so they can be freed.
 
-MEMORY: Optional[PipelineMemory] = None
+        Args:
+            slots (Tuple[int, ...]): The slots of the entries
+        """
+        values = self.values
+        for slot in slots:
+            value = values.get(slot)
+            if isinstance(value, Handle):
+                value.remove()
+            values[slot] = RELEASED
+            if self.account is not None:
+                self.account.release(slot)
+
+    def clear(self) -> None:
+        """I remove all stored values."""
+        self.close()
+        self.values = dict()
+
+    def close(self) -> None:
+        """I remove the files and shared memory segments of all values that a backend kept outside of me."""
+        if not self.holds_handles:
+            return
+
+        for value in self.values.values():
+            if isinstance(value, Handle):
+                value.remove()
+        self.holds_handles = False
+
+
+ROOT_MEMORY = PipelineMemory()
+MEMORY: ContextVar[Optional[PipelineMemory]] = ContextVar("MEMORY", default=None)
 
 
 def get_memory() -> PipelineMemory:
-    """I store the globally available memory.
+    """I provide the memory of the current context.
+
+    The memory is stored in a context variable. This way threads that run the branches of a `fork`
+    see the memory of the pipeline they belong to. Outside of a pipeline the process-wide root memory is used.
 
     Returns:
-        PipelineMemory: the global state of the memory.
+        PipelineMemory: the memory of the current context.
     """
-    global MEMORY
-    if MEMORY is None:
-        MEMORY = PipelineMemory()
-    return MEMORY
+    memory = MEMORY.get()
+    if memory is None:
+        return ROOT_MEMORY
+    return memory
 
 
 def set_memory(memory: PipelineMemory) -> None:
-    """I set the given `memory` as the globally available memory.
+    """I set the given `memory` as the memory of the current context.
 
     Args:
-        memory (PipelineMemory): the memory that should be set as the global memory.
+        memory (PipelineMemory): the memory that should be used in the current context.
     """
-    global MEMORY
-    MEMORY = memory
+    MEMORY.set(memory)
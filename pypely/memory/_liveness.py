@@ -0,0 +1,55 @@
+"""I determine how long memory entries need to be kept.
+
+An entry is used by the step that writes it and by all steps that ingest it.
+After the last of these steps has run, the entry is not needed anymore.
+This is determined at buildtime for each pipeline. At runtime the entries are released right after their last usage,
+so large intermediate results don't stay in memory until the pipeline returns.
+"""
+
+from typing import Callable, Dict, List, Sequence, Set, Tuple
+
+from pypely.memory._wrappers import Memorizable
+
+
+def used_slots(func: Callable) -> Set[int]:
+    """I collect the slots of all memory entries a step writes or ingests.
+
+    The inner steps of a `Memorizable`, e.g. the branches of a `fork`, are included.
+    Sub-pipelines are not included, as they use their own memory.
+
+    Args:
+        func (Callable): A step of a pipeline
+
+    Returns:
+        Set[int]: The slots used by the step.
+    """
+    if not isinstance(func, Memorizable):
+        return set()
+
+    slots = set(func.slots_before) | set(func.slots_after)
+    if func.written_slot is not None:
+        slots.add(func.written_slot)
+    for inner_step in func.inner_steps:
+        slots |= used_slots(inner_step)
+    return slots
+
+
+def last_usages(funcs: Sequence[Callable]) -> Dict[int, Tuple[int, ...]]:
+    """I determine after which step each memory entry can be released.
+
+    Args:
+        funcs (Sequence[Callable]): The steps of a pipeline
+
+    Returns:
+        Dict[int, Tuple[int, ...]]: The slots to release, by the index of the step after which they are released.
+            Steps after which nothing is released are left out.
+    """
+    last_usage: Dict[int, int] = dict()
+    for index, func in enumerate(funcs):
+        for slot in used_slots(func):
+            last_usage[slot] = index
+
+    releases: Dict[int, List[int]] = dict()
+    for slot, index in last_usage.items():
+        releases.setdefault(index, []).append(slot)
+    return {index: tuple(sorted(slots)) for index, slots in releases.items()}
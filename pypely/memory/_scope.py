@@ -0,0 +1,99 @@
+"""I check the memory entries of a pipeline during buildtime.
+
+The types of the memory entries are known to the steps that write them. They are collected per pipeline
+while its steps are checked in order. So a memory entry has to be written by a previous step of the same pipeline
+before it can be ingested, and every name can only be written once per pipeline.
+Sub-pipelines use their own memory and are checked on their own.
+
+As no types are registered globally, the same names can be used in multiple pipelines
+and building a pipeline again does not fail.
+"""
+
+from typing import Any, Callable, Dict, Sequence
+
+from pypely._internal.type_matching import is_subtype
+from pypely.core.errors._formating import func_details
+from pypely.memory._wrappers import Memorizable
+from pypely.memory.errors import MemoryAttributeExistsError, MemoryAttributeNotFoundError, MemoryTypeDoesNotMatchError
+
+
+def check_memory_entries(funcs: Sequence[Callable]) -> None:
+    """I check that the memory entries of a pipeline are written once and before they are ingested.
+
+    Args:
+        funcs (Sequence[Callable]): The steps of the pipeline
+    """
+    _check(funcs, dict(), check_ingests=True)
+
+
+def check_unique_entries(funcs: Sequence[Callable]) -> None:
+    """I check that no memory entry is written by more than one of the given steps.
+
+    The ingested entries are not checked, as they may be written by the pipeline the steps are used in.
+    This is used for the branches of a `fork`.
+
+    Args:
+        funcs (Sequence[Callable]): The steps, e.g. the branches of a `fork`
+    """
+    _check(funcs, dict(), check_ingests=False)
+
+
+def _check(funcs: Sequence[Callable], written: Dict[str, Any], check_ingests: bool) -> None:
+    """I check the steps in order and collect the types of the written memory entries in `written`.
+
+    The inner steps of a step, e.g. the branches of a `fork`, run after the step ingested its entries
+    and before it writes its output. They are checked in this order as well.
+
+    Args:
+        funcs (Sequence[Callable]): The steps
+        written (Dict[str, Any]): The types of the entries written so far, by their names
+        check_ingests (bool): Whether the ingested entries are checked
+
+    Raises:
+        MemoryAttributeExistsError: if an entry is written twice.
+    """
+    for func in funcs:
+        if not isinstance(func, Memorizable):
+            continue
+
+        if check_ingests:
+            for name, parameter_name, parameter_type in func.ingested_entries:
+                _check_ingest(func, written, name, parameter_name, parameter_type)
+
+        _check(func.inner_steps, written, check_ingests)
+
+        written_name = func.written_attribute
+        if written_name is not None:
+            if written_name in written:
+                raise MemoryAttributeExistsError(f"The attribute {written_name} already exists")
+            written[written_name] = func.written_type
+
+
+def _check_ingest(
+    func: Callable, written: Dict[str, Any], name: str, parameter_name: str, parameter_type: Any
+) -> None:
+    """I check that an ingested memory entry exists and that its type matches the parameter it is used for.
+
+    Args:
+        func (Callable): The step that ingests the entry
+        written (Dict[str, Any]): The types of the entries written so far, by their names
+        name (str): The name of the memory entry
+        parameter_name (str): The name of the parameter the memory entry will be used for
+        parameter_type (Any): The type of the parameter the memory entry will be used for
+
+    Raises:
+        MemoryAttributeNotFoundError: if the entry is not written by a previous step of the pipeline.
+        MemoryTypeDoesNotMatchError: if the type of the entry does not match the type of the parameter.
+    """
+    if name not in written:
+        raise MemoryAttributeNotFoundError(
+            f"""Tried to access type information of attribute {name}. Attribute was not found. 
+            Available attribute types: {list(written.keys())}"""
+        )
+
+    memory_type = written[name]
+    if not is_subtype(memory_type, parameter_type):
+        raise MemoryTypeDoesNotMatchError(
+            f'The memory entry "{name}" could not be ingested. The function {func_details(func)} \
+            expects {parameter_type} for parameter "{parameter_name}". The memory entry has type {memory_type}'
+        )
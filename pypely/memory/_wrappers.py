@@ -6,16 +6,20 @@ This allows to read from or write to the memory.
 """
 
 import inspect
+import sys
+import threading
 import uuid
-from copy import deepcopy
-from typing import Callable, Dict, Generic, List, Optional, Set, Type, TypeVar, Union
+from copy import copy
+from typing import Any, Callable, Dict, Generic, List, Optional, Set, Tuple, Type, TypeVar, Union
 
 from typing_extensions import ParamSpec
 
-from pypely._internal.type_matching import check_if_annotations_given, is_subtype
+from pypely._internal.function_manipulation import forget_signature, signature_of
+from pypely._internal.type_matching import check_if_annotations_given
 from pypely.core.errors._formating import func_details
-from pypely.memory._impl import get_memory
-from pypely.memory.errors import MemoryIngestNotAllowedError, MemoryTypeDoesNotMatchError, NoFreeParameterFound
+from pypely.memory._backends import Handle, MemoryBackend
+from pypely.memory._impl import Slot, get_memory, slot_of
+from pypely.memory.errors import InvalidMemoryAttributeError, MemoryIngestNotAllowedError, NoFreeParameterFound
 
 T = TypeVar("T")
 P = ParamSpec("P")
@@ -27,6 +31,7 @@ class MemoryEntry:
     This allows to use a clear name which is internally handled as a uuid.
     In the future `memorizable` might only support me instead of using strings.
     If you run into naming conflicts use me instead of a string to reference the memory entry.
+    A `backend` can be given to keep my values somewhere else, e.g. on disk with `SpillToDisk`.
 
     Example:
         ```python
@@ -46,18 +51,34 @@ class MemoryEntry:
     """
 
     id: str
+    backend: Optional[MemoryBackend]
 
-    def __init__(self):
+    def __init__(self, backend: Optional[MemoryBackend] = None):
         self.id = str(uuid.uuid4())
+        self.backend = backend
 
 
 class Memorizable(Generic[P, T]):
-    """I am the wrapper that allows interaction with the memory."""
+    """I am the wrapper that allows interaction with the memory.
+
+    `inner_steps` lists the steps I run that share the memory with me, e.g. the branches of a `fork`.
+    They are taken into account when the lifetime of the memory entries is determined.
+
+    The memory entries I write and ingest are recorded together with their types.
+    They are checked when I am used in a pipeline (see `check_memory_entries`).
+    """
 
     attributes_after: List[str]
     attributes_before: List[str]
+    slots_after: List[int]
+    slots_before: List[int]
     attributes_set_by_memory: Set[str]
+    ingested_entries: List[Tuple[str, str, Any]]
     written_attribute: Optional[str]
+    written_type: Any
+    written_slot: Optional[int]
+    written_backend: Optional[MemoryBackend]
+    inner_steps: Tuple[Callable, ...]
 
     def __init__(self, func: Callable[P, T], allow_ingest: Optional[bool]):
         self.func = func
@@ -65,10 +86,18 @@ class Memorizable(Generic[P, T]):
 
         self.attributes_after = []
         self.attributes_before = []
+        self.slots_after = []
+        self.slots_before = []
         self.attributes_set_by_memory = set()
+        self.ingested_entries = []
+        self._slot_records: List[Slot] = []  # the slots are reserved as long as I exist
 
         self.used_memory = False
         self.written_attribute = None
+        self.written_type = None
+        self.written_backend = None
+        self.written_slot = None
+        self.inner_steps = ()
 
         self.__qualname__ = func.__qualname__
         self._execute = func
@@ -90,6 +119,7 @@ class Memorizable(Generic[P, T]):
         # noqa: DAR201
         """
         self.func.__annotations__ = val
+        forget_signature(self.func)
 
     @property
     def __signature__(self) -> inspect.Signature:
@@ -98,7 +128,7 @@ class Memorizable(Generic[P, T]):
         # noqa: DAR101
         # noqa: DAR201
         """
-        return inspect.signature(self.func)
+        return signature_of(self.func)
 
     @__signature__.setter
     def __signature__(self, val: inspect.Signature):
@@ -108,6 +138,7 @@ class Memorizable(Generic[P, T]):
         # noqa: DAR201
         """
         setattr(self.func, "__signature__", val)
+        forget_signature(self.func)
 
     @property
     def __name__(self):
@@ -136,27 +167,115 @@ class Memorizable(Generic[P, T]):
         """
         return self.func.__module__
 
-    def __rshift__(self, memory_attr_name: Union[str, MemoryEntry]) -> "Memorizable":
+    def __reduce__(self):
+        """I make the wrapper picklable.
+
+        Pickle can't find my class by itself, as the `__module__` property hides the module of the class.
+        So my class is given by its name.
+
+        A function decorated with `@memorizable` can't be pickled by reference, as its module attribute is the wrapper.
+        It is pickled as a reference to the wrapper instead, which is unwrapped again when it is loaded.
+
+        # noqa: DAR201
+        """
+        state = self.__dict__
+        if _is_decorated(self.func):
+            reference = _DecoratedFunction(self.func.__module__, self.func.__qualname__)
+            state = {name: reference if value is self.func else value for name, value in state.items()}
+        return _new_memorizable, (type(self).__qualname__,), state
+
+    def __copy__(self) -> "Memorizable":
+        """I create a shallow copy of the same class that shares the wrapped function with me.
+
+        # noqa: DAR201
+        """
+        self_copy = _new_memorizable(type(self).__qualname__)
+        self_copy.__dict__.update(self.__dict__)
+        return self_copy
+
+    def with_function(self, func: Callable[P, T]) -> "Memorizable[P, T]":
+        """I create a copy that calls `func` instead of my function. The copy uses the same memory entries.
+
+        I am used by wrappers like `disk_cached` that change how my function is called, but not its signature.
+        So the ingested memory entries are passed to `func` and its output is written to my memory entry.
+
+        Args:
+            func (Callable[P, T]): The function with the signature of my function
+
+        Returns:
+            Memorizable[P, T]: A copy of myself calling `func`.
+        """
+        self_copy = self.__copy_for_memory_usage()
+        self_copy.used_memory = self.used_memory
+        self_copy.func = func
+        self_copy._execute = func
+        if self.written_slot is not None and not isinstance(self, LazyMemorizable):  # lazy entries call `func`
+            self_copy._execute = _add_to_memory(func, slot_of(str(self.written_attribute)), self.written_backend)
+        return self_copy
+
+    def __rshift__(self, memory_attr_name: Union[str, MemoryEntry, "Lazy"]) -> "Memorizable":
         """I am this operator: `func >> "name"`.
 
         I am used to write the output of `func` into the memory.
-        The output is referenced as "name".
+        The output is referenced as "name". With `func >> lazy("name")` `func` only runs if the entry is ingested.
 
         Args:
-            memory_attr_name (Union[str, MemoryEntry]): The name of the memory entry that will be ingested into the function
+            memory_attr_name (Union[str, MemoryEntry, Lazy]): The name of the memory entry that will be ingested into the function
 
         Returns:
             Memorizable: a copy of the Memorizable object.
         """
+        if type(memory_attr_name) == Lazy:
+            return self.__write_lazily(memory_attr_name)
+
         _attr_name = ""
+        backend = None
         if type(memory_attr_name) == MemoryEntry:
             _attr_name = memory_attr_name.id
+            backend = memory_attr_name.backend
         else:
             _attr_name = str(memory_attr_name)  # str() required for mypy
 
+        slot = slot_of(_attr_name)
         self_copy = self.__copy_for_memory_usage()
-        self_copy._execute = _add_to_memory(self.func, _attr_name)
+        self_copy._execute = _add_to_memory(self.func, slot, backend)
+        self_copy.written_backend = backend
         self_copy.written_attribute = _attr_name
+        self_copy.written_type = self.func.__annotations__["return"]
+        self_copy.written_slot = slot.index
+        self_copy._slot_records.append(slot)
+        return self_copy
+
+    def __write_lazily(self, lazy_entry: "Lazy") -> "Memorizable":
+        """I create a copy that stores `func` with its input as a lazy memory entry.
+
+        Args:
+            lazy_entry (Lazy): The memory entry
+
+        Returns:
+            Memorizable: a copy of the Memorizable object.
+
+        Raises:
+            InvalidMemoryAttributeError: if `func` is a coroutine function. Its output can't be computed on read.
+        """
+        if type(lazy_entry.entry) == MemoryEntry:
+            _attr_name = lazy_entry.entry.id
+        else:
+            _attr_name = str(lazy_entry.entry)  # str() required for mypy
+
+        _check_storable(self.func, _attr_name)
+        if inspect.iscoroutinefunction(self.func):
+            raise InvalidMemoryAttributeError(
+                f"The output of a coroutine function can't be stored lazily. Given memory attribute name: {_attr_name}"
+            )
+
+        slot = slot_of(_attr_name)
+        self_copy = LazyMemorizable.__new__(LazyMemorizable)
+        self_copy.__dict__.update(self.__copy_for_memory_usage().__dict__)
+        self_copy.written_attribute = _attr_name
+        self_copy.written_type = self.func.__annotations__["return"]
+        self_copy.written_slot = slot.index
+        self_copy._slot_records.append(slot)
         return self_copy
 
     def __lshift__(self, memory_attr_name: Union[str, MemoryEntry]) -> "Memorizable":
@@ -180,9 +299,12 @@ class Memorizable(Generic[P, T]):
         self_copy = self.__copy_for_memory_usage()
 
         parameter_name, parameter_type = self.__get_next_free_parameter_from_right()
-        self.__check_memory_ingest_type(_attr_name, parameter_name, parameter_type)
 
+        slot = slot_of(_attr_name)
         self_copy.attributes_after.append(_attr_name)
+        self_copy.slots_after.append(slot.index)
+        self_copy._slot_records.append(slot)
+        self_copy.ingested_entries.append((_attr_name, parameter_name, parameter_type))
         self_copy.attributes_set_by_memory.add(parameter_name)
         return self_copy
 
@@ -208,16 +330,19 @@ class Memorizable(Generic[P, T]):
         self_copy = self.__copy_for_memory_usage()
 
         parameter_name, parameter_type = self.__get_next_free_parameter_from_left()
-        self.__check_memory_ingest_type(_attr_name, parameter_name, parameter_type)
 
+        slot = slot_of(_attr_name)
         self_copy.attributes_before.append(_attr_name)
+        self_copy.slots_before.append(slot.index)
+        self_copy._slot_records.append(slot)
+        self_copy.ingested_entries.append((_attr_name, parameter_name, parameter_type))
         self_copy.attributes_set_by_memory.add(parameter_name)
         return self_copy
 
     def __call__(self, *args: P.args, **kwargs: P.kwargs) -> T:
         """I execute the function with the provided arguments and defined memory entries.
 
-        The memory entries are loaded and combined with the given arguments.
+        The memory entries are loaded from the slots resolved at buildtime and combined with the given arguments.
 
         Args:
             args: The positional arguments given to the function
@@ -226,9 +351,12 @@ class Memorizable(Generic[P, T]):
         Returns:
             T: the object returned by the called function.
         """
+        if not self.slots_before and not self.slots_after:
+            return self._execute(*args, **kwargs)
+
         memory = get_memory()
-        memory_attributes_before = [memory.get(attr) for attr in self.attributes_before]
-        memory_attributes_after = [memory.get(attr) for attr in self.attributes_after]
+        memory_attributes_before = [memory.get_slot(slot) for slot in self.slots_before]
+        memory_attributes_after = [memory.get_slot(slot) for slot in self.slots_after]
 
         return self._execute(*memory_attributes_before, *args, *memory_attributes_after, **kwargs)
 
@@ -241,34 +369,26 @@ class Memorizable(Generic[P, T]):
         if not self.allow_ingest:
             raise MemoryIngestNotAllowedError(f"Memory ingest is not allowed for func: {func_details(self)}")
 
-    def __check_memory_ingest_type(self, memory_attr_name: str, parameter_name: str, parameter_type: type):
-        """I check if the type of memory entry matches the type of the function parameter it will be used for.
-
-        Args:
-            memory_attr_name (str): The name of the memory entry.
-            parameter_name (str): The name of the parameter the memory entry will be used for.
-            parameter_type (type): The type of the parameter the memory entry will be used for.
-
-        Raises:
-            MemoryTypeDoesNotMatchError: if the type of the memory entry does not match the type of the parameter it will be used for.
-        """
-        memory_type = get_memory().get_type(memory_attr_name)
-        if not is_subtype(memory_type, parameter_type):
-            raise MemoryTypeDoesNotMatchError(
-                f'The memory entry "{memory_attr_name}" could not be ingested. The function {func_details(self)} \
-                expects {parameter_type} for parameter "{parameter_name}". The memory entry has type {memory_type}'
-            )
-
     def __copy_for_memory_usage(self) -> "Memorizable":
         """I duplicate the memory wrapper.
 
         I am important so that multiple memory interactions of a single function work properly.
         Without me this would not be possible: `"in1" >> func << "in2" >> "out"`.
 
+        The copy shares the wrapped function with me. Only the lists describing the memory interaction are copied,
+        so functions holding large objects, e.g. models or lookup tables, are not copied.
+
         Returns:
             Memorizable: a copy of myself.
         """
-        self_copy = deepcopy(self)
+        self_copy = copy(self)
+        self_copy.attributes_after = list(self.attributes_after)
+        self_copy.attributes_before = list(self.attributes_before)
+        self_copy.slots_after = list(self.slots_after)
+        self_copy.slots_before = list(self.slots_before)
+        self_copy.attributes_set_by_memory = set(self.attributes_set_by_memory)
+        self_copy.ingested_entries = list(self.ingested_entries)
+        self_copy._slot_records = list(self._slot_records)
         self_copy.used_memory = True
 
         return self_copy
@@ -318,6 +438,170 @@ class Memorizable(Generic[P, T]):
         )
 
 
+class LazyMemorizable(Memorizable[P, T]):
+    """I write a lazy memory entry. See `lazy`.
+
+    I don't call the function when I am called. Instead the function and its input are stored as the memory entry.
+    My input is forwarded to the next step unchanged. So my return type is the type of my input.
+    """
+
+    @property
+    def __annotations__(self) -> Dict[str, Type]:
+        """noqa: D105.
+
+        # noqa: DAR101
+        # noqa: DAR201
+        """
+        annotations = dict(self.func.__annotations__)
+        annotations["return"] = self.__forwarded_type()
+        return annotations
+
+    @__annotations__.setter
+    def __annotations__(self, val: Dict[str, Type]):
+        """noqa: D105.
+
+        The return type is derived from the parameters. So it is not taken over.
+
+        # noqa: DAR101
+        # noqa: DAR201
+        """
+        self.func.__annotations__ = {**val, "return": self.func.__annotations__.get("return")}
+        forget_signature(self.func)
+
+    @property
+    def __signature__(self) -> inspect.Signature:
+        """noqa: D105.
+
+        # noqa: DAR101
+        # noqa: DAR201
+        """
+        return signature_of(self.func).replace(return_annotation=self.__forwarded_type())
+
+    @__signature__.setter
+    def __signature__(self, val: inspect.Signature):
+        """noqa: D105.
+
+        The return annotation is derived from the parameters. So it is not taken over.
+
+        # noqa: DAR101
+        # noqa: DAR201
+        """
+        return_annotation = signature_of(self.func).return_annotation
+        setattr(self.func, "__signature__", val.replace(return_annotation=return_annotation))
+        forget_signature(self.func)
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> T:
+        """I store the function and its input as the memory entry and forward the positional input.
+
+        The ingested memory entries are read now. So they are passed to the function even if they are released
+        before the lazy entry is read.
+
+        Args:
+            args: The positional arguments given to the function
+            kwargs: The keyword arguments given to the function
+
+        Returns:
+            T: the positional input. A single argument is forwarded as it is, multiple arguments as a tuple.
+        """
+        memory = get_memory()
+        memory_attributes_before = [memory.get_slot(slot) for slot in self.slots_before]
+        memory_attributes_after = [memory.get_slot(slot) for slot in self.slots_after]
+
+        func = self.func
+        deferred = Deferred(lambda: func(*memory_attributes_before, *args, *memory_attributes_after, **kwargs))
+        memory.add_slot(self.written_slot, deferred)  # type: ignore
+
+        if len(args) == 1:
+            return args[0]  # type: ignore
+        return args if args else None  # type: ignore
+
+    def __forwarded_type(self) -> Any:
+        """I provide the type of the forwarded input.
+
+        Returns:
+            Any: The type of the parameter that is not set by memory entries, a tuple of their types or `None`.
+        """
+        types = [
+            parameter.annotation
+            for name, parameter in signature_of(self.func).parameters.items()
+            if name not in self.attributes_set_by_memory
+        ]
+        if not types:
+            return None
+        if len(types) == 1:
+            return types[0]
+        return Tuple[tuple(types)]
+
+
+class Deferred(Handle):
+    """I stand in for the output of a lazy memory entry. The output is computed when I am read for the first time."""
+
+    def __init__(self, compute: Callable[[], Any]) -> None:
+        self._compute: Optional[Callable[[], Any]] = compute
+        self._value: Any = None
+        self._lock = threading.Lock()
+
+    def load(self) -> Any:
+        """I compute the output once and provide it for all later reads.
+
+        Returns:
+            Any: the output of the function.
+        """
+        with self._lock:
+            if self._compute is not None:
+                self._value = self._compute()
+                self._compute = None
+            return self._value
+
+    def remove(self) -> None:
+        """I drop the output and the input of the function."""
+        self._compute = None
+        self._value = None
+
+
+class Lazy:
+    """I mark a memory entry that is only computed if it is ingested. See `lazy`."""
+
+    entry: Union[str, MemoryEntry]
+
+    def __init__(self, entry: Union[str, MemoryEntry]) -> None:
+        self.entry = entry
+
+
+def lazy(entry: Union[str, MemoryEntry]) -> Lazy:
+    """I turn a memory entry into a lazy memory entry.
+
+    The step that writes a lazy memory entry does not run when the pipeline reaches it.
+    Its input is forwarded to the next step unchanged. The step runs with this input once the entry is
+    ingested for the first time. Later reads use the same output. If the entry is never ingested, the step never runs.
+    The types are checked during buildtime like for any other memory entry.
+
+    Example:
+        ```python
+        from pypely import pipeline
+        from pypely.memory import lazy, memorizable
+
+        @memorizable
+        def expensive_diagnostics(data: Data) -> Report:
+            ...
+
+        pipeline(
+            load,
+            expensive_diagnostics >> lazy("report"),
+            train,  # receives the output of `load`
+            maybe_use_report << "report"
+        )
+        ```
+
+    Args:
+        entry (Union[str, MemoryEntry]): The name of the memory entry. The backend of a `MemoryEntry` is not used.
+
+    Returns:
+        Lazy: the marker that is used with `>>`.
+    """
+    return Lazy(entry)
+
+
 def memorizable(
     func: Optional[Callable[P, T]] = None, allow_ingest: Optional[bool] = True
 ) -> Union[Callable[[Callable[P, T]], Callable[P, T]], Callable[P, T]]:
@@ -357,7 +641,75 @@ def memorizable(
         return Memorizable(func, allow_ingest)
 
 
-def _add_to_memory(func: Callable[P, T], name: str) -> Callable[P, T]:
+def _new_memorizable(class_name: str = "Memorizable") -> Memorizable:
+    """I create an empty `Memorizable`. Its state is restored by pickle or copy.
+
+    Args:
+        class_name (str): The name of the class of the wrapper, e.g. `"LazyMemorizable"`. Defaults to "Memorizable".
+
+    Returns:
+        Memorizable: the empty wrapper.
+    """
+    cls = _MEMORIZABLE_CLASSES[class_name]
+    return cls.__new__(cls)
+
+
+class _DecoratedFunction:
+    """I stand in for a function decorated with `@memorizable` while it is pickled."""
+
+    def __init__(self, module: str, qualname: str) -> None:
+        self.module = module
+        self.qualname = qualname
+
+    def __reduce__(self) -> Tuple[Callable[[str, str], Callable], Tuple[str, str]]:
+        """I am loaded as the function wrapped by the module attribute.
+
+        # noqa: DAR201
+        """
+        return _undecorated, (self.module, self.qualname)
+
+
+def _is_decorated(func: Callable) -> bool:
+    """I check if the module attribute of `func` is a `Memorizable` wrapping it, as created by `@memorizable`.
+
+    Args:
+        func (Callable): The wrapped function
+
+    Returns:
+        bool: `True` if `func` can only be found through its wrapper.
+    """
+    qualname = getattr(func, "__qualname__", "")
+    if "<locals>" in qualname:
+        return False
+    try:
+        wrapper = _find(getattr(func, "__module__", ""), qualname)
+    except (AttributeError, KeyError):
+        return False
+    return isinstance(wrapper, Memorizable) and wrapper is not func and wrapper.func is func
+
+
+def _undecorated(module: str, qualname: str) -> Callable:
+    """I provide the function wrapped by the `Memorizable` found under `qualname` in `module`.
+
+    Args:
+        module (str): The name of the module
+        qualname (str): The qualified name of the decorated function
+
+    Returns:
+        Callable: The wrapped function.
+    """
+    __import__(module)
+    return _find(module, qualname).func
+
+
+def _find(module: str, qualname: str) -> Any:
+    value: Any = sys.modules[module]
+    for name in qualname.split("."):
+        value = getattr(value, name)
+    return value
+
+
+def _add_to_memory(func: Callable[P, T], slot: Slot, backend: Optional[MemoryBackend] = None) -> Callable[P, T]:
     """I write the function output into the memory.
 
     I am used in `Memorizable` and am not meant to be used by you directly.
@@ -365,22 +717,51 @@ def _add_to_memory(func: Callable[P, T], name: str) -> Callable[P, T]:
 
     Args:
         func (Callable[P, T]): The functions who's output will be written to the memory.
-        name (str): The name of the memory entry.
+        slot (Slot): The slot of the memory entry.
+        backend (Optional[MemoryBackend], optional): The backend that keeps the output. Defaults to the backend of the memory.
 
     Returns:
         Callable[P, T]: The function wrapped with a memory interaction handler.
+
     """
-    check_if_annotations_given(func)
+    _check_storable(func, slot.name)
 
-    memory = get_memory()
-    return_type = func.__annotations__["return"]
-    memory.add_type(name, return_type)
+    if inspect.iscoroutinefunction(func):
+
+        async def __inner_async(*args: P.args, **kwargs: P.kwargs):
+            result = await func(*args, **kwargs)  # type: ignore
+            get_memory().add_slot(slot.index, result, backend)
+
+            return result
+
+        return __inner_async  # type: ignore
 
     def __inner(*args: P.args, **kwargs: P.kwargs):
         result = func(*args, **kwargs)
-        memory = get_memory()
-        memory.add(name, result)
+        get_memory().add_slot(slot.index, result, backend)
 
         return result
 
     return __inner
+
+
+def _check_storable(func: Callable, name: str) -> None:
+    """I check that the output of `func` can be stored in the memory.
+
+    Args:
+        func (Callable): The functions who's output will be written to the memory.
+        name (str): The name of the memory entry.
+
+    Raises:
+        InvalidMemoryAttributeError: if the function returns `None`, which can't be stored in the memory.
+    """
+    check_if_annotations_given(func)
+
+    return_type = func.__annotations__["return"]
+    if return_type == type(None) or return_type == None:
+        raise InvalidMemoryAttributeError(
+            f"It is not allowed to store `None` in memory. Given memory attribute name: {name}"
+        )
+
+
+_MEMORIZABLE_CLASSES: Dict[str, Type[Memorizable]] = {"Memorizable": Memorizable, "LazyMemorizable": LazyMemorizable}
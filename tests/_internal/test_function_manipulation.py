@@ -0,0 +1,54 @@
+import inspect
+
+from pypely._internal.function_manipulation import define_annotation, define_signature, signature_of
+
+
+def add(x: int, y: int) -> int:
+    return x + y
+
+
+def test_signature_of_is_cached():
+    # Prepare
+    def to_str(x: int) -> str:
+        return str(x)
+
+    # Act
+    first = signature_of(to_str)
+    second = signature_of(to_str)
+
+    # Compare
+    assert first == inspect.signature(to_str)
+    assert first is second
+
+
+def test_signature_of_is_reset_by_define_annotation_and_define_signature():
+    # Prepare
+    def to_str(x: int) -> str:
+        return str(x)
+
+    before = signature_of(to_str)
+
+    # Act
+    define_annotation(to_str, add, float)
+    define_signature(to_str, add, float)
+    after = signature_of(to_str)
+
+    # Compare
+    assert list(before.parameters) == ["x"]
+    assert list(after.parameters) == ["x", "y"]
+    assert after.return_annotation == float
+
+
+def test_signature_of_notices_replaced_annotations():
+    # Prepare
+    def to_str(x: int) -> str:
+        return str(x)
+
+    signature_of(to_str)
+
+    # Act
+    to_str.__annotations__ = {"x": float, "return": str}
+    signature = signature_of(to_str)
+
+    # Compare
+    assert signature.parameters["x"].annotation == float
@@ -1,6 +1,12 @@
-from typing import Dict, Iterable, List, NewType, TypeVar, Union
+from typing import Annotated, Any, Dict, Iterable, List, NewType, Optional, TypeVar, Union
 
-from pypely._internal.type_matching import _do_types_match, _does_resolve_typevar, _get_base_type, is_subtype
+from pypely._internal.type_matching import (
+    _do_types_match,
+    _does_resolve_typevar,
+    _get_base_type,
+    _is_subtype_cached,
+    is_subtype,
+)
 
 
 def test_is_subtype():
@@ -98,3 +104,69 @@ def test_get_base_type():
     assert base_type_new_type == int
     assert base_type_generic == MyDict
     assert base_type_list == list
+
+
+def test_is_subtype_caches_results_of_equal_types():
+    # Prepare
+    _is_subtype_cached.cache_clear()
+
+    # Act
+    first = is_subtype(Dict[str, List[int]], Dict[str, Iterable[Optional[int]]])
+    second = is_subtype(Dict[str, List[int]], Dict[str, Iterable[Optional[int]]])
+    plain_type = is_subtype(int, float)
+
+    # Compare
+    assert first and second and plain_type
+    assert _is_subtype_cached.cache_info().hits == 1
+    assert _is_subtype_cached.cache_info().misses == 2
+
+
+def test_is_subtype_does_not_unwrap_new_types_before_caching():
+    # Prepare
+    UserId = NewType("UserId", int)
+    Nested = NewType("Nested", UserId)
+    _is_subtype_cached.cache_clear()
+
+    # Act
+    user_id_to_int = is_subtype(UserId, int)
+    user_id_to_float = is_subtype(UserId, float)
+    int_to_nested = is_subtype(int, Nested)
+    nested_to_user_id = is_subtype(Nested, UserId)
+    nested_to_int = is_subtype(Nested, int)
+    none_type_to_none = is_subtype(type(None), None)
+
+    # Compare
+    assert user_id_to_int
+    assert not user_id_to_float
+    assert not int_to_nested
+    assert not nested_to_user_id
+    assert not nested_to_int
+    assert not none_type_to_none
+    assert _is_subtype_cached.cache_info().misses == 6
+
+
+def test_is_subtype_caches_type_vars_by_identity():
+    # Prepare
+    bound_to_int = TypeVar("T", bound=int)
+    bound_to_str = TypeVar("T", bound=str)
+    _is_subtype_cached.cache_clear()
+
+    # Act
+    int_resolves_bound_to_int = is_subtype(List[int], List[bound_to_int])
+    int_resolves_bound_to_str = is_subtype(List[int], List[bound_to_str])
+
+    # Compare
+    assert int_resolves_bound_to_int
+    assert not int_resolves_bound_to_str
+    assert _is_subtype_cached.cache_info().currsize == 2
+
+
+def test_is_subtype_works_with_unhashable_types():
+    # Prepare
+    unhashable = Annotated[int, {"unit": "seconds"}]
+
+    # Act
+    to_test = is_subtype(unhashable, Any)
+
+    # Compare
+    assert to_test
@@ -0,0 +1,161 @@
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import Tuple
+
+import pytest
+
+from pypely import async_fork, async_merge, async_pipeline, async_to, pipeline
+from pypely._types import PypelyTuple
+from pypely.core.errors import OutputInputDoNotMatchError, PipelineStepError
+from pypely.memory import MemoryEntry, memorizable
+
+
+async def add(x: float, y: float) -> float:
+    await asyncio.sleep(0)
+    return x + y
+
+
+async def double(x: float) -> float:
+    await asyncio.sleep(0)
+    return x * 2
+
+
+def triple(x: float) -> float:
+    return x * 3
+
+
+def to_str(x: int) -> str:
+    return str(x)
+
+
+def test_async_pipeline_awaits_steps_in_order():
+    # Prepare
+    to_test = async_pipeline(add, double, triple)
+
+    # Act
+    result = asyncio.run(to_test(1, 2))
+
+    # Compare
+    assert result == 18
+
+
+def test_async_pipeline_runs_sync_steps_in_thread():
+    # Prepare
+    def thread_name(x: float) -> str:
+        return threading.current_thread().name
+
+    to_test = async_pipeline(add, thread_name)
+
+    # Act
+    result = asyncio.run(to_test(1, 2))
+
+    # Compare
+    assert result != threading.current_thread().name
+
+
+def test_async_pipeline_checks_awaited_types():
+    # Prepare
+    async def pair(x: float) -> Tuple[float, float]:
+        return x, x
+
+    # Act
+    # Compare
+    with pytest.raises(OutputInputDoNotMatchError):
+        async_pipeline(add, double, to_str)
+
+    assert asyncio.run(async_pipeline(double, pair, add)(1)) == 4
+
+
+def test_async_fork_runs_branches_concurrently():
+    # Prepare
+    events = {}
+
+    async def wait_for_sibling(x: float) -> float:
+        await asyncio.wait_for(events[asyncio.get_running_loop()].wait(), timeout=5)
+        return x
+
+    async def release_sibling(x: float) -> float:
+        events[asyncio.get_running_loop()].set()
+        return x
+
+    async def run(pipe):
+        events[asyncio.get_running_loop()] = asyncio.Event()
+        return await pipe(1, 2)
+
+    @dataclass
+    class Result:
+        first: float
+        second: float
+
+    to_test = async_pipeline(
+        add,
+        async_fork(wait_for_sibling, release_sibling, triple),
+        async_merge(lambda x, y, z: x + y + z),
+        async_fork(double, triple),
+    )
+    to_test_with_to = async_pipeline(add, async_fork(wait_for_sibling, release_sibling), async_to(Result))
+
+    # Act
+    result = asyncio.run(run(to_test))
+    result_with_to = asyncio.run(run(to_test_with_to))
+
+    # Compare
+    assert result == PypelyTuple(30, 45)
+    assert result_with_to == Result(3, 3)
+
+
+def test_async_fork_raises_failure_of_first_failing_branch():
+    # Prepare
+    async def first_failure(x: float) -> float:
+        raise RuntimeError("first failure")
+
+    to_test = async_pipeline(add, async_fork(double, first_failure))
+
+    # Act
+    with pytest.raises(PipelineStepError) as error:
+        asyncio.run(to_test(1, 2))
+
+    # Compare
+    assert "'first_failure'" in str(error.value)
+
+
+def test_async_pipeline_uses_memory_per_task():
+    # Prepare
+    _add = memorizable(add)
+    _double = memorizable(double)
+    doubled = MemoryEntry()
+    tripled = MemoryEntry()
+
+    async def wait(x: float) -> float:
+        await asyncio.sleep(0.01)
+        return x
+
+    to_test = async_pipeline(
+        async_fork(_double >> doubled, memorizable(triple) >> tripled),
+        async_merge(add),
+        wait,
+        _add << doubled,
+        _add << tripled,
+    )
+
+    async def run_concurrently():
+        return await asyncio.gather(*(to_test(x) for x in range(5)))
+
+    # Act
+    result = asyncio.run(run_concurrently())
+
+    # Compare
+    assert result == [10 * x for x in range(5)]
+
+
+def test_sync_pipeline_can_be_used_inside_async_pipeline():
+    # Prepare
+    inner = pipeline(triple, triple)
+    to_test = async_pipeline(add, inner, async_pipeline(double, triple))
+
+    # Act
+    result = asyncio.run(to_test(1, 2))
+
+    # Compare
+    assert result == 162
@@ -0,0 +1,143 @@
+import time
+from typing import Iterator, List
+
+import pytest
+
+from pypely import batched, fork, merge, pipeline
+from pypely.core.errors import InvalidBatchAnnotationError, OutputInputDoNotMatchError, PipelineStepError
+from pypely.memory import MemoryEntry, memorizable
+
+
+def double(x: int) -> int:
+    return x * 2
+
+
+def add(x: int, y: int) -> int:
+    return x + y
+
+
+def identity_int(x: int) -> int:
+    return x
+
+
+def to_str(x: int) -> str:
+    return str(x)
+
+
+def record_batches(batches: List[List[int]]):
+    def _increment(values: List[int]) -> List[int]:
+        batches.append(values)
+        return [value + 1 for value in values]
+
+    return _increment
+
+
+def test_batched_step_can_be_called_with_a_single_value():
+    # Prepare
+    batches: List[List[int]] = []
+    to_test = pipeline(double, batched(record_batches(batches), size=10))
+
+    # Act
+    result = to_test(2)
+
+    # Compare
+    assert result == 5
+    assert batches == [[4]]
+
+
+def test_stream_calls_batched_step_once_per_batch():
+    # Prepare
+    batches: List[List[int]] = []
+    to_test = pipeline(double, batched(record_batches(batches), size=3), double)
+
+    # Act
+    result = list(to_test.stream(range(5)))
+
+    # Compare
+    assert result == [2, 6, 10, 14, 18]
+    assert batches == [[0, 2, 4], [6, 8]]
+
+
+def test_stream_with_batched_first_step():
+    # Prepare
+    batches: List[List[int]] = []
+    to_test = pipeline(batched(record_batches(batches), size=2), double)
+
+    # Act
+    result = list(to_test.stream(range(3)))
+
+    # Compare
+    assert result == [2, 4, 6]
+    assert batches == [[0, 1], [2]]
+
+
+def test_stream_with_batched_steps_keeps_memory_per_record():
+    # Prepare
+    batches: List[List[int]] = []
+    entry = MemoryEntry()
+    to_test = pipeline(
+        memorizable(add) >> entry,
+        batched(record_batches(batches), size=2),
+        fork(double, identity_int),
+        merge(add),
+        entry >> memorizable(add),
+    )
+
+    # Act
+    result = list(to_test.stream([(1, 2), (3, 4), (5, 6)]))
+
+    # Compare
+    assert result == [15, 31, 47]
+    assert batches == [[3, 7], [11]]
+
+
+def test_stream_closes_batch_after_max_wait():
+    # Prepare
+    batches: List[List[int]] = []
+
+    def slow_records() -> Iterator[int]:
+        for i in range(3):
+            yield i
+            time.sleep(0.02)
+
+    to_test = pipeline(batched(record_batches(batches), size=10, max_wait=0.01))
+
+    # Act
+    result = list(to_test.stream(slow_records()))
+
+    # Compare
+    assert result == [1, 2, 3]
+    assert len(batches) > 1
+
+
+def test_batched_types_are_checked():
+    # Prepare
+    def lengths(values: List[str]) -> List[int]:
+        return [len(value) for value in values]
+
+    # Act
+    # Compare
+    pipeline(to_str, batched(lengths, size=2))
+    with pytest.raises(OutputInputDoNotMatchError):
+        pipeline(double, batched(lengths, size=2))
+
+
+def test_batched_requires_list_annotations():
+    # Prepare
+    # Act
+    # Compare
+    with pytest.raises(InvalidBatchAnnotationError):
+        batched(double, size=2)
+
+
+def test_batched_step_must_return_one_output_per_value():
+    # Prepare
+    def drop(values: List[int]) -> List[int]:
+        return values[1:]
+
+    to_test = pipeline(double, batched(drop, size=2))
+
+    # Act
+    # Compare
+    with pytest.raises(PipelineStepError):
+        list(to_test.stream(range(4)))
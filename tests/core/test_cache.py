@@ -0,0 +1,168 @@
+import time
+from typing import Dict, List
+
+import pytest
+
+from pypely import cached, pipeline
+from pypely.core._cache import default_key
+from pypely.memory import MemoryEntry, memorizable
+
+
+def count_calls(calls: List[int]):
+    def _double(x: int) -> int:
+        calls.append(x)
+        return x * 2
+
+    return _double
+
+
+def add(x: int, y: int) -> int:
+    return x + y
+
+
+def test_cached_step_is_called_once_per_input():
+    # Prepare
+    calls: List[int] = []
+    to_test = cached(count_calls(calls))
+
+    # Act
+    results = [to_test(x) for x in [1, 2, 1, 1]]
+
+    # Compare
+    assert results == [2, 4, 2, 2]
+    assert calls == [1, 2]
+    info = to_test.cache_info()
+    assert (info.hits, info.misses, info.entries) == (2, 2, 2)
+    assert info.bytes > 0
+
+
+def test_cached_step_evicts_least_recently_used():
+    # Prepare
+    calls: List[int] = []
+    to_test = cached(count_calls(calls), maxsize=2)
+
+    # Act
+    for x in [1, 2, 1, 3, 1, 2]:
+        to_test(x)
+
+    # Compare
+    assert calls == [1, 2, 3, 2]
+    info = to_test.cache_info()
+    assert info.evictions == 2
+    assert info.entries == 2
+
+
+def test_cached_step_recomputes_expired_outputs():
+    # Prepare
+    calls: List[int] = []
+    to_test = cached(count_calls(calls), ttl=0.01)
+
+    # Act
+    to_test(1)
+    time.sleep(0.02)
+    to_test(1)
+
+    # Compare
+    assert calls == [1, 1]
+    assert to_test.cache_info().expirations == 1
+
+
+def test_cached_step_handles_unhashable_inputs():
+    # Prepare
+    calls: List[Dict[str, int]] = []
+
+    def total(values: Dict[str, int]) -> int:
+        calls.append(values)
+        return sum(values.values())
+
+    to_test = cached(total)
+
+    # Act
+    to_test({"a": 1, "b": 2})
+    to_test({"a": 1, "b": 2})
+    to_test({"a": 1, "b": 3})
+
+    # Compare
+    assert len(calls) == 2
+
+
+def test_cached_step_uses_given_key():
+    # Prepare
+    calls: List[int] = []
+    to_test = cached(count_calls(calls), key=lambda x: x % 2)
+
+    # Act
+    results = [to_test(x) for x in [1, 3, 2]]
+
+    # Compare
+    assert results == [2, 2, 4]
+    assert calls == [1, 2]
+
+
+def test_cached_step_keeps_annotations_and_works_with_memory():
+    # Prepare
+    calls: List[int] = []
+    step = cached(count_calls(calls))
+    entry = MemoryEntry()
+    to_test = pipeline(step >> entry, step, entry >> memorizable(add))
+
+    # Act
+    results = [to_test(x) for x in [1, 1]]
+
+    # Compare
+    assert results == [6, 6]
+    assert calls == [1, 2]
+    assert step.cache_info().hits == 2
+    assert step.__annotations__ == {"x": int, "return": int}
+
+
+def test_cache_clear_empties_the_cache():
+    # Prepare
+    calls: List[int] = []
+    to_test = cached(count_calls(calls))
+    to_test(1)
+
+    # Act
+    to_test.cache_clear()
+    to_test(1)
+
+    # Compare
+    assert calls == [1, 1]
+    assert to_test.cache_info().misses == 1
+
+
+def test_cache_info_reports_the_size_of_nested_outputs():
+    # Prepare
+    def nest(size: int) -> Dict[str, List[str]]:
+        return {"values": ["x" * size]}
+
+    to_test = cached(nest)
+
+    # Act
+    to_test(10)
+    small = to_test.cache_info().bytes
+    to_test.cache_clear()
+    to_test(10_000)
+    large = to_test.cache_info().bytes
+
+    # Compare
+    assert large - small >= 10_000 - 10
+
+
+def test_default_key_distinguishes_keyword_arguments():
+    # Prepare
+    # Act
+    # Compare
+    assert default_key((1,), {"y": 2}) == default_key((1,), {"y": 2})
+    assert default_key((1,), {"y": 2}) != default_key((1,), {"y": 3})
+    assert default_key(([1, 2],), {}) == default_key(([1, 2],), {})
+
+
+def test_cached_validates_bounds():
+    # Prepare
+    # Act
+    # Compare
+    with pytest.raises(ValueError):
+        cached(add, maxsize=0)
+    with pytest.raises(ValueError):
+        cached(add, ttl=0)
@@ -0,0 +1,172 @@
+import json
+import tempfile
+from typing import Any, Iterable, List, Optional, Union
+
+import pytest
+
+from pypely import pipeline
+from pypely.core import _plan
+from pypely.core._check_cache import FINGERPRINTS_PER_PIPELINE, CheckCache
+from pypely.core._plan import compile_plan
+from pypely.core.errors import OutputInputDoNotMatchError
+
+
+def create_steps(return_type: type):
+    def add(x: int, y: int) -> int:
+        return x + y
+
+    def to_list(x: int) -> List[int]:
+        return [x]
+
+    def first(values: List[int]) -> int:
+        return values[0]
+
+    first.__annotations__ = {"values": return_type, "return": int}
+    return [add, to_list, first]
+
+
+def fail_composition(*args):
+    raise AssertionError("The types of the steps should not be compared")
+
+
+def test_pipeline_stores_checked_steps(tmp_path):
+    # Prepare
+    path = tmp_path / "checks.jsonl"
+
+    # Act
+    pipe = pipeline(*create_steps(List[int]), check_cache=path)
+
+    # Compare
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert pipe(1, 2) == 3
+    assert len(entries) == 1
+    assert entries[0]["pipeline"].endswith("create_steps.<locals>.first")
+
+
+def test_unchanged_steps_are_not_compared_after_restart(tmp_path, monkeypatch):
+    # Prepare
+    path = tmp_path / "checks.jsonl"
+    compile_plan(create_steps(List[int]), CheckCache(path))
+    monkeypatch.setattr(_plan, "check_composition", fail_composition)
+
+    # Act
+    plan = compile_plan(create_steps(List[int]), CheckCache(path))
+
+    # Compare
+    assert plan(1, 2) == 3
+
+
+def test_changed_steps_are_checked_again(tmp_path):
+    # Prepare
+    path = tmp_path / "checks.jsonl"
+    compile_plan(create_steps(List[int]), CheckCache(path))
+
+    # Act
+    with pytest.raises(OutputInputDoNotMatchError):
+        compile_plan(create_steps(List[str]), CheckCache(path))
+    compile_plan(create_steps(Iterable[int]), CheckCache(path))
+
+    # Compare
+    cache = CheckCache(path)
+    assert cache.is_checked(cache.fingerprint(create_steps(Iterable[int])))
+    assert not cache.is_checked(cache.fingerprint(create_steps(List[str])))
+
+
+def test_pipelines_with_the_same_step_names_keep_their_own_entries(tmp_path):
+    # Prepare
+    path = tmp_path / "checks.jsonl"
+    return_types = [List[int], Iterable[int], Optional[List[int]], Union[List[int], str], List[Any]]
+    cache = CheckCache(path)
+
+    # Act
+    for return_type in return_types:
+        compile_plan(create_steps(return_type), cache)
+
+    # Compare
+    restarted = CheckCache(path)
+    assert len(restarted._entries) == FINGERPRINTS_PER_PIPELINE
+    assert not restarted.is_checked(restarted.fingerprint(create_steps(return_types[0])))
+    for return_type in return_types[1:]:
+        assert restarted.is_checked(restarted.fingerprint(create_steps(return_type)))
+
+
+def test_check_cache_skips_broken_lines(tmp_path):
+    # Prepare
+    path = tmp_path / "checks.jsonl"
+    compile_plan(create_steps(List[int]), CheckCache(path))
+    with open(path, "a") as cache_file:
+        cache_file.write('{"pipeline": "interrupted wri')
+
+    # Act
+    cache = CheckCache(path)
+
+    # Compare
+    assert cache.is_checked(cache.fingerprint(create_steps(List[int])))
+
+
+def test_fingerprints_follow_changed_annotations_of_the_same_steps(tmp_path):
+    # Prepare
+    cache = CheckCache(tmp_path / "checks.jsonl")
+    steps = create_steps(List[int])
+    fingerprint = cache.fingerprint(steps)
+
+    # Act
+    steps[-1].__annotations__ = {"values": Iterable[int], "return": int}
+
+    # Compare
+    assert cache.fingerprint(steps) != fingerprint
+    assert cache.fingerprint(create_steps(Iterable[int])) == cache.fingerprint(steps)
+
+
+def create_class():
+    class Value:
+        pass
+
+    return Value
+
+
+def test_steps_annotated_with_classes_defined_in_functions_are_always_checked(tmp_path):
+    # Prepare
+    cache = CheckCache(tmp_path / "checks.jsonl")
+    first_class, second_class = create_class(), create_class()
+
+    def identity(value: first_class) -> first_class:  # type: ignore
+        return value
+
+    def other_identity(value: second_class) -> second_class:  # type: ignore
+        return value
+
+    other_identity.__qualname__ = identity.__qualname__
+    other_identity.__code__ = identity.__code__
+
+    # Act
+    compile_plan([identity], cache)
+
+    # Compare
+    assert cache.fingerprint([identity]) is None
+    assert cache.fingerprint([other_identity]) is None
+    assert len(cache._entries) == 0
+
+
+def test_compaction_keeps_entries_appended_by_other_processes(tmp_path, monkeypatch):
+    # Prepare
+    path = tmp_path / "checks.jsonl"
+    compile_plan(create_steps(List[int]), CheckCache(path))
+    path.write_text(path.read_text() * 3)
+    appended = json.dumps({"pipeline": "other", "fingerprint": "appended", "type_vars": []}) + "\n"
+    create_temporary_file = tempfile.mkstemp
+
+    def append_while_compacting(*args, **kwargs):
+        with open(path, "a") as cache_file:
+            cache_file.write(appended)
+        return create_temporary_file(*args, **kwargs)
+
+    monkeypatch.setattr(tempfile, "mkstemp", append_while_compacting)
+
+    # Act
+    CheckCache(path)
+
+    # Compare
+    assert path.read_text().endswith(appended)
+    assert CheckCache(path).is_checked("appended")
+    assert not list(tmp_path.glob("*.tmp"))
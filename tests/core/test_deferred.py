@@ -0,0 +1,108 @@
+import threading
+from typing import List
+
+import pytest
+
+from pypely import pipeline
+from pypely.core.errors import OutputInputDoNotMatchError, ReturnTypeAnnotationMissingError
+
+
+def add(x: int, y: int) -> int:
+    return x + y
+
+
+def double(x: int) -> int:
+    return x * 2
+
+
+def to_list(x: int) -> List[int]:
+    return [x]
+
+
+def add_without_return_type(x: int, y: int):
+    return x + y
+
+
+@pytest.mark.parametrize("check", ["eager", "lazy", "background"])
+def test_pipeline_with_deferred_checks_works(check):
+    # Prepare
+    pipe = pipeline(add, double, check=check)
+
+    # Act
+    output = pipe(1, 2)
+
+    # Compare
+    assert output == 6
+    assert pipe.validate().result() is None
+    assert list(pipe.stream([(1, 2), (3, 4)])) == [6, 14]
+
+
+@pytest.mark.parametrize("check", ["lazy", "background"])
+def test_deferred_checks_raise_the_same_errors_when_the_pipeline_is_used(check):
+    # Prepare
+    pipe = pipeline(add, to_list, double, check=check)
+
+    # Act
+    # Compare
+    with pytest.raises(OutputInputDoNotMatchError):
+        pipe(1, 2)
+    with pytest.raises(OutputInputDoNotMatchError):
+        pipe(1, 2)
+    with pytest.raises(OutputInputDoNotMatchError):
+        pipe.validate().result()
+
+
+def test_background_checks_raise_a_new_error_on_each_use():
+    # Prepare
+    pipe = pipeline(add, to_list, double, check="background")
+
+    # Act
+    errors = []
+    for _ in range(3):
+        with pytest.raises(OutputInputDoNotMatchError) as error:
+            pipe(1, 2)
+        errors.append(error.value)
+
+    # Compare
+    assert len({id(error) for error in errors}) == 3
+    assert len({id(error.__cause__) for error in errors}) == 1
+    assert str(errors[0]) == str(errors[0].__cause__)
+    assert pipe.validate().exception().__cause__ is errors[0].__cause__
+
+
+def test_lazy_checks_report_missing_annotations():
+    # Prepare
+    pipe = pipeline(add_without_return_type, double, check="lazy")
+
+    # Act
+    error = pipe.validate().exception()
+
+    # Compare
+    assert isinstance(error, ReturnTypeAnnotationMissingError)
+
+
+def test_background_checks_report_errors_to_callback():
+    # Prepare
+    errors = []
+    reported = threading.Event()
+
+    def on_check_error(error: Exception) -> None:
+        errors.append(error)
+        reported.set()
+
+    # Act
+    pipeline(add, to_list, double, check="background", on_check_error=on_check_error)
+    reported.wait(timeout=10)
+
+    # Compare
+    assert len(errors) == 1
+    assert isinstance(errors[0], OutputInputDoNotMatchError)
+
+
+def test_pipeline_rejects_unknown_check_modes():
+    # Act
+    # Compare
+    with pytest.raises(ValueError):
+        pipeline(add, double, check="never")
+    with pytest.raises(ValueError):
+        pipeline(add, double, check="lazy", on_check_error=print)
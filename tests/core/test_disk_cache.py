@@ -0,0 +1,223 @@
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from pypely import disk_cached, pipeline
+from pypely._internal.fingerprint import code_fingerprint
+from pypely.core._disk_cache import CODE_CHANGED, NEW_INPUT, NOT_STORED, DiskCache
+from pypely.memory import memorizable
+
+
+def count_calls(calls: List[List[int]]):
+    def _total(values: List[int]) -> int:
+        calls.append(values)
+        return sum(values)
+
+    return _total
+
+
+def multiply_by(factor: int):
+    def _multiply(x: int) -> int:
+        return x * factor
+
+    return _multiply
+
+
+def use_lock(lock: threading.Lock):
+    def _locked(x: int) -> int:
+        with lock:
+            return x
+
+    return _locked
+
+
+def double(x: int) -> int:
+    return x * 2
+
+
+@memorizable
+def scale(x: int, factor: int) -> int:
+    return x * factor
+
+
+def triple(x: int) -> int:
+    return x * 3
+
+
+def test_disk_cached_step_loads_stored_outputs(tmp_path: Path):
+    # Prepare
+    calls: List[List[int]] = []
+    func = count_calls(calls)
+    first_run = disk_cached(func, tmp_path, track_dependencies=False)
+    second_run = disk_cached(func, tmp_path, track_dependencies=False)
+
+    # Act
+    first = first_run([1, 2, 3])
+    second = second_run([1, 2, 3])
+
+    # Compare
+    assert first == second == 6
+    assert calls == [[1, 2, 3]]
+    assert second_run.cache_info().hits == 1
+    assert second_run.cache_info().entries == 1
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_disk_cached_steps_in_pipeline_keep_annotations(tmp_path: Path):
+    # Prepare
+    to_test = pipeline(
+        disk_cached(double, tmp_path, track_dependencies=False),
+        disk_cached(triple, tmp_path, track_dependencies=False),
+    )
+
+    # Act
+    results = [to_test(2), to_test(2)]
+
+    # Compare
+    assert results == [12, 12]
+    assert to_test.__annotations__ == {"x": int, "return": int}
+
+
+def test_disk_cached_reports_why_a_step_missed(tmp_path: Path):
+    # Prepare
+    step = disk_cached(double, tmp_path, track_dependencies=False)
+
+    # Act
+    step(1)
+    step(2)
+    cache = DiskCache(double, tmp_path, None, track_dependencies=False)
+    cache.code_fingerprint = "changed"
+    cache.call(double, (1,), {})
+
+    # Compare
+    assert [miss.reason for miss in step.cache_misses()] == [NOT_STORED, NEW_INPUT]
+    assert [miss.reason for miss in cache.misses()] == [CODE_CHANGED]
+
+
+def test_disk_cached_evicts_least_recently_used_files(tmp_path: Path):
+    # Prepare
+    step = disk_cached(double, tmp_path, track_dependencies=False)
+    step(1)
+    size = step.cache_info().bytes
+    step_directory = next(tmp_path.iterdir())
+    oldest = next(step_directory.iterdir())
+    os.utime(oldest, (0, 0))
+
+    to_test = disk_cached(double, tmp_path, max_bytes=size, track_dependencies=False)
+
+    # Act
+    to_test(2)
+
+    # Compare
+    assert not oldest.exists()
+    assert to_test.cache_info().evictions == 1
+    assert to_test.cache_info().entries == 1
+
+
+def test_cache_clear_removes_stored_outputs(tmp_path: Path):
+    # Prepare
+    calls: List[List[int]] = []
+    step = disk_cached(count_calls(calls), tmp_path, track_dependencies=False)
+    step([1])
+
+    # Act
+    step.cache_clear()
+    step([1])
+
+    # Compare
+    assert len(calls) == 2
+
+
+def test_code_fingerprint_depends_on_code():
+    # Prepare
+    # Act
+    # Compare
+    assert code_fingerprint(double, track_dependencies=False) == code_fingerprint(double, track_dependencies=False)
+    assert code_fingerprint(double, track_dependencies=False) != code_fingerprint(triple, track_dependencies=False)
+
+
+def test_disk_cached_steps_of_the_same_factory_keep_their_outputs_apart(tmp_path: Path):
+    # Prepare
+    double_cached = disk_cached(multiply_by(2), tmp_path, track_dependencies=False)
+    triple_cached = disk_cached(multiply_by(3), tmp_path, track_dependencies=False)
+
+    # Act
+    outputs = [double_cached(5), triple_cached(5)]
+
+    # Compare
+    assert outputs == [10, 15]
+    assert triple_cached.cache_info().hits == 0
+
+
+def test_code_fingerprint_depends_on_defaults_and_callable_objects():
+    # Prepare
+    def add(x: int, y: int = 1) -> int:
+        return x + y
+
+    def add_two(x: int, y: int = 2) -> int:
+        return x + y
+
+    add_two.__code__ = add.__code__
+
+    # Act
+    # Compare
+    assert code_fingerprint(add, track_dependencies=False) != code_fingerprint(add_two, track_dependencies=False)
+    assert code_fingerprint(Path("a").joinpath, False) != code_fingerprint(Path("b").joinpath, False)
+
+
+def test_disk_cached_refuses_steps_whose_closure_can_not_be_pickled(tmp_path: Path):
+    # Act
+    # Compare
+    with pytest.raises(ValueError):
+        disk_cached(use_lock(threading.Lock()), tmp_path, track_dependencies=False)
+
+
+def test_disk_cached_keeps_the_memory_entries_of_memorizable_steps(tmp_path: Path):
+    # Prepare
+    scaled = disk_cached(scale << "disk_factor", tmp_path, track_dependencies=False) >> "disk_scaled"
+    to_test = pipeline(memorizable(double) >> "disk_factor", scaled, scale << "disk_scaled")
+
+    # Act
+    outputs = [to_test(1), to_test(1), to_test(2)]
+
+    # Compare
+    assert outputs == [16, 16, 256]
+    assert scaled.cache_info().hits == 1
+    assert scaled.cache_info().misses == 2
+
+
+def test_code_fingerprint_describes_memorizable_steps_by_their_function_and_entries():
+    # Prepare
+    # Act
+    # Compare
+    assert code_fingerprint(scale, False) == code_fingerprint(scale, False)
+    assert code_fingerprint(scale, False) != code_fingerprint(scale << "disk_factor", False)
+    assert code_fingerprint(scale << "disk_factor", False) != code_fingerprint(scale << "disk_other_factor", False)
+
+
+def test_input_fingerprint_of_sets_does_not_depend_on_the_hash_seed():
+    # Prepare
+    script = (
+        "from pypely.core._disk_cache import _input_fingerprint;"
+        "print(_input_fingerprint(({'a', 'b', 'c', 'd', frozenset({'e', 'f'})},), {}))"
+    )
+
+    # Act
+    fingerprints = {
+        subprocess.run(
+            [sys.executable, "-c", script],
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        for seed in ("1", "2", "3")
+    }
+
+    # Compare
+    assert len(fingerprints) == 1
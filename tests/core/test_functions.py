@@ -1,3 +1,4 @@
+import sys
 from dataclasses import dataclass
 from typing import Callable, Iterable, List, Optional, Tuple, TypeVar
 
@@ -385,3 +386,69 @@ def test_flatten_can_handle_multiple_levels():
 
     # Compare
     assert to_test == PypelyTuple(1, 2, 3, 4, 5, 6, 7, 8, 9, 10)
+
+
+def test_pipeline_with_many_steps_does_not_hit_recursion_limit():
+    # Prepare
+    def increment(x: int) -> int:
+        return x + 1
+
+    steps = [increment] * (sys.getrecursionlimit() * 2)
+    to_test = pipeline(*steps)
+
+    # Act
+    result = to_test(0)
+
+    # Compare
+    assert result == len(steps)
+
+
+def test_pipeline_unpacks_only_plain_tuples():
+    # Prepare
+    def pair(x: int) -> Tuple[int, int]:
+        return (x, x)
+
+    def to_pypely_tuple(x: int, y: int) -> PypelyTuple:
+        return PypelyTuple(x, y)
+
+    def count(values: PypelyTuple) -> int:
+        return len(values)
+
+    to_test = pipeline(pair, to_pypely_tuple, count)
+
+    # Act
+    result = to_test(1)
+
+    # Compare
+    assert result == 2
+
+
+def test_pipeline_step_error_names_the_failing_step():
+    # Prepare
+    def i_fail(val: float) -> float:
+        raise RuntimeError("I have to fail")
+
+    to_test = pipeline(add, multiply_by(2), i_fail, multiply_by(3))
+
+    # Act
+    with pytest.raises(PipelineStepError) as error:
+        to_test(1, 2)
+
+    # Compare
+    assert str(error.value) == str(PipelineStepError(i_fail, RuntimeError("I have to fail")))
+    assert isinstance(error.value.__context__, RuntimeError)
+
+
+def test_pipeline_step_error_names_the_first_step():
+    # Prepare
+    def i_fail() -> float:
+        raise RuntimeError("I have to fail")
+
+    to_test = pipeline(i_fail, multiply_by(3))
+
+    # Act
+    with pytest.raises(PipelineStepError) as error:
+        to_test()
+
+    # Compare
+    assert "'i_fail'" in str(error.value)
@@ -0,0 +1,384 @@
+import os
+import threading
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Tuple
+
+import pytest
+
+from pypely import fork, merge, pipeline
+from pypely._types import PypelyTuple
+from pypely.core import _readonly
+from pypely.core.errors import BranchRunsInCallingProcessWarning, PipelineStepError
+from pypely.memory import MemoryEntry, SharedMemoryBackend, memorizable
+
+
+def add(x: float, y: float) -> float:
+    return x + y
+
+
+def multiply_by(x: float) -> Callable[[float], float]:
+    def _multiply_by(val: float) -> float:
+        return val * x
+
+    return _multiply_by
+
+
+def wait_for_siblings(barrier: threading.Barrier) -> Callable[[float], float]:
+    def _wait_for_siblings(val: float) -> float:
+        barrier.wait()
+        return val
+
+    return _wait_for_siblings
+
+
+def test_fork_runs_branches_concurrently():
+    # Prepare
+    barrier = threading.Barrier(3, timeout=5)
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        to_test = pipeline(
+            add,
+            fork(
+                wait_for_siblings(barrier),
+                wait_for_siblings(barrier),
+                wait_for_siblings(barrier),
+                executor=executor,
+            ),
+            merge(lambda x, y, z: x + y + z),
+        )
+
+        # Act
+        result = to_test(1, 2)
+
+    # Compare
+    assert result == 9
+
+
+def test_fork_keeps_order_of_branches():
+    # Prepare
+    def slow(val: float) -> float:
+        threading.Event().wait(0.05)
+        return val
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        to_test = pipeline(add, fork(slow, multiply_by(2), executor=executor))
+
+        # Act
+        result = to_test(1, 2)
+
+    # Compare
+    assert result == (3, 6)
+
+
+def test_pipeline_sets_default_executor_for_all_forks():
+    # Prepare
+    barrier = threading.Barrier(2, timeout=5)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        to_test = pipeline(
+            add,
+            fork(wait_for_siblings(barrier), wait_for_siblings(barrier)),
+            merge(add),
+            executor=executor,
+        )
+
+        # Act
+        result = to_test(1, 2)
+
+    # Compare
+    assert result == 6
+
+
+def test_fork_raises_failure_of_first_failing_branch():
+    # Prepare
+    def first_failure(val: float) -> float:
+        raise RuntimeError("first failure")
+
+    def second_failure(val: float) -> float:
+        raise RuntimeError("second failure")
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        to_test = pipeline(add, fork(multiply_by(2), first_failure, second_failure, executor=executor))
+
+        # Act
+        with pytest.raises(PipelineStepError) as error:
+            to_test(1, 2)
+
+    # Compare
+    assert "'first_failure'" in str(error.value)
+
+
+def test_fork_branches_share_memory_of_pipeline():
+    # Prepare
+    _add = memorizable(add)
+    doubled = MemoryEntry()
+    tripled = MemoryEntry()
+
+    @memorizable
+    def add_first(x: float, y: float) -> float:
+        return x + y
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        to_test = pipeline(
+            add,
+            fork(
+                memorizable(multiply_by(2)) >> doubled,
+                memorizable(multiply_by(3)) >> tripled,
+                executor=executor,
+            ),
+            merge(add),
+            _add << doubled,
+            add_first << tripled,
+        )
+
+        # Act
+        result = [to_test(1, 2) for _ in range(3)]
+
+    # Compare
+    assert result == [30, 30, 30]
+
+
+def test_fork_branches_with_sub_pipelines_use_their_own_memory():
+    # Prepare
+    _add = memorizable(add)
+
+    def inner(factor: float) -> Callable[[float], float]:
+        product = MemoryEntry()
+        return pipeline(memorizable(multiply_by(factor)) >> product, _add << product)
+
+    barrier = threading.Barrier(2, timeout=5)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        to_test = pipeline(
+            add,
+            fork(
+                pipeline(wait_for_siblings(barrier), inner(2)),
+                pipeline(wait_for_siblings(barrier), inner(3)),
+                executor=executor,
+            ),
+        )
+
+        # Act
+        result = to_test(1, 2)
+
+    # Compare
+    assert result == (12, 18)
+
+
+def test_nested_fork_on_same_executor_does_not_deadlock():
+    # Prepare
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        to_test = pipeline(
+            add,
+            fork(
+                pipeline(fork(multiply_by(2), multiply_by(3)), merge(add)),
+                multiply_by(4),
+            ),
+            executor=executor,
+        )
+
+        # Act
+        result = to_test(1, 2)
+
+    # Compare
+    assert result == (15, 12)
+
+
+def process_id(val: float) -> int:
+    return os.getpid()
+
+
+def square(val: float) -> float:
+    return val * val
+
+
+def pair(val: float) -> PypelyTuple:
+    return PypelyTuple(val, val)
+
+
+def fail_in_process(val: float) -> float:
+    raise RuntimeError("failed in worker process")
+
+
+def test_fork_runs_branches_in_worker_processes():
+    # Prepare
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        to_test = pipeline(add, fork(square, process_id, process_id, executor=executor))
+
+        # Act
+        results = [to_test(1, 2) for _ in range(3)]
+
+    # Compare
+    assert all(result[0] == 9 for result in results)
+    process_ids = {pid for result in results for pid in result[1:]}
+    assert os.getpid() not in process_ids
+    assert len(process_ids) <= 2
+
+
+def test_fork_runs_unpicklable_branches_in_calling_process():
+    # Prepare
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        with pytest.warns(BranchRunsInCallingProcessWarning) as warnings:
+            to_test = pipeline(
+                add,
+                fork(process_id, lambda val: os.getpid(), memorizable(square) >> MemoryEntry(), executor=executor),
+            )
+
+        # Act
+        result = to_test(1, 2)
+
+    # Compare
+    assert len(warnings) == 2
+    assert result[0] != os.getpid()
+    assert result[1:] == (os.getpid(), 9)
+
+
+def sum_in_process(values: Any, offset: float) -> Tuple[float, bool, int]:
+    return float(values.sum()) + offset, values.flags.writeable, os.getpid()
+
+
+def test_fork_sends_ingested_memory_entries_to_worker_processes():
+    # Prepare
+    numpy = pytest.importorskip("numpy")
+
+    def create_values(val: float) -> Any:
+        return numpy.arange(100, dtype=float) * val
+
+    def offset(values: Any) -> float:
+        return 1.0
+
+    values = MemoryEntry()
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", BranchRunsInCallingProcessWarning)
+            to_test = pipeline(
+                memorizable(create_values) >> values,
+                offset,
+                fork(process_id, values >> memorizable(sum_in_process), executor=executor),
+                memory_backend=SharedMemoryBackend(),
+            )
+
+        # Act
+        result = to_test(1)
+
+    # Compare
+    total, writeable, process = result[1]
+    assert total == 4951.0
+    assert not writeable  # a view of the shared memory segment
+    assert process != os.getpid()
+
+
+@memorizable
+def add_in_process(val: float, offset: float) -> Tuple[float, int]:
+    return val + offset, os.getpid()
+
+
+def test_fork_sends_branches_decorated_with_memorizable_to_worker_processes():
+    # Prepare
+    offset = MemoryEntry()
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", BranchRunsInCallingProcessWarning)
+            to_test = pipeline(
+                memorizable(add) >> offset,
+                fork(process_id, add_in_process << offset, executor=executor),
+            )
+
+        # Act
+        result = to_test(1, 2)
+
+    # Compare
+    total, process = result[1]
+    assert total == 6
+    assert process != os.getpid()
+
+
+def test_fork_raises_failure_of_worker_process():
+    # Prepare
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        to_test = pipeline(add, fork(square, fail_in_process, executor=executor))
+
+        # Act
+        with pytest.raises(PipelineStepError) as error:
+            to_test(1, 2)
+
+    # Compare
+    assert "'fail_in_process'" in str(error.value)
+
+
+def test_pypely_tuples_and_memorizables_are_sent_to_worker_processes():
+    # Prepare
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        to_test = pipeline(add, fork(pair, memorizable(square), executor=executor))
+
+        # Act
+        result = to_test(1, 2)
+
+    # Compare
+    assert result == (PypelyTuple(3, 3), 9)
+    assert type(result[0]) == PypelyTuple
+
+
+def test_fork_shares_arrays_readonly():
+    # Prepare
+    numpy = pytest.importorskip("numpy")
+
+    def modify(values: numpy.ndarray) -> float:
+        values[0] = 100.0
+        return float(values.sum())
+
+    def total(values: numpy.ndarray) -> float:
+        return float(values.sum())
+
+    values = numpy.ones(10)
+
+    # Act
+    with pytest.raises(PipelineStepError, match="read-only"):
+        pipeline(fork(total, modify, share="readonly"), merge(add))(values)
+    result = pipeline(fork(total, total, share="readonly", executor=ThreadPoolExecutor(2)), merge(add))(values)
+
+    # Compare
+    assert result == 20.0
+    assert values.flags.writeable
+    assert values[0] == 1.0
+
+
+def test_fork_shares_data_frames_copy_on_write():
+    # Prepare
+    pandas = pytest.importorskip("pandas")
+    numpy = pytest.importorskip("numpy")
+    frame = pandas.DataFrame({"a": [1.0] * 10})
+
+    def modify(frame: pandas.DataFrame) -> float:
+        frame.loc[0, "a"] = 100.0
+        return float(frame["a"].sum())
+
+    def shares_data(branch_frame: pandas.DataFrame) -> bool:
+        return numpy.shares_memory(branch_frame["a"].to_numpy(), frame["a"].to_numpy())
+
+    # Act
+    result = pipeline(fork(modify, shares_data, share="readonly"), merge(lambda x, y: (x, y)))(frame)
+
+    # Compare
+    assert result == (109.0, True)
+    assert frame.loc[0, "a"] == 1.0
+
+
+def test_fork_refuses_to_share_data_frames_without_copy_on_write(monkeypatch: pytest.MonkeyPatch):
+    # Prepare
+    pandas = pytest.importorskip("pandas")
+    monkeypatch.setattr(_readonly, "_copy_on_write", lambda: False)
+
+    def total(frame: pandas.DataFrame) -> float:
+        return float(frame["a"].sum())
+
+    # Act
+    # Compare
+    with pytest.raises(PipelineStepError, match="copy-on-write"):
+        pipeline(fork(total, total, share="readonly"), merge(add))(pandas.DataFrame({"a": [1.0] * 10}))
+
+
+def test_fork_rejects_unknown_share_modes():
+    with pytest.raises(ValueError):
+        fork(add, add, share="writeable")
@@ -0,0 +1,31 @@
+from typing import Any, Iterable, List, Optional, Tuple, TypeVar
+
+from pypely._types import PypelyTuple
+from pypely.core._plan import DYNAMIC, NO_ARGUMENT, SINGLE, UNPACK, _dispatch
+
+T = TypeVar("T")
+
+
+def test_dispatch_is_decided_by_return_annotation():
+    # Prepare
+    test_cases = [
+        (int, SINGLE),
+        (List[int], SINGLE),
+        (PypelyTuple, SINGLE),
+        (tuple, UNPACK),
+        (Tuple[int, str], UNPACK),
+        (tuple[int, ...], UNPACK),
+        (None, NO_ARGUMENT),
+        (type(None), NO_ARGUMENT),
+        (Any, DYNAMIC),
+        (T, DYNAMIC),
+        (object, DYNAMIC),
+        (Iterable[int], DYNAMIC),
+        (Optional[int], DYNAMIC),
+        ("int", DYNAMIC),
+    ]
+
+    # Act
+    # Compare
+    for return_type, expected in test_cases:
+        assert _dispatch(return_type) == expected
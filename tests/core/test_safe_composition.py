@@ -1,9 +1,10 @@
-from typing import TypeVar
+from typing import List, TypeVar
 
 import pytest
 
-from pypely._types import PypelyError
-from pypely.core._safe_composition import _resolve_type_var_usage, _track_type_var_usage, _wrap_with_error_handling
+from pypely import pipeline
+from pypely.core._safe_composition import _resolve_type_var_usage, _track_type_var_usage, check_composition
+from pypely.core.errors import OutputInputDoNotMatchError
 
 T = TypeVar("T")
 X = TypeVar("X")
@@ -11,13 +12,10 @@ X = TypeVar("X")
 
 def test_resolve_typevar_usage_resolves_type():
     # Prepare
-    def test_func(val: T) -> T:
-        return val
-
-    _track_type_var_usage(int, T, test_func)
+    usage = _track_type_var_usage(int, T, dict())
 
     # Act
-    to_test = _resolve_type_var_usage([T], test_func)
+    to_test = _resolve_type_var_usage([T], usage)
 
     # Compare
     assert to_test == [int]
@@ -25,24 +23,61 @@ def test_resolve_typevar_usage_resolves_type():
 
 def test_resolve_typevar_usage_returns_original_type():
     # Prepare
-    def test_func(val: T) -> T:
-        return val
-
-    _track_type_var_usage(int, X, test_func)
+    usage = _track_type_var_usage(int, X, dict())
 
     # Act
-    to_test = _resolve_type_var_usage([T], test_func)
+    to_test = _resolve_type_var_usage([T], usage)
 
     # Compare
     assert to_test == [T]
 
 
-def test_wrap_with_error_handling_forwards_PypelyError():
+def test_resolve_typevar_usage_does_not_change_generic_types():
+    # Prepare
+    list_of_t = List[T]
+    usage = _track_type_var_usage(List[int], List[T], dict())
+
+    # Act
+    to_test = _resolve_type_var_usage([list_of_t], usage)
+
+    # Compare
+    assert to_test == [List[int]]
+    assert list_of_t.__args__ == (T,)
+
+
+def test_check_composition_returns_the_type_var_usage_of_the_second_function():
+    # Prepare
+    def create(x: str) -> List[int]:
+        return [int(x)]
+
+    def first(values: List[T]) -> T:
+        return values[0]
+
+    # Act
+    usage = check_composition(create, first)
+
+    # Compare
+    assert usage == {T: int}
+    assert not hasattr(first, "_typevar_usage")
+
+
+def test_type_var_usage_does_not_leak_into_other_pipelines():
     # Prepare
-    def failing_function():
-        raise PypelyError("Test error")
+    def create_ints(x: str) -> List[int]:
+        return [int(x)]
 
-    wrapped_function = _wrap_with_error_handling(failing_function)
+    def first(values: List[T]) -> T:
+        return values[0]
 
-    with pytest.raises(PypelyError):
-        wrapped_function()
+    def use_str(x: str) -> str:
+        return x
+
+    pipeline(create_ints, first)
+
+    # Act
+    pipe = pipeline(first, use_str)
+
+    # Compare
+    assert pipe(["a"]) == "a"
+    with pytest.raises(OutputInputDoNotMatchError):
+        pipeline(create_ints, first, use_str)
@@ -0,0 +1,116 @@
+from typing import Iterator, Tuple
+
+import pytest
+
+from pypely import fork, merge, pipeline
+from pypely.core.errors import PipelineStepError
+from pypely.memory import MemoryEntry, memorizable
+
+
+def add(x: int, y: int) -> int:
+    return x + y
+
+
+def double(x: int) -> int:
+    return x * 2
+
+
+def test_stream_applies_pipeline_to_each_record():
+    # Prepare
+    to_test = pipeline(double, double)
+
+    # Act
+    result = to_test.stream(range(4))
+
+    # Compare
+    assert isinstance(result, Iterator)
+    assert list(result) == [0, 4, 8, 12]
+
+
+def test_stream_is_lazy():
+    # Prepare
+    consumed = []
+
+    def records() -> Iterator[int]:
+        for i in range(3):
+            consumed.append(i)
+            yield i
+
+    to_test = pipeline(double)
+
+    # Act
+    result = to_test.stream(records())
+    first = next(result)
+
+    # Compare
+    assert first == 0
+    assert consumed == [0]
+
+
+def test_stream_unpacks_records_for_multiple_parameters():
+    # Prepare
+    to_test = pipeline(add, double)
+
+    # Act
+    result = list(to_test.stream([(1, 2), (3, 4)]))
+
+    # Compare
+    assert result == [6, 14]
+
+
+def test_stream_keeps_tuple_records_for_a_single_parameter():
+    # Prepare
+    def first(pair: Tuple[int, int]) -> int:
+        return pair[0]
+
+    to_test = pipeline(first, double)
+
+    # Act
+    result = list(to_test.stream([(1, 2), (3, 4)]))
+
+    # Compare
+    assert result == [2, 6]
+
+
+def test_stream_uses_an_empty_memory_for_each_record():
+    # Prepare
+    entry = MemoryEntry()
+    to_test = pipeline(
+        memorizable(double) >> entry,
+        double,
+        entry >> memorizable(add),
+    )
+
+    # Act
+    result = list(to_test.stream(range(3)))
+
+    # Compare
+    assert result == [0, 6, 12]
+
+
+def test_stream_supports_fork_and_merge():
+    # Prepare
+    to_test = pipeline(
+        double,
+        fork(double, double),
+        merge(add),
+    )
+
+    # Act
+    result = list(to_test.stream(range(3)))
+
+    # Compare
+    assert result == [0, 8, 16]
+
+
+def test_stream_raises_step_errors():
+    # Prepare
+    def fail(x: int) -> int:
+        raise ValueError(x)
+
+    to_test = pipeline(double, fail)
+
+    # Act
+    # Compare
+    with pytest.raises(PipelineStepError):
+        list(to_test.stream(range(3)))
@@ -0,0 +1,169 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+import pytest
+
+from pypely import async_pipeline, batched, fork, merge, pipeline
+from pypely.core.errors import PipelineStepError
+from pypely.hooks import StepEvent, StepHook, add_hook, remove_hook
+
+
+class RecordingHook(StepHook):
+    def __init__(self, measure_sizes: bool = False) -> None:
+        self.measure_sizes = measure_sizes
+        self.started: List[StepEvent] = []
+        self.ended: List[StepEvent] = []
+        self.failed: List[Tuple[StepEvent, Exception]] = []
+
+    def on_step_start(self, event: StepEvent) -> None:
+        self.started.append(event)
+
+    def on_step_end(self, event: StepEvent) -> None:
+        self.ended.append(event)
+
+    def on_step_error(self, event: StepEvent, error: Exception) -> None:
+        self.failed.append((event, error))
+
+
+@pytest.fixture
+def hook():
+    _hook = RecordingHook()
+    add_hook(_hook)
+    yield _hook
+    remove_hook(_hook)
+
+
+def double(x: int) -> int:
+    return x * 2
+
+
+def add(x: int, y: int) -> int:
+    return x + y
+
+
+def fail(x: int) -> int:
+    raise ValueError(x)
+
+
+async def increment(x: int) -> int:
+    return x + 1
+
+
+def double_all(values: List[int]) -> List[int]:
+    return [value * 2 for value in values]
+
+
+def test_hooks_are_notified_around_each_step(hook: RecordingHook):
+    # Prepare
+    to_test = pipeline(add, double)
+
+    # Act
+    result = to_test(1, 2)
+
+    # Compare
+    assert result == 6
+    assert [event.path for event in hook.started] == [("add",), ("double",)]
+    assert [event.path for event in hook.ended] == [("add",), ("double",)]
+    assert all(event.wall_time is not None and event.cpu_time is not None for event in hook.ended)
+    assert "'double' from File" in hook.ended[1].step
+
+
+def test_hooks_report_nesting_path(hook: RecordingHook):
+    # Prepare
+    to_test = pipeline(double, pipeline(double, double), fork(double, double), merge(add))
+
+    # Act
+    to_test(1)
+
+    # Compare
+    paths = [event.path for event in hook.ended]
+    assert ("_call", "double") in paths
+    assert ("_fork", "double") in paths
+    assert len(paths) == 8
+
+
+def test_hooks_report_fork_branches_on_threads(hook: RecordingHook):
+    # Prepare
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        to_test = pipeline(double, fork(double, double, executor=executor), merge(add))
+
+        # Act
+        to_test(1)
+
+    # Compare
+    assert [event.path for event in hook.ended].count(("_fork", "double")) == 2
+
+
+def test_hooks_are_notified_about_errors(hook: RecordingHook):
+    # Prepare
+    to_test = pipeline(double, fail)
+
+    # Act
+    with pytest.raises(PipelineStepError):
+        to_test(1)
+
+    # Compare
+    assert len(hook.failed) == 1
+    event, error = hook.failed[0]
+    assert event.path == ("fail",)
+    assert isinstance(error, ValueError)
+
+
+def test_hooks_measure_sizes_on_request():
+    # Prepare
+    hook = RecordingHook(measure_sizes=True)
+    to_test = pipeline(double)
+
+    # Act
+    add_hook(hook)
+    try:
+        to_test(1)
+    finally:
+        remove_hook(hook)
+
+    # Compare
+    assert hook.ended[0].input_size is not None
+    assert hook.ended[0].output_size is not None
+
+
+def test_removed_hooks_are_not_notified():
+    # Prepare
+    hook = RecordingHook()
+    add_hook(hook)
+    remove_hook(hook)
+
+    # Act
+    pipeline(double)(1)
+
+    # Compare
+    assert hook.started == []
+
+
+def test_hooks_are_notified_around_each_step_of_async_pipelines(hook: RecordingHook):
+    # Prepare
+    to_test = async_pipeline(add, increment, double)
+
+    # Act
+    result = asyncio.run(to_test(1, 2))
+
+    # Compare
+    assert result == 8
+    assert [event.path for event in hook.ended] == [("add",), ("increment",), ("double",)]
+    assert hook.ended[1].cpu_time is None
+    assert hook.ended[2].cpu_time is not None
+
+
+def test_hooks_are_notified_around_each_step_of_batched_streams(hook: RecordingHook):
+    # Prepare
+    to_test = pipeline(double, batched(double_all, size=2))
+
+    # Act
+    results = list(to_test.stream([1, 2, 3]))
+
+    # Compare
+    assert results == [4, 8, 12]
+    assert [event.path for event in hook.ended] == [("double",)] * 2 + [("double_all",)] + [
+        ("double",),
+        ("double_all",),
+    ]
@@ -0,0 +1,68 @@
+import sys
+from typing import List
+
+from pypely import pipeline
+from pypely.memory import MemoryEntry, MemoryReport, memorizable
+from pypely.memory._accounting import deep_size_of
+
+
+def create_values(x: int) -> List[int]:
+    return list(range(x))
+
+
+def count(values: List[int]) -> int:
+    return len(values)
+
+
+def add_length(values: List[int], x: int) -> int:
+    return len(values) + x
+
+
+def test_deep_size_of_includes_contained_objects():
+    # Prepare
+    values = [str(i) * 10 for i in range(10)]
+
+    # Act
+    size = deep_size_of({"values": values, "same_values": values})
+
+    # Compare
+    expected = (
+        sys.getsizeof({"values": values, "same_values": values})
+        + sys.getsizeof("values")
+        + sys.getsizeof("same_values")
+        + sys.getsizeof(values)
+        + sum(sys.getsizeof(value) for value in values)
+    )
+    assert size == expected
+
+
+def test_with_memory_report_measures_entries_and_steps():
+    # Prepare
+    values = MemoryEntry()
+    pipe = pipeline(memorizable(create_values) >> values, count, values >> memorizable(add_length))
+
+    # Act
+    output, report = pipe.with_memory_report(100)
+
+    # Compare
+    values_size = deep_size_of(list(range(100)))
+    assert output == 200
+    assert isinstance(report, MemoryReport)
+    assert report.entries == {values.id: values_size}
+    assert [size for _, size in report.steps] == [values_size, deep_size_of(100), deep_size_of(200)]
+    assert report.peak_entry_bytes == values_size
+    assert report.peak_live_bytes == values_size + deep_size_of(100)
+
+
+def test_with_memory_report_accounts_for_released_entries():
+    # Prepare
+    values = MemoryEntry()
+    pipe = pipeline(memorizable(create_values) >> values, count, create_values, count)
+
+    # Act
+    output, report = pipe.with_memory_report(100)
+
+    # Compare
+    assert output == 100
+    assert report.peak_entry_bytes == deep_size_of(list(range(100)))
+    assert report.peak_live_bytes == deep_size_of(list(range(100)))
@@ -0,0 +1,251 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from pypely import pipeline
+from pypely.memory import MemoryEntry, SharedMemoryBackend, SpillToDisk, memorizable
+from pypely.memory._backends import _MAPPINGS, Shared, Spilled
+from pypely.memory._impl import PipelineMemory, slot_of
+
+
+def create_values(x: int) -> List[int]:
+    return list(range(x))
+
+
+def count(values: List[int]) -> int:
+    return len(values)
+
+
+def add_length(values: List[int], x: int) -> int:
+    return len(values) + x
+
+
+def test_spill_to_disk_keeps_small_values_in_memory(tmp_path: Path):
+    # Prepare
+    backend = SpillToDisk(threshold=10_000, directory=tmp_path)
+
+    # Act
+    stored = backend.store([1, 2, 3])
+
+    # Compare
+    assert stored == [1, 2, 3]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_spill_to_disk_writes_large_values_to_disk(tmp_path: Path):
+    # Prepare
+    backend = SpillToDisk(threshold=10, directory=tmp_path)
+    memory = PipelineMemory(backend)
+    slot = slot_of("spill_test_entry")
+
+    # Act
+    memory.add_slot(slot.index, list(range(100)))
+
+    # Compare
+    assert isinstance(memory.values[slot.index], Spilled)
+    assert memory.get_slot(slot.index) == list(range(100))
+    memory.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_spill_to_disk_writes_arrays_as_npy(tmp_path: Path):
+    # Prepare
+    numpy = pytest.importorskip("numpy")
+    backend = SpillToDisk(threshold=10, directory=tmp_path)
+
+    # Act
+    stored = backend.store(numpy.arange(100))
+
+    # Compare
+    assert stored.path.suffix == ".npy"
+    assert (stored.load() == numpy.arange(100)).all()
+
+
+def test_spill_to_disk_pickles_frames_that_arrow_can_not_convert(tmp_path: Path):
+    # Prepare
+    pandas = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+
+    def load() -> pandas.DataFrame:
+        return pandas.DataFrame({"a": [1, "x", 2.0]})
+
+    def use(df: pandas.DataFrame) -> int:
+        return len(df)
+
+    to_test = pipeline(memorizable(load) >> MemoryEntry(), use, memory_backend=SpillToDisk(0, tmp_path))
+
+    # Act
+    stored = SpillToDisk(threshold=0, directory=tmp_path).store(load())
+
+    # Compare
+    assert stored.path.suffix == ".pkl"
+    assert stored.load()["a"].tolist() == [1, "x", 2.0]
+    assert to_test() == 3
+
+
+def test_spill_to_disk_measures_the_values_of_containers(tmp_path: Path):
+    # Prepare
+    numpy = pytest.importorskip("numpy")
+    backend = SpillToDisk(threshold=1_000, directory=tmp_path)
+
+    # Act
+    stored = backend.store([numpy.zeros(1_000), numpy.zeros(1_000)])
+
+    # Compare
+    assert isinstance(stored, Spilled)
+
+
+def test_pipeline_uses_memory_backend(tmp_path: Path):
+    # Prepare
+    entry = MemoryEntry()
+    spilled_files: List[Path] = []
+
+    def look_into_scratch_directory(x: int) -> int:
+        spilled_files.extend(tmp_path.iterdir())
+        return x
+
+    to_test = pipeline(
+        memorizable(create_values) >> entry,
+        count,
+        look_into_scratch_directory,
+        entry >> memorizable(add_length),
+        memory_backend=SpillToDisk(threshold=10, directory=tmp_path),
+    )
+
+    # Act
+    result = to_test(100)
+
+    # Compare
+    assert result == 200
+    assert len(spilled_files) == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_memory_entry_uses_its_backend(tmp_path: Path):
+    # Prepare
+    entry = MemoryEntry(backend=SpillToDisk(threshold=10, directory=tmp_path))
+    spilled_files: List[Path] = []
+
+    def look_into_scratch_directory(x: int) -> int:
+        spilled_files.extend(tmp_path.iterdir())
+        return x
+
+    to_test = pipeline(
+        memorizable(create_values) >> entry,
+        count,
+        look_into_scratch_directory,
+        entry >> memorizable(add_length),
+    )
+
+    # Act
+    result = to_test(100)
+
+    # Compare
+    assert result == 200
+    assert len(spilled_files) == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+def sum_of_shared(shared: Shared) -> float:
+    return float(shared.load().sum())
+
+
+def is_mapped_after_sum(shared: Shared) -> bool:
+    sum_of_shared(shared)
+    return shared.name in _MAPPINGS
+
+
+def test_shared_memory_backend_provides_read_only_views():
+    # Prepare
+    numpy = pytest.importorskip("numpy")
+    memory = PipelineMemory(SharedMemoryBackend())
+    slot = slot_of("shared_test_entry")
+
+    # Act
+    memory.add_slot(slot.index, numpy.arange(100))
+    view = memory.get_slot(slot.index)
+
+    # Compare
+    assert isinstance(memory.values[slot.index], Shared)
+    assert (view == numpy.arange(100)).all()
+    with pytest.raises(ValueError):
+        view[0] = 1
+
+    name = memory.values[slot.index].name
+    del view
+    memory.close()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+
+def test_shared_memory_backend_can_be_read_by_worker_processes():
+    # Prepare
+    numpy = pytest.importorskip("numpy")
+    shared = SharedMemoryBackend().store(numpy.arange(100, dtype=float))
+
+    # Act
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        result = executor.submit(sum_of_shared, shared).result()
+
+    # Compare
+    assert result == 4950.0
+    shared.remove()
+
+
+def test_shared_memory_backend_unmaps_segments_in_worker_processes_once_views_are_dropped():
+    # Prepare
+    numpy = pytest.importorskip("numpy")
+    shared = SharedMemoryBackend().store(numpy.arange(100, dtype=float))
+
+    # Act
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        is_mapped = executor.submit(is_mapped_after_sum, shared).result()
+
+    # Compare
+    assert not is_mapped
+    shared.remove()
+
+
+def test_shared_memory_backend_stores_data_frames_as_arrow_tables():
+    # Prepare
+    pandas = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+    frame = pandas.DataFrame({"a": range(100), "b": [str(i) for i in range(100)]})
+
+    # Act
+    shared = SharedMemoryBackend().store(frame)
+
+    # Compare
+    assert isinstance(shared, Shared)
+    pandas.testing.assert_frame_equal(shared.load(), frame)
+    shared.remove()
+
+
+def test_shared_memory_backend_keeps_data_frames_arrow_can_not_convert():
+    # Prepare
+    pandas = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+    frame = pandas.DataFrame({"a": [1, "x", 2.0] * 100})
+
+    # Act
+    stored = SharedMemoryBackend().store(frame)
+
+    # Compare
+    assert stored is frame
+
+
+def test_shared_memory_backend_keeps_small_and_other_values():
+    # Prepare
+    numpy = pytest.importorskip("numpy")
+    backend = SharedMemoryBackend(threshold=1_000)
+
+    # Act
+    small = backend.store(numpy.arange(10))
+    values = backend.store(list(range(1_000)))
+
+    # Compare
+    assert not isinstance(small, Shared)
+    assert values == list(range(1_000))
@@ -0,0 +1,145 @@
+from typing import List
+
+import pytest
+
+from pypely import pipeline
+from pypely.memory import MemoryEntry, lazy, memorizable
+from pypely.memory.errors import InvalidMemoryAttributeError, MemoryTypeDoesNotMatchError
+
+
+def add(x: int, y: int) -> int:
+    return x + y
+
+
+def double(x: int) -> int:
+    return x * 2
+
+
+def test_lazy_entry_is_not_computed_if_it_is_not_ingested():
+    # Prepare
+    calls: List[int] = []
+
+    @memorizable
+    def diagnostics(x: int) -> str:
+        calls.append(x)
+        return str(x)
+
+    to_test = pipeline(double, diagnostics >> lazy("unused_diagnostics"), double)
+
+    # Act
+    result = to_test(1)
+
+    # Compare
+    assert result == 4
+    assert calls == []
+
+
+def test_lazy_entry_is_computed_once_when_ingested():
+    # Prepare
+    calls: List[int] = []
+
+    @memorizable
+    def diagnostics(x: int) -> int:
+        calls.append(x)
+        return x + 100
+
+    entry = MemoryEntry()
+    to_test = pipeline(
+        double,
+        diagnostics >> lazy(entry),
+        double,
+        memorizable(add) << entry,
+        memorizable(add) << entry,
+    )
+
+    # Act
+    result = to_test(1)
+
+    # Compare
+    assert result == 4 + 102 + 102
+    assert calls == [2]
+
+
+def test_lazy_entry_can_ingest_memory_entries():
+    # Prepare
+    @memorizable
+    def combine(x: int, y: int) -> int:
+        return x * 10 + y
+
+    to_test = pipeline(
+        memorizable(double) >> "lazy_input",
+        "lazy_input" >> memorizable(combine) >> lazy("lazy_combined"),
+        memorizable(add) << "lazy_combined",
+    )
+
+    # Act
+    result = to_test(1)
+
+    # Compare
+    assert result == 2 + 22
+
+
+def test_lazy_entry_types_are_checked():
+    # Prepare
+    @memorizable
+    def diagnostics(x: int) -> str:
+        return str(x)
+
+    @memorizable
+    def none(x: int) -> None:
+        pass
+
+    # Act
+    with pytest.raises(MemoryTypeDoesNotMatchError):
+        pipeline(diagnostics >> lazy("lazy_text"), memorizable(add) << "lazy_text")
+
+    with pytest.raises(InvalidMemoryAttributeError):
+        none >> lazy("lazy_none")
+
+
+def test_lazy_entry_keeps_forwarding_its_input_when_annotations_are_set():
+    # Prepare
+    @memorizable
+    def diagnostics(x: int) -> str:
+        return str(x)
+
+    to_test = diagnostics >> lazy("lazy_annotated")
+
+    # Act
+    to_test.__annotations__ = {"x": float, "return": bytes}
+
+    # Compare
+    assert to_test.__annotations__ == {"x": float, "return": float}
+    assert to_test.__signature__.return_annotation is float
+    assert diagnostics.__annotations__["return"] is str
+
+
+@pytest.mark.parametrize(
+    "bind",
+    [
+        lambda step: (step >> lazy("lazy_shifted")) << "lazy_offset",
+        lambda step: "lazy_offset" >> (step >> lazy("lazy_shifted")),
+    ],
+)
+def test_lazy_entry_stays_lazy_when_memory_entries_are_ingested_afterwards(bind):
+    # Prepare
+    calls: List[int] = []
+
+    @memorizable
+    def diagnostics(x: int, y: int) -> int:
+        calls.append(x)
+        return x + y
+
+    to_test = pipeline(
+        memorizable(double) >> "lazy_offset",
+        bind(diagnostics),
+        double,
+        memorizable(add) << "lazy_shifted",
+    )
+
+    # Act
+    result = to_test(1)
+
+    # Compare
+    assert result == 4 + 4
+    assert calls == [2]
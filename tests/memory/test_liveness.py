@@ -0,0 +1,89 @@
+import gc
+import weakref
+from typing import List
+
+from pypely import fork, merge, pipeline
+from pypely.memory import MemoryEntry, memorizable
+from pypely.memory._impl import slot_of
+from pypely.memory._liveness import last_usages
+
+
+class Data:
+    pass
+
+
+def test_memory_entry_is_released_after_last_consumer():
+    # Prepare
+    references: List[weakref.ref] = []
+    entry = MemoryEntry()
+
+    @memorizable
+    def create(x: int) -> Data:
+        data = Data()
+        references.append(weakref.ref(data))
+        return data
+
+    def forget(data: Data) -> int:
+        return 1
+
+    @memorizable
+    def consume(x: int, data: Data) -> int:
+        return x + 1
+
+    def check_released(x: int) -> bool:
+        gc.collect()
+        return references[0]() is None
+
+    to_test = pipeline(create >> entry, forget, consume << entry, check_released)
+
+    # Act
+    result = to_test(1)
+
+    # Compare
+    assert result is True
+
+
+def test_last_usages_include_fork_branches():
+    # Prepare
+    entry = MemoryEntry()
+
+    @memorizable
+    def write(x: int) -> int:
+        return x
+
+    @memorizable
+    def read(x: int, y: int) -> int:
+        return x + y
+
+    def identity(x: int) -> int:
+        return x
+
+    def add(x: int, y: int) -> int:
+        return x + y
+
+    funcs = [write >> entry, identity, fork(identity, read << entry), merge(add), identity]
+
+    # Act
+    releases = last_usages(funcs)
+
+    # Compare
+    assert releases == {2: (slot_of(entry.id).index,)}
+    assert pipeline(*funcs)(1) == 3
+
+
+def test_unused_memory_entry_is_released_after_writer():
+    # Prepare
+    @memorizable
+    def write(x: int) -> int:
+        return x
+
+    def identity(x: int) -> int:
+        return x
+
+    entry = MemoryEntry()
+
+    # Act
+    releases = last_usages([identity, write >> entry, identity])
+
+    # Compare
+    assert releases == {1: (slot_of(entry.id).index,)}
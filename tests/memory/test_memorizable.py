@@ -1,3 +1,5 @@
+from typing import Callable
+
 import pytest
 
 from pypely import fork, merge, pipeline
@@ -237,3 +239,55 @@ def test_memorizable_fails_when_types_mismatch():
 
     with pytest.raises(MemoryTypeDoesNotMatchError):
         pipeline(add >> output, return_none, read << output)
+
+
+def test_memory_entry_names_can_be_reused_by_multiple_pipelines():
+    # Prepare
+    @memorizable
+    def add(x: float, y: float) -> float:
+        return x + y
+
+    def build() -> Callable[[float, float], float]:
+        return pipeline(add >> "reused_sum", add << "reused_sum")
+
+    # Act
+    first = build()
+    second = build()
+
+    # Compare
+    assert first(1, 2) == 6
+    assert second(2, 3) == 10
+
+
+def test_memory_entry_must_be_written_before_it_is_ingested():
+    # Prepare
+    @memorizable
+    def add(x: float, y: float) -> float:
+        return x + y
+
+    # Act
+    with pytest.raises(MemoryAttributeNotFoundError):
+        pipeline(add << "written_too_late", add >> "written_too_late")
+
+
+def test_memory_interactions_share_the_wrapped_function():
+    # Prepare
+    class Scale:
+        def __init__(self) -> None:
+            self.factors = [2.0]
+            self.__name__ = self.__qualname__ = "scale"
+            self.__annotations__ = {"x": float, "y": float, "return": float}
+
+        def __call__(self, x: float, y: float) -> float:
+            return x * y * self.factors[0]
+
+    step = memorizable(Scale())
+
+    # Act
+    derived = step << "shared_factor" >> "shared_product"
+
+    # Compare
+    assert derived.func is step.func
+    assert derived.attributes_after == ["shared_factor"]
+    assert step.attributes_after == []
+    assert step.written_attribute is None
@@ -0,0 +1,79 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from pypely import pipeline
+from pypely.memory import MemoryEntry, memorizable
+from pypely.memory._context import PipelineMemoryContext
+from pypely.memory._impl import ROOT_MEMORY, PipelineMemory, get_memory
+
+
+def identity(x: int) -> int:
+    return x
+
+
+def add(x: int, y: int) -> int:
+    return x + y
+
+
+def test_concurrent_calls_use_their_own_memory():
+    # Prepare
+    barrier = threading.Barrier(4, timeout=5)
+
+    def wait_for_other_calls(x: int) -> int:
+        barrier.wait()
+        return x * 10
+
+    entry = MemoryEntry()
+    to_test = pipeline(
+        memorizable(identity) >> entry,
+        wait_for_other_calls,
+        entry >> memorizable(add),
+    )
+
+    # Act
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(to_test, range(4)))
+
+    # Compare
+    assert results == [0, 11, 22, 33]
+
+
+def test_memory_context_restores_previous_memory():
+    # Prepare
+    outer = PipelineMemory()
+
+    # Act
+    with PipelineMemoryContext(outer):
+        with PipelineMemoryContext():
+            inner = get_memory()
+        after_inner = get_memory()
+    after_outer = get_memory()
+
+    # Compare
+    assert inner is not outer
+    assert after_inner is outer
+    assert after_outer is ROOT_MEMORY
+
+
+def test_memory_context_only_affects_current_thread():
+    # Prepare
+    entered = threading.Event()
+    leave = threading.Event()
+    memory = PipelineMemory()
+
+    def hold_memory_context() -> None:
+        with PipelineMemoryContext(memory):
+            entered.set()
+            leave.wait(timeout=5)
+
+    thread = threading.Thread(target=hold_memory_context)
+
+    # Act
+    thread.start()
+    entered.wait(timeout=5)
+    seen = get_memory()
+    leave.set()
+    thread.join()
+
+    # Compare
+    assert seen is ROOT_MEMORY
@@ -1,9 +1,11 @@
 """I test all components used by `memorizable`"""
 
+import gc
+
 import pytest
 
-from pypely.memory._impl import PipelineMemory
-from pypely.memory.errors import InvalidMemoryAttributeError, MemoryAttributeExistsError, MemoryAttributeNotFoundError
+from pypely.memory._impl import _FREE_SLOTS, NAMES, SLOTS, PipelineMemory, slot_of
+from pypely.memory.errors import MemoryAttributeExistsError, MemoryAttributeNotFoundError
 
 
 def test_PipelineMemory_raises_expected_errors():
@@ -18,8 +20,68 @@ def test_PipelineMemory_raises_expected_errors():
     with pytest.raises(MemoryAttributeNotFoundError):
         test_memory.get("not-existing-entry")
 
-    with pytest.raises(InvalidMemoryAttributeError):
-        test_memory.add_type("test_entry", None)
 
-    with pytest.raises(InvalidMemoryAttributeError):
-        test_memory.add_type("test_entry", type(None))
+def test_PipelineMemory_stores_values_in_slots():
+    # Prepare
+    test_memory = PipelineMemory()
+    slot = slot_of("slot_test_entry")
+
+    # Act
+    test_memory.add_slot(slot.index, "test")
+
+    # Compare
+    assert slot_of("slot_test_entry") is slot
+    assert test_memory.get("slot_test_entry") == "test"
+    assert test_memory.get_slot(slot.index) == "test"
+    assert test_memory.names() == ["slot_test_entry"]
+
+    with pytest.raises(MemoryAttributeExistsError):
+        test_memory.add("slot_test_entry", "something-else")
+
+    test_memory.clear()
+    with pytest.raises(MemoryAttributeNotFoundError):
+        test_memory.get_slot(slot.index)
+
+
+def test_PipelineMemory_accepts_slots_assigned_after_creation():
+    # Prepare
+    test_memory = PipelineMemory()
+    slot = slot_of("late_test_entry")
+
+    # Act
+    test_memory.add_slot(slot.index, 42)
+
+    # Compare
+    assert test_memory.get_slot(slot.index) == 42
+
+
+def test_PipelineMemory_only_holds_the_entries_it_stores():
+    # Prepare
+    other_slots = [slot_of(f"other_pipeline_entry_{number}") for number in range(100)]
+    test_memory = PipelineMemory()
+    slot = slot_of("own_test_entry")
+
+    # Act
+    test_memory.add_slot(slot.index, 42)
+    test_memory.release((slot.index,))
+
+    # Compare
+    assert len(test_memory.values) == 1
+    assert len(other_slots) == 100
+    with pytest.raises(MemoryAttributeExistsError):
+        test_memory.add_slot(slot.index, 43)
+
+
+def test_slots_are_reused_when_no_step_uses_them():
+    # Prepare
+    slot = slot_of("recycled_test_entry")
+    index = slot.index
+
+    # Act
+    del slot
+    gc.collect()
+
+    # Compare
+    assert "recycled_test_entry" not in SLOTS
+    assert NAMES[index] is None
+    assert index in _FREE_SLOTS